@@ -34,8 +34,23 @@ get the confirmation notification
 
 
 
+import contextlib
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import List
+from typing import Callable, List, Optional
+
+from car_schedule import CarSchedule
+from fleet_index import FleetIndex
+from geo_index import GeoIndex
+
+try:
+    from Spans import tracer  # Logger/Spans.py, when ../Logger is on sys.path (e.g. PYTHONPATH=../Logger)
+    timed = tracer.timed
+except ImportError:  # spans are optional, without the Logger subsystem the entry points are not wrapped
+    def timed(name=None):
+        return lambda func: func
 
 
 # Enums
@@ -58,6 +73,9 @@ class StatusType(Enum):
 
 # Location Class
 class Location:
+    # No per object __dict__, a fleet holds millions of these
+    __slots__ = ("_id", "pincode", "latitude", "longitude", "city", "address")
+
     def __init__(self, id: int, pincode: str, latitude: int, longitude: int, city: str, address: str):
         self._id = id  # Private
         self.pincode = pincode
@@ -92,6 +110,8 @@ class Location:
 
 # User Class
 class User:
+    __slots__ = ("_id", "name", "user_type", "location", "license_id")
+
     def __init__(self, id: int, name: str, user_type: UserType, loc: Location, license_id: str):
         self._id = id  # Private
         self.name = name
@@ -109,35 +129,117 @@ class User:
         return self.location.get_location()
 
 
+# Striped locks guarding the status & schedule of cars, picked by car id
+_CAR_LOCKS = [threading.Lock() for _ in range(64)]
+
+
 # Car Class
 class Car:
+    __slots__ = ("_id", "name", "car_type", "_status", "car_license", "location", "_chassis_number", "_listeners",
+                 "schedule", "version")
+
     def __init__(self, id: int, name: str, car_type: CarType, status: StatusType, car_license: str, loc: Location, chassis_number: str):
         self._id = id  # Private
         self.name = name
         self.car_type = car_type
-        self.status = status
+        self._status = status
         self.car_license = car_license
         self.location = loc
         self._chassis_number = chassis_number  # Private
-
-    def reserve_vehicle(self):
-        if self.status == StatusType.VACANT:
+        self._listeners: List[Callable] = []  # called as listener(car, old_location) after every change
+        self.schedule = CarSchedule()  # time based reservations
+        self.version = 0  # bumped on every change, for optimistic reservations
+
+    @property
+    def status(self) -> StatusType:
+        return self._status
+
+    @status.setter
+    def status(self, status: StatusType):
+        # Every status change, wherever it is made, keeps the indexes of the system up to date
+        self._status = status
+        self.version += 1
+        self._notify(self.location)
+
+    def lock(self) -> threading.Lock:
+        return _CAR_LOCKS[hash(self._id) % len(_CAR_LOCKS)]
+
+    def add_listener(self, listener: Callable):
+        self._listeners.append(listener)
+
+    def _notify(self, old_location: Location):
+        for listener in self._listeners:
+            listener(self, old_location)
+
+    def can_reserve(self, expected_version: Optional[int] = None, start: Optional[datetime] = None,
+                    end: Optional[datetime] = None) -> bool:
+        """Check of a reservation, right now (start is None) or for [start, end). Call with lock() held.
+        expected_version is the version the caller saw, any change since then fails the check."""
+        if expected_version is not None and expected_version != self.version:
+            return False
+        if start is None:
+            return self._status == StatusType.VACANT
+        if end is None or end <= start:
+            return False  # empty or negative window, e.g. duration_in_hr=0
+        return self._status != StatusType.INACTIVE and self.schedule.is_free(start, end)
+
+    def apply_reservation(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                          reservation_id: Optional[int] = None) -> bool:
+        """Set part of a reservation checked by can_reserve(). Call with lock() held.
+        False if the schedule refused the window, nothing is changed then."""
+        if start is None:
             self.status = StatusType.BOOKED
+            return True
+        if not self.schedule.book(start, end, reservation_id):
+            return False
+        self.version += 1
+        return True
+
+    def try_reserve(self, expected_version: Optional[int] = None, start: Optional[datetime] = None,
+                    end: Optional[datetime] = None, reservation_id: Optional[int] = None) -> bool:
+        """Atomic check-and-set, only one of many concurrent reservations of the car wins."""
+        with self.lock():
+            return self.can_reserve(expected_version, start, end) and \
+                self.apply_reservation(start, end, reservation_id)
+
+    def reserve_vehicle(self, expected_version: Optional[int] = None) -> bool:
+        if self.try_reserve(expected_version):
             print(f"Car {self.name} has been reserved.")
-        else:
-            print(f"Car {self.name} is not available.")
+            return True
+        print(f"Car {self.name} is not available.")
+        return False
+
+    def reserve_window(self, start: datetime, end: datetime, reservation_id: int,
+                       expected_version: Optional[int] = None) -> bool:
+        """Reserve the car for [start, end), independent of its current status."""
+        if self.try_reserve(expected_version, start, end, reservation_id):
+            print(f"Car {self.name} has been reserved from {start} to {end}.")
+            return True
+        print(f"Car {self.name} is not available from {start} to {end}.")
+        return False
+
+    def is_available(self, start: datetime, end: datetime) -> bool:
+        return self.status != StatusType.INACTIVE and self.schedule.is_free(start, end)
 
     def update_car_details(self, name: str, car_type: CarType, status: StatusType, car_license: str, loc: Location):
-        self.name = name
-        self.car_type = car_type
-        self.status = status
-        self.car_license = car_license
-        self.location = loc
+        with self.lock():
+            old_location = self.location
+            self.name = name
+            self.car_type = car_type
+            self._status = status
+            self.car_license = car_license
+            self.location = loc
+            self.version += 1
+            self._notify(old_location)
 
 
 # Reserve Class
 class Reserve:
-    def __init__(self, id: int, user: User, car: Car, pickup: Location, drop: Location, rental_price: float, duration_in_hr: int):
+    __slots__ = ("_id", "user", "car", "pickup", "drop", "rental_price", "duration_in_hr", "start_time", "end_time",
+                 "car_version")
+
+    def __init__(self, id: int, user: User, car: Car, pickup: Location, drop: Location, rental_price: float, duration_in_hr: int,
+                 start_time: Optional[datetime] = None, car_version: Optional[int] = None):
         self._id = id  # Private
         self.user = user
         self.car = car
@@ -145,6 +247,11 @@ class Reserve:
         self.drop = drop
         self.rental_price = rental_price
         self.duration_in_hr = duration_in_hr
+        # Optional time window, without it the car is booked right away
+        self.start_time = start_time
+        self.end_time = start_time + timedelta(hours=duration_in_hr) if start_time else None
+        # Car.version seen when the car was chosen, the booking fails if the car changed since
+        self.car_version = car_version
 
     def get_price(self):
         return self.rental_price
@@ -161,61 +268,212 @@ class CarReservationSystem:
         self.locations = []  # List of Location
         self.reservations = []  # List of Reserve
         self.location_car_map = {}  # Mapping of Location to List of Cars
+        self.vacant_car_index = GeoIndex()  # VACANT cars by latitude/longitude, partitioned by CarType
+        self.fleet_index = FleetIndex()  # (city, CarType, StatusType) --> cars
+        self._index_lock = threading.Lock()  # cars change concurrently, the indexes are shared
+        self.store = None  # FleetStore logging every change, set by the store
+
+    def add_car(self, car: Car):
+        """Register a car, its location and indexes follow every later change of the car."""
+        self.add_cars([car])
+
+    def add_cars(self, cars: List[Car]):
+        """Bulk add_car(), the indexes are filled in one pass each."""
+        with self._index_lock:
+            self.cars.extend(cars)
+            location_car_map = self.location_car_map
+            listener = self._on_car_changed  # one bound method shared by every car
+            for car in cars:
+                cars_at_location = location_car_map.get(car.location)
+                if cars_at_location is None:
+                    location_car_map[car.location] = [car]
+                else:
+                    cars_at_location.append(car)
+                car.add_listener(listener)
+            self.fleet_index.update_many(cars, [(car.location.city, car.car_type, car.status) for car in cars])
+            vacant = [car for car in cars if car.status == StatusType.VACANT]
+            self.vacant_car_index.add_many(vacant, [car.location.latitude for car in vacant],
+                                           [car.location.longitude for car in vacant],
+                                           [car.car_type for car in vacant])
+            if self.store is not None:
+                for car in cars:
+                    self.store.log_car(car)
+
+    def add_user(self, user: User):
+        self.users.append(user)
+        if self.store is not None:
+            self.store.log_user(user)
+
+    def _index_car(self, car: Car):
+        self.fleet_index.update(car, car.location.city, car.car_type, car.status)
+        if car.status == StatusType.VACANT:
+            self.vacant_car_index.add(car, car.location.latitude, car.location.longitude, key=car.car_type)
+        else:
+            self.vacant_car_index.remove(car)
+
+    def _on_car_changed(self, car: Car, old_location: Location):
+        with self._index_lock:
+            if old_location is not car.location:
+                self.location_car_map[old_location].remove(car)
+                self.location_car_map.setdefault(car.location, []).append(car)
+            self._index_car(car)
+            if self.store is not None:
+                self.store.log_car(car)
 
     def get_car_by_location(self, location: Location) -> List[Car]:
         return self.location_car_map.get(location, [])
 
-    def get_car_by_type(self, car_type: CarType) -> List[Car]:
-        return [car for car in self.cars if car.car_type == car_type]
+    def get_nearest_vacant_cars(self, location: Location, car_type: CarType, k: int = 5,
+                                radius_km: float = 10.0) -> List[Car]:
+        """k nearest VACANT cars of a type within radius_km of a location, nearest first."""
+        return [car for _, car in self.vacant_car_index.nearest(location.latitude, location.longitude, k,
+                                                                radius_km, key=car_type)]
 
-    def book_car(self, reservation: Reserve):
-        reservation.car.reserve_vehicle()
-        self.reservations.append(reservation)
+    def get_car_by_type(self, car_type: CarType) -> List[Car]:
+        return self.fleet_index.query(car_type=car_type)
+
+    def get_cars(self, city: Optional[str] = None, car_type: Optional[CarType] = None,
+                 status: Optional[StatusType] = None) -> List[Car]:
+        """Cars matching every given filter, O(result size)."""
+        return self.fleet_index.query(city, car_type, status)
+
+    def fleet_counts(self) -> dict:
+        """Number of cars per (city, CarType, StatusType), for dashboards."""
+        return self.fleet_index.counts()
+
+    def get_cars_available(self, start: datetime, end: datetime, car_type: Optional[CarType] = None,
+                           location: Optional[Location] = None) -> List[Car]:
+        """Cars of a type and/or at a location that are free during [start, end), O(log n) per car."""
+        if location is not None:
+            cars = self.get_car_by_location(location)
+            if car_type is not None:
+                cars = [car for car in cars if car.car_type == car_type]
+        elif car_type is not None:
+            cars = self.get_car_by_type(car_type)
+        else:
+            cars = self.cars
+        return [car for car in cars if car.is_available(start, end)]
+
+    @timed()
+    def book_car(self, reservation: Reserve) -> bool:
+        """Atomically reserve the car, only a successful booking is recorded."""
+        if reservation.start_time is not None:
+            booked = reservation.car.reserve_window(reservation.start_time, reservation.end_time, reservation._id,
+                                                    reservation.car_version)
+        else:
+            booked = reservation.car.reserve_vehicle(reservation.car_version)
+        if booked:
+            self._record_reservations([reservation])
+        return booked
+
+    def book_cars(self, reservations: List[Reserve], all_or_nothing: bool = True) -> List[bool]:
+        """Reserve many cars in one call.
+        all_or_nothing: every reservation is booked or none is, best effort: each one on its own."""
+        if not all_or_nothing:
+            return [self.book_car(reservation) for reservation in reservations]
+
+        with contextlib.ExitStack() as stack:
+            # A fixed lock order, two overlapping batches can not deadlock
+            for lock in sorted({reservation.car.lock() for reservation in reservations}, key=id):
+                stack.enter_context(lock)
+            booked_now = set()
+            windows = defaultdict(list)  # car --> windows taken by earlier reservations of the batch
+            for reservation in reservations:
+                car, start, end = reservation.car, reservation.start_time, reservation.end_time
+                if start is None:
+                    available = car.can_reserve(reservation.car_version) and car not in booked_now
+                    booked_now.add(car)
+                else:
+                    available = car.can_reserve(reservation.car_version, start, end) and \
+                                all(end <= taken_start or taken_end <= start for taken_start, taken_end in windows[car])
+                    windows[car].append((start, end))
+                if not available:
+                    print(f"Batch of {len(reservations)} reservations rejected, Car {car.name} is not available.")
+                    return [False] * len(reservations)
+            for reservation in reservations:
+                if not reservation.car.apply_reservation(reservation.start_time, reservation.end_time,
+                                                         reservation._id):
+                    # can_reserve() checked every window above, under the same locks
+                    raise RuntimeError(f"Car {reservation.car.name} refused a checked window of "
+                                       f"reservation {reservation._id}")
+        self._record_reservations(reservations)
+        print(f"Batch of {len(reservations)} reservations booked.")
+        return [True] * len(reservations)
+
+    def _record_reservations(self, reservations: List[Reserve]):
+        if self.store is None:
+            self.reservations.extend(reservations)
+        else:
+            self.store.log_reservations(reservations, self.reservations)
 
     def confirmation(self, reservation: Reserve):
         print(f"Reservation confirmed for User {reservation.user.name} with Car {reservation.car.name}.")
 
 
-# Step 1: Setup Locations
-loc1 = Location(id=1,pincode="560001", latitude=12, longitude=77, city="Bangalore", address="MG Road")
-loc2 = Location(id=12,pincode="110001", latitude=28, longitude=77, city="Delhi", address="Connaught Place")
+if __name__ == "__main__":
+    # Step 1: Setup Locations
+    loc1 = Location(id=1,pincode="560001", latitude=12, longitude=77, city="Bangalore", address="MG Road")
+    loc2 = Location(id=12,pincode="110001", latitude=28, longitude=77, city="Delhi", address="Connaught Place")
+
+    # Step 2: Create Users
+    user1 = User(id=1, name="Alice", user_type=UserType.CUSTOMER, loc=loc1, license_id="DL12345")
+    user2 = User(id=2, name="Bob", user_type=UserType.OPERATOR, loc=loc2, license_id="KA98765")
+
+    # Step 3: Add Cars
+    car1 = Car(id=1, name="Hyundai i10", car_type=CarType.SEDAN, status=StatusType.VACANT,
+               car_license="KA01AB1234", loc=loc1, chassis_number="CH123456789")
+    car2 = Car(id=2, name="Toyota Fortuner", car_type=CarType.XUV, status=StatusType.VACANT,
+               car_license="DL02XY5678", loc=loc2, chassis_number="CH987654321")
 
-# Step 2: Create Users
-user1 = User(id=1, name="Alice", user_type=UserType.CUSTOMER, loc=loc1, license_id="DL12345")
-user2 = User(id=2, name="Bob", user_type=UserType.OPERATOR, loc=loc2, license_id="KA98765")
+    # Step 4: Initialize CarReservationSystem
+    car_reservation_system = CarReservationSystem()
 
-# Step 3: Add Cars
-car1 = Car(id=1, name="Hyundai i10", car_type=CarType.SEDAN, status=StatusType.VACANT,
-           car_license="KA01AB1234", loc=loc1, chassis_number="CH123456789")
-car2 = Car(id=2, name="Toyota Fortuner", car_type=CarType.XUV, status=StatusType.VACANT,
-           car_license="DL02XY5678", loc=loc2, chassis_number="CH987654321")
+    # Add data to system, cars are mapped to their locations
+    car_reservation_system.add_car(car1)
+    car_reservation_system.add_car(car2)
+    car_reservation_system.users.extend([user1, user2])
+    car_reservation_system.locations.extend([loc1, loc2])
 
-# Step 4: Initialize CarReservationSystem
-car_reservation_system = CarReservationSystem()
+    # Cars near the user
+    nearby_cars = car_reservation_system.get_nearest_vacant_cars(user1.location, CarType.SEDAN, k=3, radius_km=50)
+    print(f"Vacant sedans near {user1.name}: {[car.name for car in nearby_cars]}")
 
-# Add data to system
-car_reservation_system.cars.extend([car1, car2])
-car_reservation_system.users.extend([user1, user2])
-car_reservation_system.locations.extend([loc1, loc2])
+    # Step 5: Make a Reservation
+    reserve = Reserve(id=1, user=user1, car=car1, pickup=loc1, drop=loc2, rental_price=1500.0, duration_in_hr=5)
 
-# Map cars to locations
-car_reservation_system.location_car_map[loc1] = [car1]
-car_reservation_system.location_car_map[loc2] = [car2]
+    # Book the car
+    car_reservation_system.book_car(reserve)
 
-# Step 5: Make a Reservation
-reserve = Reserve(id=1, user=user1, car=car1, pickup=loc1, drop=loc2, rental_price=1500.0, duration_in_hr=5)
+    # Confirm reservation
+    car_reservation_system.confirmation(reserve)
 
-# Book the car
-car_reservation_system.book_car(reserve)
+    # Step 6: Reserve a future time window
+    window_start = datetime(2025, 1, 10, 9)
+    reserve2 = Reserve(id=2, user=user2, car=car2, pickup=loc2, drop=loc2, rental_price=3000.0, duration_in_hr=4,
+                       start_time=window_start)
+    car_reservation_system.book_car(reserve2)
+    free_xuvs = car_reservation_system.get_cars_available(window_start + timedelta(hours=2), window_start + timedelta(hours=6),
+                                                          car_type=CarType.XUV)
+    print(f"XUVs free from 11:00 to 15:00: {[car.name for car in free_xuvs]}")
+    free_xuvs = car_reservation_system.get_cars_available(window_start + timedelta(hours=4), window_start + timedelta(hours=6),
+                                                          car_type=CarType.XUV)
+    print(f"XUVs free from 13:00 to 15:00: {[car.name for car in free_xuvs]}")
 
-# Confirm reservation
-car_reservation_system.confirmation(reserve)
+    # Step 7: Fleet dashboard
+    for (city, car_type, status), no_of_cars in car_reservation_system.fleet_counts().items():
+        print(f"{city} {car_type.name} {status.name}: {no_of_cars}")
 
 
 '''
 Output:-
+Vacant sedans near Alice: ['Hyundai i10']
 Car Hyundai i10 has been reserved.
 Reservation confirmed for User Alice with Car Hyundai i10.
+Car Toyota Fortuner has been reserved from 2025-01-10 09:00:00 to 2025-01-10 13:00:00.
+XUVs free from 11:00 to 15:00: []
+XUVs free from 13:00 to 15:00: ['Toyota Fortuner']
+Delhi XUV VACANT: 1
+Bangalore SEDAN BOOKED: 1
 
 
 '''
\ No newline at end of file
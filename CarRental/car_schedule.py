@@ -0,0 +1,64 @@
+'''
+Car Schedule:-
+
+Time based reservations of one car as a sorted interval list.
+
+	•	Window: [start, end), a car can be reserved for many future windows
+	•	Invariant: windows never overlap, so sorted by start they are sorted by end too
+	•	Overlap check: one bisect --> O(log n) for n reservations of the car
+	•	Book: bisect + list insert (memmove of pointers, no Python level loop)
+
+starts --> [09:00, 13:00, 18:00]
+ends   --> [11:00, 15:00, 20:00]
+is_free(11:00, 13:00) --> True, is_free(14:00, 16:00) --> False
+
+'''
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+
+class CarSchedule:
+    __slots__ = ("_starts", "_ends", "_reservation_ids")
+
+    def __init__(self):
+        self._starts: List[datetime] = []
+        self._ends: List[datetime] = []
+        self._reservation_ids: List[int] = []
+
+    def __len__(self):
+        return len(self._starts)
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        # Windows starting before `end`, the last of them ends the latest
+        i = bisect_left(self._starts, end)
+        return i == 0 or self._ends[i - 1] <= start
+
+    def book(self, start: datetime, end: datetime, reservation_id: int) -> bool:
+        if end <= start:
+            return False
+        i = bisect_left(self._starts, end)
+        if i > 0 and self._ends[i - 1] > start:
+            return False
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+        self._reservation_ids.insert(i, reservation_id)
+        return True
+
+    def cancel(self, start: datetime, reservation_id: int) -> bool:
+        i = bisect_left(self._starts, start)
+        if i == len(self._starts) or self._starts[i] != start or self._reservation_ids[i] != reservation_id:
+            return False
+        del self._starts[i], self._ends[i], self._reservation_ids[i]
+        return True
+
+    def next_booking(self, after: datetime) -> Optional[Tuple[datetime, datetime, int]]:
+        """First window still running or starting at/after `after`."""
+        i = bisect_right(self._ends, after)
+        if i == len(self._ends):
+            return None
+        return self._starts[i], self._ends[i], self._reservation_ids[i]
+
+    def bookings(self) -> List[Tuple[datetime, datetime, int]]:
+        return list(zip(self._starts, self._ends, self._reservation_ids))
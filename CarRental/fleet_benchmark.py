@@ -0,0 +1,232 @@
+'''
+Fleet Benchmark:-
+
+Seeded, fleet scale workload for CarReservationSystem, so query and booking changes can be
+compared on numbers instead of the two car example.
+
+	•	World: parking locations scattered around each city center, cars parked at those locations
+	           (many cars per location) and users living near them
+	•	Queries: get_car_by_location, get_car_by_type, get_cars(city, type, status) and
+	             get_nearest_vacant_cars, each timed per call, reported as p50/p99/max latency
+	•	Bookings: --threads threads book random cars for random time windows through book_car(),
+	              reported as successful bookings per second and the conflict rate
+	•	Memory: traced memory and allocated blocks of building the system (tracemalloc, separate
+	            pass) per car, plus the bytes allocated by reading coordinates and status of every car
+
+Usage:-
+python fleet_benchmark.py --cities 4 --cars 100000 --locations 5000 --threads 1 4 8
+
+'''
+
+import argparse
+import contextlib
+import gc
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from car_rental import Car, CarReservationSystem, CarType, Location, Reserve, StatusType, User, UserType
+
+# (city, pincode prefix, latitude, longitude)
+CITIES: List[Tuple[str, str, float, float]] = [
+    ("Bangalore", "560", 12.9716, 77.5946),
+    ("Delhi", "110", 28.7041, 77.1025),
+    ("Mumbai", "400", 19.0760, 72.8777),
+    ("Chennai", "600", 13.0827, 80.2707),
+    ("Hyderabad", "500", 17.3850, 78.4867),
+    ("Pune", "411", 18.5204, 73.8567),
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class FleetGenerator:
+    def __init__(self, seed: int = 42, no_of_cities: int = 1, no_of_locations: int = 1000, no_of_cars: int = 10000,
+                 no_of_users: int = 2000, city_radius_deg: float = 0.1, inactive_share: float = 0.05):
+        self.seed = seed
+        self.cities = CITIES[:max(1, min(no_of_cities, len(CITIES)))]
+        self.no_of_locations = no_of_locations
+        self.no_of_cars = no_of_cars
+        self.no_of_users = no_of_users
+        self.city_radius_deg = city_radius_deg
+        self.inactive_share = inactive_share
+
+    def generate(self) -> Tuple[List[Location], List[User], List[Car]]:
+        """Same seed --> same locations, users and cars."""
+        rng = random.Random(self.seed)
+        radius = self.city_radius_deg
+        locations = []
+        for i in range(self.no_of_locations):
+            city, pincode, latitude, longitude = self.cities[i % len(self.cities)]
+            locations.append(Location(i, f"{pincode}{rng.randrange(1000):03d}", latitude + rng.uniform(-radius, radius),
+                                      longitude + rng.uniform(-radius, radius), city, f"Parking {i}"))
+        users = [User(i, f"User {i}", UserType.CUSTOMER, rng.choice(locations), f"DL{i:08d}")
+                 for i in range(self.no_of_users)]
+        car_types = list(CarType)
+        cars = []
+        for i in range(self.no_of_cars):
+            status = StatusType.INACTIVE if rng.random() < self.inactive_share else StatusType.VACANT
+            cars.append(Car(i, f"Car {i}", rng.choice(car_types), status, f"KA{i:08d}", rng.choice(locations),
+                            f"CH{i:010d}"))
+        return locations, users, cars
+
+    def build_system(self) -> CarReservationSystem:
+        locations, users, cars = self.generate()
+        system = CarReservationSystem()
+        system.locations.extend(locations)
+        system.users.extend(users)
+        system.add_cars(cars)
+        return system
+
+
+def time_calls(call: Callable, args_list: List[tuple]) -> Dict[str, float]:
+    """Latency of call(*args) for every args, in microseconds."""
+    latencies = []
+    perf_counter_ns = time.perf_counter_ns
+    for args in args_list:
+        start = perf_counter_ns()
+        call(*args)
+        latencies.append((perf_counter_ns() - start) / 1000)
+    latencies.sort()
+    return {"calls": len(latencies), "p50_us": percentile(latencies, 50), "p99_us": percentile(latencies, 99),
+            "max_us": latencies[-1] if latencies else 0.0}
+
+
+def run_queries(system: CarReservationSystem, no_of_queries: int = 2000, seed: int = 42) -> Dict[str, Dict[str, float]]:
+    rng = random.Random(seed)
+    locations = system.locations
+    cities = sorted({location.city for location in locations})
+    car_types = list(CarType)
+    return {
+        "get_car_by_location": time_calls(system.get_car_by_location,
+                                          [(rng.choice(locations),) for _ in range(no_of_queries)]),
+        "get_car_by_type": time_calls(system.get_car_by_type, [(rng.choice(car_types),) for _ in range(no_of_queries)]),
+        "get_cars": time_calls(system.get_cars, [(rng.choice(cities), rng.choice(car_types), StatusType.VACANT)
+                                                 for _ in range(no_of_queries)]),
+        "get_nearest_vacant_cars": time_calls(system.get_nearest_vacant_cars,
+                                              [(rng.choice(locations), rng.choice(car_types), 10, 5.0)
+                                               for _ in range(no_of_queries)]),
+    }
+
+
+def run_bookings(system: CarReservationSystem, no_of_threads: int, bookings_per_thread: int,
+                 seed: int = 42) -> Dict[str, float]:
+    """Random cars for random 1-8 hour windows of one month, book_car() from many threads at once."""
+    cars = system.cars
+    users = system.users
+    first_day = datetime(2025, 1, 1)
+    next_id = len(system.reservations)
+    barrier = threading.Barrier(no_of_threads + 1)
+    booked = [0] * no_of_threads
+
+    batches = []
+    for thread_no in range(no_of_threads):
+        rng = random.Random(seed * 1000 + thread_no)
+        batch = []
+        for i in range(bookings_per_thread):
+            user, car = rng.choice(users), rng.choice(cars)
+            batch.append(Reserve(next_id + thread_no * bookings_per_thread + i, user, car, user.location,
+                                 car.location, 1000.0, rng.randint(1, 8),
+                                 start_time=first_day + timedelta(hours=rng.randrange(24 * 30))))
+        batches.append(batch)
+
+    def booker(thread_no: int):
+        book_car = system.book_car
+        barrier.wait()
+        booked[thread_no] = sum(book_car(reservation) for reservation in batches[thread_no])
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        threads = [threading.Thread(target=booker, args=(i,)) for i in range(no_of_threads)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    attempts = no_of_threads * bookings_per_thread
+    total_booked = sum(booked)
+    return {"threads": no_of_threads, "attempts": attempts, "booked": total_booked,
+            "bookings_per_sec": total_booked / elapsed if elapsed else 0.0,
+            "conflict_rate": 1 - total_booked / attempts if attempts else 0.0}
+
+
+def measure_memory(generator: FleetGenerator) -> Dict[str, float]:
+    """Traced memory and allocated blocks of the generated fleet plus the system indexes (separate
+    pass, tracemalloc would distort the latency numbers)."""
+    gc.collect()  # earlier systems are garbage cycles (cars <--> listeners), free them before counting
+    tracemalloc.start()
+    try:
+        blocks = sys.getallocatedblocks()
+        system = generator.build_system()
+        blocks = sys.getallocatedblocks() - blocks
+        current, peak = tracemalloc.get_traced_memory()
+        # Read path: coordinates and status of every car, should not allocate anything
+        tracemalloc.reset_peak()
+        missing = 0
+        for car in system.cars:
+            location = car.location
+            if location.latitude is None or location.longitude is None or car.status is None:
+                missing += 1
+        read_path_bytes = tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+    no_of_cars = len(system.cars) or 1
+    return {"total_mb": current / (1024 * 1024), "peak_mb": peak / (1024 * 1024),
+            "bytes_per_car": current / no_of_cars, "blocks_per_car": blocks / no_of_cars,
+            "read_path_bytes": read_path_bytes}
+
+
+def print_report(queries: Dict[str, Dict[str, float]], bookings: List[Dict[str, float]], memory: Dict[str, float]):
+    print(f"{'query':<26}{'calls':>8}{'p50 us':>10}{'p99 us':>10}{'max us':>10}")
+    for name, result in queries.items():
+        print(f"{name:<26}{result['calls']:>8}{result['p50_us']:>10.1f}{result['p99_us']:>10.1f}"
+              f"{result['max_us']:>10.1f}")
+    if bookings:
+        print(f"\n{'threads':>7}{'attempts':>10}{'booked':>8}{'bookings/s':>12}{'conflicts':>10}")
+        for result in bookings:
+            print(f"{result['threads']:>7}{result['attempts']:>10}{result['booked']:>8}"
+                  f"{result['bookings_per_sec']:>12.0f}{result['conflict_rate']:>10.1%}")
+    if memory:
+        print(f"\nMemory: {memory['total_mb']:.1f} MB (peak {memory['peak_mb']:.1f} MB), "
+              f"{memory['bytes_per_car']:.0f} bytes and {memory['blocks_per_car']:.1f} allocations per car, "
+              f"{memory['read_path_bytes']} bytes allocated reading every car's coordinates and status")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark CarReservationSystem queries and bookings at fleet scale.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cities", type=int, default=2)
+    parser.add_argument("--locations", type=int, default=2000)
+    parser.add_argument("--cars", type=int, default=50000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=2000, help="calls per query type")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--bookings", type=int, default=20000, help="booking attempts per thread count")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    args = parser.parse_args()
+
+    generator = FleetGenerator(seed=args.seed, no_of_cities=args.cities, no_of_locations=args.locations,
+                               no_of_cars=args.cars, no_of_users=args.users)
+    start = time.perf_counter()
+    system = generator.build_system()
+    print(f"Built {len(system.cars)} cars at {len(system.locations)} locations in "
+          f"{time.perf_counter() - start:.2f}s\n")
+    queries = run_queries(system, args.queries, args.seed)
+    system = None  # one fleet in memory at a time
+    # A fresh fleet per thread count, earlier bookings would turn into conflicts
+    bookings = [run_bookings(generator.build_system(), no_of_threads, max(1, args.bookings // no_of_threads),
+                             args.seed) for no_of_threads in args.threads]
+    memory = {} if args.no_memory else measure_memory(generator)
+    print_report(queries, bookings, memory)
@@ -0,0 +1,87 @@
+'''
+Fleet Index:-
+
+Composite index of the fleet on (city, CarType, StatusType).
+
+	•	Bucket: one (city, car_type, status) key --> cars in insertion order (dict used as ordered set)
+	•	Update: the index remembers the key of every car, a change moves the car between
+	            two buckets in O(1)
+	•	Query: any field can be None (wildcard), cost is O(matching buckets + result size)
+	•	Counts: size of every bucket, for dashboards
+
+(Bangalore, SEDAN, VACANT) --> [car1, car7]
+(Bangalore, SEDAN, BOOKED) --> [car3]
+(Delhi, XUV, VACANT)       --> [car2]
+
+'''
+
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+FleetKey = Tuple[Optional[str], Hashable, Hashable]
+
+
+class FleetIndex:
+    def __init__(self):
+        self._buckets: Dict[FleetKey, Dict[Hashable, None]] = {}
+        self._keys: Dict[Hashable, FleetKey] = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def update(self, item: Hashable, city: Optional[str], car_type: Hashable, status: Hashable):
+        """Add an item or move it to the bucket of its new values."""
+        key = (city, car_type, status)
+        old_key = self._keys.get(item)
+        if old_key == key:
+            return
+        if old_key is not None:
+            self._discard(item, old_key)
+        self._buckets.setdefault(key, {})[item] = None
+        self._keys[item] = key
+
+    def update_many(self, items: Iterable[Hashable], keys: Iterable[FleetKey]):
+        """Bulk update() with (city, car_type, status) keys, e.g. for a fleet loaded on startup."""
+        buckets = self._buckets
+        item_keys = self._keys
+        for item, key in zip(items, keys):
+            old_key = item_keys.get(item)
+            if old_key == key:
+                continue
+            if old_key is not None:
+                self._discard(item, old_key)
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = {}
+            bucket[item] = None
+            item_keys[item] = key
+
+    def remove(self, item: Hashable):
+        old_key = self._keys.pop(item, None)
+        if old_key is not None:
+            self._discard(item, old_key)
+
+    def _discard(self, item: Hashable, key: FleetKey):
+        bucket = self._buckets[key]
+        del bucket[item]
+        if not bucket:
+            del self._buckets[key]
+
+    def _matching_keys(self, city: Optional[str], car_type: Hashable, status: Hashable) -> List[FleetKey]:
+        if city is not None and car_type is not None and status is not None:
+            return [(city, car_type, status)]
+        return [key for key in self._buckets
+                if (city is None or key[0] == city)
+                and (car_type is None or key[1] == car_type)
+                and (status is None or key[2] == status)]
+
+    def query(self, city: Optional[str] = None, car_type: Hashable = None, status: Hashable = None) -> List[Hashable]:
+        result = []
+        for key in self._matching_keys(city, car_type, status):
+            result.extend(self._buckets.get(key, ()))
+        return result
+
+    def count(self, city: Optional[str] = None, car_type: Hashable = None, status: Hashable = None) -> int:
+        return sum(len(self._buckets.get(key, ())) for key in self._matching_keys(city, car_type, status))
+
+    def counts(self) -> Dict[FleetKey, int]:
+        return {key: len(bucket) for key, bucket in self._buckets.items()}
@@ -0,0 +1,554 @@
+'''
+Fleet Store:-
+
+Persistence of a CarReservationSystem (locations, users, cars and reservations) as a
+write-ahead log of changes plus a compact binary snapshot, so a restart keeps the fleet.
+
+	•	WAL: every added or changed car and every booked reservation is appended as a binary
+	         record. Users and locations are logged the first time a record refers to them.
+	         Booked reservations are written to the file (and fsynced with fsync=True) before
+	         book_car() / book_cars() return
+	•	Snapshot: compact() writes the whole fleet column by column (fixed width numbers + one
+	              table of unique, length prefixed strings, e.g. a city is stored once) and starts a
+	              new WAL generation. The snapshot file and then the directory are fsynced before the
+	              old WAL is removed, whatever the fsync setting
+	•	Warm start: the snapshot is memory-mapped, every column is cast to a typed memoryview and
+	                copied once into a list (no per value unpacking), then the objects are restored
+	                column by column without running their constructors
+	•	Replay: only the WAL written after the snapshot is replayed, a partially written last
+	            record (crash during a write) is dropped
+	•	Ids: locations, users, cars and reservations are referred to by their id, unique per kind
+	•	Times: reservation start times are naive datetimes, stored as seconds since 1970-01-01 of the
+	           same wall clock (no local timezone conversion), aware ones are stored in UTC
+
+Files in the store directory:-
+snapshot.bin     --> fleet at the last compaction + generation of the WAL that follows it
+wal.<gen>.log    --> changes made after the snapshot of generation <gen>
+
+'''
+
+import gc
+import math
+import mmap
+import os
+import struct
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate, repeat
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from car_rental import Car, CarReservationSystem, CarType, Location, Reserve, StatusType, User, UserType
+from car_schedule import CarSchedule
+
+_CAR_TYPES = {car_type.value: car_type for car_type in CarType}
+_STATUSES = {status.value: status for status in StatusType}
+_USER_TYPES = {user_type.value: user_type for user_type in UserType}
+
+# ---------- WAL records: header + fixed part + length prefixed strings ----------
+
+_LOCATION_RECORD, _USER_RECORD, _CAR_RECORD, _RESERVATION_RECORD = 1, 2, 3, 4
+_RECORD_HEADER = struct.Struct("<BI")  # record type, payload size
+_LOCATION = struct.Struct("<qdd")  # id, latitude, longitude + pincode, city, address
+_USER = struct.Struct("<qbq")  # id, user type, location id + name, license id
+_CAR = struct.Struct("<qbbq")  # id, car type, status, location id + name, license, chassis number
+_RESERVATION = struct.Struct("<qqqqqdqd")  # id, user, car, pickup, drop, price, duration, start (NaN: none)
+_STRING_SIZE = struct.Struct("<i")  # -1 for None
+
+# ---------- Snapshot: header, string table, then one column per field ----------
+
+_MAGIC = b"FLEET002"
+# magic, generation, no of strings, string bytes, no of locations, users, cars, reservations
+_HEADER = struct.Struct("<8s7Q")
+_STRING_LENGTH = "I"  # string table: one length column, then the utf-8 bytes of every string
+_LOCATION_COLUMNS = (("id", "q"), ("latitude", "d"), ("longitude", "d"),
+                     ("pincode", "i"), ("city", "i"), ("address", "i"))
+_USER_COLUMNS = (("id", "q"), ("user_type", "b"), ("location", "q"), ("name", "i"), ("license_id", "i"))
+_CAR_COLUMNS = (("id", "q"), ("car_type", "b"), ("status", "b"), ("location", "q"),
+                ("name", "i"), ("car_license", "i"), ("chassis_number", "i"))
+_RESERVATION_COLUMNS = (("id", "q"), ("user", "q"), ("car", "q"), ("pickup", "q"), ("drop", "q"),
+                        ("rental_price", "d"), ("duration_in_hr", "q"), ("start", "d"))
+
+
+def _pack_strings(*values: Optional[str]) -> bytes:
+    parts = []
+    for value in values:
+        if value is None:
+            parts.append(_STRING_SIZE.pack(-1))
+        else:
+            encoded = value.encode()
+            parts.append(_STRING_SIZE.pack(len(encoded)))
+            parts.append(encoded)
+    return b"".join(parts)
+
+
+def _unpack_strings(data: memoryview, offset: int, count: int) -> List[Optional[str]]:
+    values = []
+    for _ in range(count):
+        (size,) = _STRING_SIZE.unpack_from(data, offset)
+        offset += _STRING_SIZE.size
+        if size < 0:
+            values.append(None)
+        else:
+            values.append(bytes(data[offset:offset + size]).decode())
+            offset += size
+    return values
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _timestamp(start: Optional[datetime]) -> float:
+    """Seconds since 1970-01-01 of a naive datetime, as is, so a restore in another timezone
+    gives the same wall clock time back (NaN: none)."""
+    if start is None:
+        return math.nan
+    if start.tzinfo is not None:
+        start = start.astimezone(timezone.utc).replace(tzinfo=None)
+    return (start - _EPOCH).total_seconds()
+
+
+def _datetime(timestamp: float) -> datetime:
+    return _EPOCH + timedelta(seconds=timestamp)
+
+
+def _padding(size: int) -> int:
+    # Columns start at 8 byte boundaries so they can be cast without copying
+    return -size % 8
+
+
+def _none_if_nan(value: float) -> Optional[float]:
+    return None if value != value else value
+
+
+def _new(cls, state: dict):
+    """Restore a (slotted) object from its attributes, without running its constructor."""
+    obj = object.__new__(cls)
+    for name, value in state.items():
+        setattr(obj, name, value)
+    return obj
+
+
+def _new_many(cls, count: int, columns: Dict[str, Iterable]) -> list:
+    """Restore `count` objects of a slotted class without running its constructor, one attribute
+    at a time: every column (attribute name --> values in object order) is stored through the
+    slot descriptor by map(), no Python level call per object and attribute."""
+    objects = list(map(object.__new__, repeat(cls, count)))
+    for name, values in columns.items():
+        deque(map(getattr(cls, name).__set__, objects, values), maxlen=0)
+    return objects
+
+
+def _split_strings(data: bytes, ends: List[int]) -> List[Optional[str]]:
+    starts = [0] + ends[:-1]
+    if data.isascii():
+        # Byte offsets are character offsets, decode once and slice the text
+        text = data.decode()
+        return list(map(text.__getitem__, map(slice, starts, ends)))
+    return [data[start:end].decode() for start, end in zip(starts, ends)]
+
+
+class FleetStore:
+    def __init__(self, directory: str, fsync: bool = False):
+        self.directory = directory
+        self.fsync = fsync  # True: a booking is acknowledged once it is on disk, not only in the OS cache
+        self.generation = 0
+        self.records_since_snapshot = 0
+        self.system = CarReservationSystem()
+        self._locations: Dict[int, Location] = {}
+        self._users: Dict[int, User] = {}
+        self._cars: Dict[int, Car] = {}
+        self._lock = threading.Lock()  # bookings are logged from many threads
+
+        os.makedirs(directory, exist_ok=True)
+        snapshot_path = os.path.join(directory, "snapshot.bin")
+        # Millions of new objects would trigger the cyclic GC over and over, none of them is garbage
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            if os.path.exists(snapshot_path):
+                self._load_snapshot(snapshot_path)
+            self._replay()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        self._log_file = open(self._log_path(self.generation), "ab")
+        # From now on every change of the system is written to the log
+        self.system.store = self
+
+    # ---------- WAL ----------
+
+    def _write(self, record_type: int, payload: bytes):
+        self._log_file.write(_RECORD_HEADER.pack(record_type, len(payload)) + payload)
+        self.records_since_snapshot += 1
+
+    def _log_location(self, location: Location):
+        if self._locations.get(location._id) is location:
+            return
+        self._locations[location._id] = location
+        latitude = math.nan if location.latitude is None else location.latitude
+        longitude = math.nan if location.longitude is None else location.longitude
+        self._write(_LOCATION_RECORD, _LOCATION.pack(location._id, latitude, longitude) +
+                    _pack_strings(location.pincode, location.city, location.address))
+
+    def _log_user(self, user: User):
+        if self._users.get(user._id) is user:
+            return
+        self._log_location(user.location)
+        self._users[user._id] = user
+        self._write(_USER_RECORD, _USER.pack(user._id, user.user_type.value, user.location._id) +
+                    _pack_strings(user.name, user.license_id))
+
+    def log_user(self, user: User):
+        with self._lock:
+            self._log_user(user)
+
+    def log_car(self, car: Car):
+        """Log the full state of a new or changed car."""
+        with self._lock:
+            self._log_location(car.location)
+            self._cars[car._id] = car
+            self._write(_CAR_RECORD, _CAR.pack(car._id, car.car_type.value, car.status.value, car.location._id) +
+                        _pack_strings(car.name, car.car_license, car._chassis_number))
+
+    def log_reservations(self, reservations: Sequence[Reserve], recorded: List[Reserve]):
+        """Log booked reservations and add them to `recorded` in one step, so a concurrent
+        compaction sees either both or neither. Returns once the records are written to the WAL
+        file, the caller acknowledges the bookings only after that."""
+        with self._lock:
+            for reservation in reservations:
+                self._log_user(reservation.user)
+                self._log_location(reservation.pickup)
+                self._log_location(reservation.drop)
+                self._write(_RESERVATION_RECORD, _RESERVATION.pack(
+                    reservation._id, reservation.user._id, reservation.car._id, reservation.pickup._id,
+                    reservation.drop._id, reservation.rental_price, reservation.duration_in_hr,
+                    _timestamp(reservation.start_time)))
+            self._log_file.flush()
+            if self.fsync:
+                os.fsync(self._log_file.fileno())
+            recorded.extend(reservations)
+
+    def _replay(self):
+        log_path = self._log_path(self.generation)
+        if not os.path.exists(log_path):
+            return
+        with open(log_path, "rb") as f:
+            data = memoryview(f.read())
+
+        offset = 0
+        count = 0
+        while offset + _RECORD_HEADER.size <= len(data):
+            record_type, size = _RECORD_HEADER.unpack_from(data, offset)
+            start = offset + _RECORD_HEADER.size
+            if start + size > len(data):
+                break
+            self._apply(record_type, data[start:start + size])
+            offset = start + size
+            count += 1
+        if offset != len(data):
+            # Drop a record that was only partially written before a crash
+            with open(log_path, "r+b") as f:
+                f.truncate(offset)
+        self.records_since_snapshot = count
+
+    def _apply(self, record_type: int, payload: memoryview):
+        system = self.system
+        if record_type == _LOCATION_RECORD:
+            location_id, latitude, longitude = _LOCATION.unpack_from(payload)
+            pincode, city, address = _unpack_strings(payload, _LOCATION.size, 3)
+            self._locations[location_id] = _new(Location, {
+                "_id": location_id, "pincode": pincode, "latitude": _none_if_nan(latitude),
+                "longitude": _none_if_nan(longitude), "city": city, "address": address})
+        elif record_type == _USER_RECORD:
+            user_id, user_type, location_id = _USER.unpack_from(payload)
+            name, license_id = _unpack_strings(payload, _USER.size, 2)
+            user = User(user_id, name, _USER_TYPES[user_type], self._locations[location_id], license_id)
+            self._users[user_id] = user
+            system.users.append(user)
+        elif record_type == _CAR_RECORD:
+            car_id, car_type, status, location_id = _CAR.unpack_from(payload)
+            name, car_license, chassis_number = _unpack_strings(payload, _CAR.size, 3)
+            car = self._cars.get(car_id)
+            if car is None:
+                car = Car(car_id, name, _CAR_TYPES[car_type], _STATUSES[status], car_license,
+                          self._locations[location_id], chassis_number)
+                self._cars[car_id] = car
+                system.add_car(car)
+            else:
+                car.update_car_details(name, _CAR_TYPES[car_type], _STATUSES[status], car_license,
+                                       self._locations[location_id])
+        elif record_type == _RESERVATION_RECORD:
+            (reservation_id, user_id, car_id, pickup_id, drop_id, rental_price, duration_in_hr,
+             start) = _RESERVATION.unpack_from(payload)
+            reservation = Reserve(reservation_id, self._users[user_id], self._cars[car_id], self._locations[pickup_id],
+                                  self._locations[drop_id], rental_price, duration_in_hr,
+                                  None if math.isnan(start) else _datetime(start))
+            if reservation.start_time is not None:
+                reservation.car.schedule.book(reservation.start_time, reservation.end_time, reservation_id)
+            system.reservations.append(reservation)
+
+    # ---------- Snapshot ----------
+
+    def compact(self):
+        """Write the whole fleet to a new snapshot and start a new (empty) WAL generation."""
+        system = self.system
+        # Same lock order as the car listeners: index lock, then store lock
+        with system._index_lock, self._lock:
+            self._log_file.close()
+            old_generation = self.generation
+            self.generation += 1
+            tmp_path = os.path.join(self.directory, "snapshot.bin.tmp")
+            with open(tmp_path, "wb") as f:
+                self._write_snapshot(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, os.path.join(self.directory, "snapshot.bin"))
+            _fsync_directory(self.directory)  # the rename is durable only once the directory is
+            self._log_file = open(self._log_path(self.generation), "ab")
+            os.remove(self._log_path(old_generation))  # only now, a crash before replays the old WAL
+            self.records_since_snapshot = 0
+
+    def _write_snapshot(self, f):
+        system = self.system
+        reservations = list(system.reservations)
+        users = {user._id: user for user in system.users}
+        users.update((reservation.user._id, reservation.user) for reservation in reservations)
+        locations = {location._id: location for location in system.locations}
+        for objects in (system.cars, users.values()):
+            locations.update((obj.location._id, obj.location) for obj in objects)
+        for reservation in reservations:
+            locations[reservation.pickup._id] = reservation.pickup
+            locations[reservation.drop._id] = reservation.drop
+
+        strings: Dict[Optional[str], int] = {None: -1}
+
+        def ref(value: Optional[str]) -> int:
+            index = strings.get(value)
+            if index is None:
+                index = strings[value] = len(strings) - 1
+            return index
+
+        def nan_if_none(value: Optional[float]) -> float:
+            return math.nan if value is None else value
+
+        columns = [
+            [[location._id for location in locations.values()],
+             [nan_if_none(location.latitude) for location in locations.values()],
+             [nan_if_none(location.longitude) for location in locations.values()],
+             [ref(location.pincode) for location in locations.values()],
+             [ref(location.city) for location in locations.values()],
+             [ref(location.address) for location in locations.values()]],
+            [[user._id for user in users.values()],
+             [user.user_type.value for user in users.values()],
+             [user.location._id for user in users.values()],
+             [ref(user.name) for user in users.values()],
+             [ref(user.license_id) for user in users.values()]],
+            [[car._id for car in system.cars],
+             [car.car_type.value for car in system.cars],
+             [car.status.value for car in system.cars],
+             [car.location._id for car in system.cars],
+             [ref(car.name) for car in system.cars],
+             [ref(car.car_license) for car in system.cars],
+             [ref(car._chassis_number) for car in system.cars]],
+            [[reservation._id for reservation in reservations],
+             [reservation.user._id for reservation in reservations],
+             [reservation.car._id for reservation in reservations],
+             [reservation.pickup._id for reservation in reservations],
+             [reservation.drop._id for reservation in reservations],
+             [reservation.rental_price for reservation in reservations],
+             [reservation.duration_in_hr for reservation in reservations],
+             [_timestamp(reservation.start_time) for reservation in reservations]],
+        ]
+        del strings[None]
+        encoded = [string.encode() for string in strings]
+        lengths = struct.pack(f"<{len(encoded)}{_STRING_LENGTH}", *map(len, encoded))
+        string_bytes = b"".join(encoded)
+        f.write(_HEADER.pack(_MAGIC, self.generation, len(encoded), len(string_bytes), len(locations), len(users),
+                             len(system.cars), len(reservations)))
+        f.write(lengths + bytes(_padding(len(lengths))))
+        f.write(string_bytes + bytes(_padding(len(string_bytes))))
+        for table, layout in zip(columns, (_LOCATION_COLUMNS, _USER_COLUMNS, _CAR_COLUMNS, _RESERVATION_COLUMNS)):
+            for values, (_, fmt) in zip(table, layout):
+                data = struct.pack(f"<{len(values)}{fmt}", *values)
+                f.write(data + bytes(_padding(len(data))))
+
+    def _load_snapshot(self, path: str):
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, self.generation, no_of_strings, strings_size, *sizes = _HEADER.unpack_from(mm)
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is not a fleet snapshot")
+            offset = _HEADER.size
+            tables = []
+            view = memoryview(mm)
+            try:
+                nbytes = no_of_strings * struct.calcsize(_STRING_LENGTH)
+                ends = list(accumulate(view[offset:offset + nbytes].cast(_STRING_LENGTH).tolist()))
+                offset += nbytes + _padding(nbytes)
+                strings = _split_strings(mm[offset:offset + strings_size], ends)
+                strings.append(None)  # string ref -1
+                offset += strings_size + _padding(strings_size)
+
+                for size, layout in zip(sizes, (_LOCATION_COLUMNS, _USER_COLUMNS, _CAR_COLUMNS,
+                                                _RESERVATION_COLUMNS)):
+                    table = []
+                    for _, fmt in layout:
+                        nbytes = size * struct.calcsize(fmt)
+                        # Cast without copying, the column is then copied once into a list
+                        column = view[offset:offset + nbytes].cast(fmt)
+                        table.append(column.tolist())
+                        column.release()
+                        offset += nbytes + _padding(nbytes)
+                    tables.append(table)
+            finally:
+                view.release()
+        self._restore(strings, *tables)
+
+    def _restore(self, strings: List[Optional[str]], location_table: List[list], user_table: List[list],
+                 car_table: List[list], reservation_table: List[list]):
+        system = self.system
+        location_ids, latitudes, longitudes, pincodes, cities, addresses = location_table
+        locations = _new_many(Location, len(location_ids), {
+            "_id": location_ids, "pincode": map(strings.__getitem__, pincodes),
+            "latitude": map(_none_if_nan, latitudes), "longitude": map(_none_if_nan, longitudes),
+            "city": map(strings.__getitem__, cities), "address": map(strings.__getitem__, addresses)})
+        self._locations = by_location_id = dict(zip(location_ids, locations))
+        system.locations = locations
+
+        user_ids, user_types, user_locations, names, license_ids = user_table
+        users = _new_many(User, len(user_ids), {
+            "_id": user_ids, "name": map(strings.__getitem__, names),
+            "user_type": map(_USER_TYPES.__getitem__, user_types),
+            "location": map(by_location_id.__getitem__, user_locations),
+            "license_id": map(strings.__getitem__, license_ids)})
+        self._users = by_user_id = dict(zip(user_ids, users))
+        system.users = users
+
+        # The attributes set by Car.__init__
+        car_ids, car_types, statuses, car_locations, names, car_licenses, chassis_numbers = car_table
+        no_of_cars = len(car_ids)
+        cars = _new_many(Car, no_of_cars, {
+            "_id": car_ids, "name": map(strings.__getitem__, names),
+            "car_type": map(_CAR_TYPES.__getitem__, car_types), "_status": map(_STATUSES.__getitem__, statuses),
+            "car_license": map(strings.__getitem__, car_licenses),
+            "location": map(by_location_id.__getitem__, car_locations),
+            "_chassis_number": map(strings.__getitem__, chassis_numbers),
+            "_listeners": ([] for _ in range(no_of_cars)), "schedule": (CarSchedule() for _ in range(no_of_cars)),
+            "version": repeat(0)})
+        self._cars = by_car_id = dict(zip(car_ids, cars))
+        system.add_cars(cars)
+
+        reservation_ids, user_ids, car_ids, pickups, drops, prices, durations, starts = reservation_table
+        reserved_cars = list(map(by_car_id.__getitem__, car_ids))
+        start_times, end_times = [], []
+        windows: Dict[Tuple[float, int], Tuple[datetime, datetime]] = {}  # bookings share their start times
+        for reservation_id, car, duration, start in zip(reservation_ids, reserved_cars, durations, starts):
+            if start == start:  # not NaN --> a time window
+                window = windows.get((start, duration))
+                if window is None:
+                    start_time = _datetime(start)
+                    window = windows[start, duration] = (start_time, start_time + timedelta(hours=duration))
+                start_time, end_time = window
+                car.schedule.book(start_time, end_time, reservation_id)
+            else:
+                start_time = end_time = None
+            start_times.append(start_time)
+            end_times.append(end_time)
+        system.reservations = _new_many(Reserve, len(reservation_ids), {
+            "_id": reservation_ids, "user": map(by_user_id.__getitem__, user_ids), "car": reserved_cars,
+            "pickup": map(by_location_id.__getitem__, pickups), "drop": map(by_location_id.__getitem__, drops),
+            "rental_price": prices, "duration_in_hr": durations, "start_time": start_times, "end_time": end_times,
+            "car_version": repeat(None)})
+
+    # ---------- Files ----------
+
+    def _log_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"wal.{generation}.log")
+
+    def flush(self):
+        with self._lock:
+            self._log_file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+        self.system.store = None
+
+
+def _fsync_directory(directory: str):
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def generate_fleet(system: CarReservationSystem, no_of_cars: int, no_of_reservations: int, seed: int = 7):
+    """Random cars around a few cities plus a booking history, every change goes to the store."""
+    import random
+
+    rng = random.Random(seed)
+    cities = [("Bangalore", 12.9716, 77.5946), ("Delhi", 28.6139, 77.2090), ("Mumbai", 19.0760, 72.8777)]
+    car_types = list(CarType)
+    for i in range(no_of_cars):
+        city, latitude, longitude = cities[i % len(cities)]
+        location = Location(i, f"{560000 + i % 100}", latitude + rng.uniform(-0.2, 0.2),
+                            longitude + rng.uniform(-0.2, 0.2), city, f"Parking {i % 1000}")
+        system.add_car(Car(i, f"Car {i}", car_types[i % len(car_types)], StatusType.VACANT, f"KA{i:08d}",
+                           location, f"CH{i:010d}"))
+    users = [User(i, f"User {i}", UserType.CUSTOMER, system.cars[i].location, f"DL{i:08d}")
+             for i in range(min(no_of_cars, 10_000))]
+    first_day = datetime(2025, 1, 1)
+    cars = system.cars
+    batch = []
+    for i in range(no_of_reservations):
+        user = users[i % len(users)]
+        car = cars[rng.randrange(no_of_cars)]
+        start = first_day + timedelta(hours=rng.randrange(24 * 365))
+        batch.append(Reserve(i, user, car, user.location, car.location, 1000.0, rng.randint(1, 8), start_time=start))
+        if len(batch) == 1000:
+            system.book_cars(batch, all_or_nothing=False)
+            batch = []
+    system.book_cars(batch, all_or_nothing=False)
+
+
+# Example Usage: warm start time of a large fleet
+if __name__ == "__main__":
+    import argparse
+    import contextlib
+    import tempfile
+    import time
+
+    parser = argparse.ArgumentParser(description="Fleet snapshot + WAL restart times.")
+    parser.add_argument("--cars", type=int, default=1_000_000)
+    parser.add_argument("--reservations", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = FleetStore(directory)
+        start = time.perf_counter()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            generate_fleet(store.system, args.cars, args.reservations)
+        store.close()
+        store = None  # one fleet in memory at a time
+        print(f"Logged {args.cars} cars and {args.reservations} bookings in {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        store = FleetStore(directory)
+        print(f"Replayed {store.records_since_snapshot} WAL records in {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        store.compact()
+        store.close()
+        store = None
+        print(f"Wrote snapshot of {os.path.getsize(os.path.join(directory, 'snapshot.bin')) / 2 ** 20:.0f} MB "
+              f"in {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        store = FleetStore(directory)
+        print(f"Loaded snapshot of {len(store.system.cars)} cars and {len(store.system.reservations)} reservations "
+              f"in {time.perf_counter() - start:.2f}s")
+        print(f"Vacant SEDANs in Delhi: {len(store.system.get_cars('Delhi', CarType.SEDAN, StatusType.VACANT))}")
+        store.close()
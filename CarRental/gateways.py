@@ -0,0 +1,280 @@
+'''
+Gateways:-
+
+Asynchronous PaymentGateway and NotificationGateway clients for car reservations, plus a
+local stand-in server to benchmark them offline.
+
+	•	Protocol: one JSON object per line over TCP, {"id", "op", ...} --> {"id", "ok", ...}
+	•	Pipelining: a connection sends requests without waiting for earlier responses, the
+	                responses (in any order) are matched to their requests by id
+	•	Pool: --pool-size connections per gateway, a request goes to the connection with the
+	          fewest requests in flight, each connection holds at most max_in_flight of them
+	•	Timeout: every request fails with GatewayError after timeout_s, a broken connection
+	             fails its requests in flight and is reopened by the next request
+	•	Checkout: book_car() (car locks, no I/O) first, then payment capture and confirmation
+	              run concurrently. Capture is idempotent on the reservation id, so a failed
+	              one can be retried
+	•	Server: answers every request after --latency-ms, requests of a connection are handled
+	            concurrently, so their responses can come back out of order
+
+Usage:-
+python gateways.py --reservations 5000 --pool-size 1 4 --max-in-flight 1 32 --latency-ms 5
+
+'''
+
+import asyncio
+import itertools
+import json
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from car_rental import CarReservationSystem, Reserve
+
+
+class GatewayError(Exception):
+    pass
+
+
+class GatewayConnection:
+    def __init__(self, host: str, port: int, max_in_flight: int = 32):
+        self.host = host
+        self.port = port
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._pending: Dict[int, asyncio.Future] = {}  # request id --> response
+        self._ids = itertools.count(1)
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._receiver: Optional[asyncio.Task] = None
+        self._connecting = asyncio.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def _connect(self):
+        async with self._connecting:
+            if self._writer is None:
+                self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+                self._receiver = asyncio.create_task(self._receive(self._reader))
+
+    async def _receive(self, reader: asyncio.StreamReader):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    raise ConnectionError("gateway closed the connection")
+                response = json.loads(line)
+                future = self._pending.pop(response["id"], None)
+                if future is not None and not future.done():  # None: the request timed out
+                    future.set_result(response)
+        except (ConnectionError, OSError, ValueError) as e:
+            self._fail_pending(GatewayError(f"connection to {self.host}:{self.port} lost: {e}"))
+
+    def _fail_pending(self, error: GatewayError):
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def request(self, op: str, payload: dict, timeout_s: float) -> dict:
+        async with self._slots:
+            if self._writer is None:
+                try:
+                    await asyncio.wait_for(self._connect(), timeout_s)
+                except (OSError, asyncio.TimeoutError) as e:
+                    raise GatewayError(f"can not connect to {self.host}:{self.port}: {e!r}") from None
+            request_id = next(self._ids)
+            future = asyncio.get_running_loop().create_future()
+            self._pending[request_id] = future
+            # No drain() per request, the responses flow back while the next requests are written
+            self._writer.write(json.dumps({"id": request_id, "op": op, **payload}).encode() + b"\n")
+            try:
+                response = await asyncio.wait_for(future, timeout_s)
+            except asyncio.TimeoutError:
+                self._pending.pop(request_id, None)
+                raise GatewayError(f"{op} timed out after {timeout_s}s") from None
+        if not response.get("ok"):
+            raise GatewayError(response.get("error", f"{op} failed"))
+        return response
+
+    async def close(self):
+        if self._receiver is not None:
+            self._receiver.cancel()
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+        self._reader = self._writer = self._receiver = None
+
+
+class GatewayClient:
+    def __init__(self, host: str, port: int, pool_size: int = 4, max_in_flight: int = 32, timeout_s: float = 2.0):
+        self.timeout_s = timeout_s
+        self._pool = [GatewayConnection(host, port, max_in_flight) for _ in range(pool_size)]
+
+    async def request(self, op: str, payload: dict) -> dict:
+        connection = min(self._pool, key=lambda c: c.in_flight)
+        return await connection.request(op, payload, self.timeout_s)
+
+    async def close(self):
+        await asyncio.gather(*(connection.close() for connection in self._pool))
+
+
+class PaymentGateway(GatewayClient):
+    async def capture(self, reservation: Reserve) -> dict:
+        # The reservation id is the idempotency key, a retried capture does not charge twice
+        return await self.request("capture", {"reservation_id": reservation._id,
+                                              "user_id": reservation.user._id,
+                                              "amount": reservation.get_price()})
+
+
+class NotificationGateway(GatewayClient):
+    async def send_confirmation(self, reservation: Reserve) -> dict:
+        return await self.request("notify", {"reservation_id": reservation._id,
+                                             "user_id": reservation.user._id,
+                                             "message": f"Reservation confirmed for User {reservation.user.name} "
+                                                        f"with Car {reservation.car.name}."})
+
+
+class ReservationCheckout:
+    def __init__(self, system: CarReservationSystem, payment_gateway: PaymentGateway,
+                 notification_gateway: NotificationGateway):
+        self.system = system
+        self.payment_gateway = payment_gateway
+        self.notification_gateway = notification_gateway
+
+    async def checkout(self, reservation: Reserve) -> Dict[str, object]:
+        """Book the car, then capture the payment and send the confirmation at the same time.
+        Gateway failures are returned (not raised), the booking itself stands."""
+        # No I/O while the car locks are held, the gateways are only called after book_car() returned
+        if not self.system.book_car(reservation):
+            return {"booked": False, "payment": None, "notification": None}
+        payment, notification = await asyncio.gather(self.payment_gateway.capture(reservation),
+                                                     self.notification_gateway.send_confirmation(reservation),
+                                                     return_exceptions=True)
+        return {"booked": True, "payment": payment, "notification": notification}
+
+
+# ---------- Local stand-in server ----------
+
+class GatewayServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 5.0, failure_rate: float = 0.0,
+                 seed: int = 42):
+        self.host = host
+        self.port = port
+        self.latency_s = latency_ms / 1000
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._captured: Dict[int, dict] = {}  # reservation id --> capture response
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        tasks = set()
+        try:
+            async for line in reader:
+                task = asyncio.create_task(self._respond(json.loads(line), writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+
+    async def _respond(self, request: dict, writer: asyncio.StreamWriter):
+        # Random jitter, responses of a pipelined connection come back out of order
+        await asyncio.sleep(self.latency_s * self._rng.uniform(0.5, 1.5))
+        if self._rng.random() < self.failure_rate:
+            response = {"id": request["id"], "ok": False, "error": f"{request['op']} declined"}
+        elif request["op"] == "capture":
+            captured = self._captured.setdefault(request["reservation_id"], {
+                "transaction_id": f"TXN{len(self._captured) + 1:08d}", "amount": request["amount"]})
+            response = {"id": request["id"], "ok": True, **captured}
+        elif request["op"] == "notify":
+            response = {"id": request["id"], "ok": True}
+        else:
+            response = {"id": request["id"], "ok": False, "error": f"unknown op {request['op']}"}
+        writer.write(json.dumps(response).encode() + b"\n")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_checkouts(no_of_reservations: int, pool_size: int, max_in_flight: int, latency_ms: float,
+                        concurrency: int = 256) -> Dict[str, float]:
+    """Checkout of one reservation per car against a local server, `concurrency` at a time."""
+    from fleet_benchmark import FleetGenerator
+
+    server = GatewayServer(latency_ms=latency_ms)
+    port = await server.start()
+    system = FleetGenerator(no_of_cars=no_of_reservations, no_of_users=100, inactive_share=0).build_system()
+    user = system.users[0]
+    payment = PaymentGateway("127.0.0.1", port, pool_size, max_in_flight)
+    notification = NotificationGateway("127.0.0.1", port, pool_size, max_in_flight)
+    checkout = ReservationCheckout(system, payment, notification)
+    limit = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    results: List[Tuple[bool, bool]] = []
+
+    async def one(reservation: Reserve):
+        async with limit:
+            start = time.perf_counter()
+            result = await checkout.checkout(reservation)
+            latencies.append((time.perf_counter() - start) * 1000)
+            results.append((not isinstance(result["payment"], Exception),
+                            not isinstance(result["notification"], Exception)))
+
+    reservations = [Reserve(i, user, car, user.location, car.location, 1000.0, 2)
+                    for i, car in enumerate(system.cars)]
+    start = time.perf_counter()
+    await asyncio.gather(*(one(reservation) for reservation in reservations))
+    elapsed = time.perf_counter() - start
+    await payment.close()
+    await notification.close()
+    await server.stop()
+
+    latencies.sort()
+    return {"pool_size": pool_size, "max_in_flight": max_in_flight, "checkouts": len(results),
+            "paid": sum(paid for paid, _ in results), "notified": sum(notified for _, notified in results),
+            "checkouts_per_sec": len(results) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 50), "p99_ms": percentile(latencies, 99)}
+
+
+if __name__ == "__main__":
+    import argparse
+    import contextlib
+    import os
+
+    parser = argparse.ArgumentParser(description="Checkout throughput/latency against a local gateway server.")
+    parser.add_argument("--reservations", type=int, default=5000)
+    parser.add_argument("--pool-size", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--max-in-flight", type=int, nargs="+", default=[1, 32])
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=256, help="checkouts in progress at once")
+    args = parser.parse_args()
+
+    print(f"{'pool':>5}{'in flight':>10}{'checkouts':>10}{'paid':>7}{'notified':>9}{'checkouts/s':>12}"
+          f"{'p50 ms':>8}{'p99 ms':>8}")
+    for pool_size in args.pool_size:
+        for max_in_flight in args.max_in_flight:
+            # book_car() prints every booking
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                result = asyncio.run(run_checkouts(args.reservations, pool_size, max_in_flight, args.latency_ms,
+                                                   args.concurrency))
+            print(f"{result['pool_size']:>5}{result['max_in_flight']:>10}{result['checkouts']:>10}{result['paid']:>7}"
+                  f"{result['notified']:>9}{result['checkouts_per_sec']:>12.0f}{result['p50_ms']:>8.1f}"
+                  f"{result['p99_ms']:>8.1f}")
@@ -0,0 +1,131 @@
+'''
+Geo Index:-
+
+Uniform grid over latitude/longitude used to find the k nearest items (cars) to a point
+without scanning every item.
+
+	•	Cell: (floor(latitude / cell_size), floor(longitude / cell_size)), ~1.1km for 0.01 degree
+	•	Partition: items are kept per key (e.g. CarType), a search only touches its own grid
+	•	Search: rings of cells around the query cell, nearest first. Stops as soon as the next
+	            ring cannot hold anything closer than the current k-th item or the radius
+
+Partition --> Cell --> set of items, plus item --> (partition, cell) to move/remove in O(1).
+
+'''
+
+import heapq
+import math
+from itertools import count
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+EARTH_RADIUS_KM = 6371
+KM_PER_DEGREE = 2 * math.pi * EARTH_RADIUS_KM / 360
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GeoIndex:
+    def __init__(self, cell_size_deg: float = 0.01):
+        self.cell_size_deg = cell_size_deg
+        self._grids: Dict[Hashable, Dict[Tuple[int, int], Set[Hashable]]] = {}
+        self._positions: Dict[Hashable, Tuple[Hashable, Tuple[int, int], float, float]] = {}
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._positions
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return math.floor(latitude / self.cell_size_deg), math.floor(longitude / self.cell_size_deg)
+
+    def add(self, item: Hashable, latitude: float, longitude: float, key: Hashable = None):
+        """Add (or move) an item, `key` is the partition it can be searched in."""
+        if item in self._positions:
+            self.remove(item)
+        cell = self._cell(latitude, longitude)
+        self._grids.setdefault(key, {}).setdefault(cell, set()).add(item)
+        self._positions[item] = (key, cell, latitude, longitude)
+
+    def add_many(self, items: Iterable[Hashable], latitudes: Iterable[float], longitudes: Iterable[float],
+                 keys: Iterable[Hashable]):
+        """Bulk add() of new items (e.g. a fleet loaded on startup), without per item method calls."""
+        grids = self._grids
+        positions = self._positions
+        cell_size = self.cell_size_deg
+        floor = math.floor
+        for item, latitude, longitude, key in zip(items, latitudes, longitudes, keys):
+            if item in positions:
+                self.remove(item)
+            cell = (floor(latitude / cell_size), floor(longitude / cell_size))
+            grid = grids.get(key)
+            if grid is None:
+                grid = grids[key] = {}
+            cell_items = grid.get(cell)
+            if cell_items is None:
+                cell_items = grid[cell] = set()
+            cell_items.add(item)
+            positions[item] = (key, cell, latitude, longitude)
+
+    def remove(self, item: Hashable):
+        position = self._positions.pop(item, None)
+        if position is None:
+            return
+        key, cell, _, _ = position
+        grid = self._grids[key]
+        grid[cell].discard(item)
+        if not grid[cell]:
+            del grid[cell]
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1, radius_km: float = math.inf,
+                key: Hashable = None) -> List[Tuple[float, Hashable]]:
+        """Up to k (distance_km, item) of partition `key` within radius_km, nearest first."""
+        grid = self._grids.get(key)
+        if not grid or k <= 0:
+            return []
+        center_lat, center_lon = self._cell(latitude, longitude)
+        # Smallest side of a cell in km, longitude degrees shrink towards the poles
+        widest_latitude = min(abs(latitude) + self.cell_size_deg, 90)
+        cell_km = self.cell_size_deg * KM_PER_DEGREE * max(math.cos(math.radians(widest_latitude)), 1e-6)
+        if math.isinf(radius_km):
+            max_ring = max(max(abs(cell_lat - center_lat), abs(cell_lon - center_lon)) for cell_lat, cell_lon in grid)
+        else:
+            max_ring = int(radius_km / cell_km) + 1
+
+        best: List[Tuple[float, int, Hashable]] = []  # max-heap of the k best as (-distance, tie, item)
+        tie = count()
+        for ring in range(max_ring + 1):
+            # Every cell of this ring is at least (ring - 1) cells away from the query point
+            if (ring - 1) * cell_km > radius_km or (len(best) == k and (ring - 1) * cell_km > -best[0][0]):
+                break
+            for cell in self._ring_cells(center_lat, center_lon, ring):
+                items = grid.get(cell)
+                if not items:
+                    continue
+                for item in items:
+                    _, _, item_lat, item_lon = self._positions[item]
+                    distance = haversine_km(latitude, longitude, item_lat, item_lon)
+                    if distance > radius_km:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, next(tie), item))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, next(tie), item))
+        return [(-negative_distance, item) for negative_distance, _, item in sorted(best, reverse=True)]
+
+    @staticmethod
+    def _ring_cells(center_lat: int, center_lon: int, ring: int):
+        if ring == 0:
+            yield center_lat, center_lon
+            return
+        for dlon in range(-ring, ring + 1):
+            yield center_lat - ring, center_lon + dlon
+            yield center_lat + ring, center_lon + dlon
+        for dlat in range(-ring + 1, ring):
+            yield center_lat + dlat, center_lon - ring
+            yield center_lat + dlat, center_lon + ring
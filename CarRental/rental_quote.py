@@ -0,0 +1,147 @@
+'''
+Rental Quote Engine:-
+
+Prices many (car, pickup, drop, duration) requests in one pass, e.g. every candidate car of a
+search page for several durations, and turns the quotes into Reserve objects.
+
+	•	Price: (base fare + hourly rate * hours + per km rate * pickup --> drop km) * demand multiplier
+	•	Rates: per CarType, an XUV costs more than a SEDAN
+	•	Distance: haversine between the Location coordinates, computed once per (pickup, drop) pair
+	•	Demand: multiplier per hour of the day of the pickup (start_time, now if there is none)
+	•	Columns: the inputs are processed column by column (rates, distances, multipliers), not
+	             request by request, so a batch costs a few list passes instead of many calls
+
+Usage:-
+engine = RentalQuoteEngine()
+prices = engine.quote_many(cars, pickups, drops, durations, start_times)
+by_duration = engine.quote_grid(cars, pickup, drop, [2, 4, 8], start_time)
+reservations = engine.reserve_many(ids, users, cars, pickups, drops, durations, start_times)
+
+'''
+
+import math
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from car_rental import Car, CarType, Location, Reserve, User
+from geo_index import EARTH_RADIUS_KM
+
+# CarType --> (base fare, per hour, per km)
+DEFAULT_RATES: Dict[CarType, Tuple[float, float, float]] = {
+    CarType.SEDAN: (200.0, 150.0, 12.0),
+    CarType.XUV: (300.0, 250.0, 18.0),
+}
+
+# Demand multiplier per hour of the day: cheap nights, morning and evening peaks
+DEFAULT_DEMAND = (0.8,) * 6 + (1.0, 1.1, 1.3, 1.3, 1.1) + (1.0,) * 6 + (1.2, 1.4, 1.4, 1.2) + (1.0,) * 3
+
+
+class RentalQuoteEngine:
+    def __init__(self, rates: Optional[Dict[CarType, Tuple[float, float, float]]] = None,
+                 demand_by_hour: Sequence[float] = DEFAULT_DEMAND):
+        if len(demand_by_hour) != 24:
+            raise ValueError("demand_by_hour needs one multiplier per hour of the day")
+        self.rates = dict(DEFAULT_RATES if rates is None else rates)
+        self.demand_by_hour = tuple(demand_by_hour)
+
+    def distances_km(self, pickups: Sequence[Location], drops: Sequence[Location]) -> List[float]:
+        """Pickup --> drop distance per request, 0 if a location has no coordinates."""
+        pairs: Dict[Tuple[Location, Location], Optional[float]] = dict.fromkeys(zip(pickups, drops))
+        radians, sin, cos, asin, sqrt = math.radians, math.sin, math.cos, math.asin, math.sqrt
+        for pickup, drop in pairs:
+            if None in (pickup.latitude, pickup.longitude, drop.latitude, drop.longitude):
+                pairs[pickup, drop] = 0.0
+                continue
+            lat1, lat2 = radians(pickup.latitude), radians(drop.latitude)
+            a = sin((lat2 - lat1) / 2) ** 2 + \
+                cos(lat1) * cos(lat2) * sin(radians(drop.longitude - pickup.longitude) / 2) ** 2
+            pairs[pickup, drop] = 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+        return [pairs[pair] for pair in zip(pickups, drops)]
+
+    def demand_multipliers(self, start_times: Optional[Sequence[Optional[datetime]]], size: int) -> List[float]:
+        now = self.demand_by_hour[datetime.now().hour]
+        if start_times is None:
+            return [now] * size
+        demand = self.demand_by_hour
+        return [now if start is None else demand[start.hour] for start in start_times]
+
+    def quote_many(self, cars: Sequence[Car], pickups: Sequence[Location], drops: Sequence[Location],
+                   durations: Sequence[int], start_times: Optional[Sequence[Optional[datetime]]] = None) -> List[float]:
+        """Price of every (car, pickup, drop, duration, start time) request, rounded to 2 decimals."""
+        if not len(cars) == len(pickups) == len(drops) == len(durations):
+            raise ValueError("cars, pickups, drops and durations need the same length")
+        rates = self.rates
+        car_rates = [rates[car.car_type] for car in cars]
+        distances = self.distances_km(pickups, drops)
+        multipliers = self.demand_multipliers(start_times, len(cars))
+        return [round((base + hourly * hours + per_km * distance) * multiplier, 2)
+                for (base, hourly, per_km), hours, distance, multiplier
+                in zip(car_rates, durations, distances, multipliers)]
+
+    def quote_grid(self, cars: Sequence[Car], pickup: Location, drop: Location, durations: Sequence[int],
+                   start_time: Optional[datetime] = None) -> Dict[int, List[float]]:
+        """Search page: duration --> price of every car, for one pickup, drop and start time."""
+        (distance,) = self.distances_km([pickup], [drop])
+        (multiplier,) = self.demand_multipliers([start_time], 1)
+        # Per CarType the price only depends on the duration, cars of a type share it
+        prices = {car_type: {hours: round((base + hourly * hours + per_km * distance) * multiplier, 2)
+                             for hours in durations}
+                  for car_type, (base, hourly, per_km) in self.rates.items()}
+        car_prices = [prices[car.car_type] for car in cars]
+        return {hours: [price[hours] for price in car_prices] for hours in durations}
+
+    def quote(self, car: Car, pickup: Location, drop: Location, duration_in_hr: int,
+              start_time: Optional[datetime] = None) -> float:
+        return self.quote_many([car], [pickup], [drop], [duration_in_hr], [start_time])[0]
+
+    def reserve_many(self, ids: Sequence[int], users: Sequence[User], cars: Sequence[Car],
+                     pickups: Sequence[Location], drops: Sequence[Location], durations: Sequence[int],
+                     start_times: Optional[Sequence[Optional[datetime]]] = None,
+                     car_versions: Optional[Sequence[Optional[int]]] = None) -> List[Reserve]:
+        """Quoted reservations, ready for CarReservationSystem.book_cars()."""
+        prices = self.quote_many(cars, pickups, drops, durations, start_times)
+        size = len(cars)
+        return [Reserve(id, user, car, pickup, drop, price, hours, start, version)
+                for id, user, car, pickup, drop, price, hours, start, version
+                in zip(ids, users, cars, pickups, drops, prices, durations,
+                       start_times if start_times is not None else [None] * size,
+                       car_versions if car_versions is not None else [None] * size)]
+
+
+# Example Usage: quotes for a search page, then a booking
+if __name__ == "__main__":
+    import random
+    import time
+
+    from car_rental import CarReservationSystem, StatusType, UserType
+
+    rng = random.Random(3)
+    system = CarReservationSystem()
+    for i in range(500):
+        location = Location(i, "560001", 12.9716 + rng.uniform(-0.1, 0.1), 77.5946 + rng.uniform(-0.1, 0.1),
+                            "Bangalore", f"Street {i}")
+        system.add_car(Car(i, f"Car {i}", rng.choice(list(CarType)), StatusType.VACANT, f"KA{i:06d}", location,
+                           f"CH{i:09d}"))
+    pickup = Location(1000, "560001", 12.9716, 77.5946, "Bangalore", "MG Road")
+    drop = Location(1001, "560100", 12.8399, 77.6770, "Bangalore", "Electronic City")
+    user = User(1, "Alice", UserType.CUSTOMER, pickup, "DL12345")
+    engine = RentalQuoteEngine()
+    start_time = datetime(2025, 1, 10, 18)
+
+    candidates = system.get_nearest_vacant_cars(pickup, CarType.SEDAN, k=200, radius_km=20)
+    start = time.perf_counter()
+    by_duration = engine.quote_grid(candidates, pickup, drop, [2, 4, 8, 24], start_time)
+    print(f"Quoted {len(candidates)} sedans x 4 durations in {(time.perf_counter() - start) * 1000:.2f}ms")
+    for hours, prices in by_duration.items():
+        print(f"{hours}h from 18:00: {prices[0]}")
+
+    cars = rng.sample(system.cars, 300)
+    start = time.perf_counter()
+    prices = engine.quote_many(cars, [car.location for car in cars], [drop] * len(cars),
+                               [rng.randint(1, 8) for _ in cars],
+                               [start_time.replace(hour=rng.randrange(24)) for _ in cars])
+    print(f"Quoted {len(cars)} mixed requests in {(time.perf_counter() - start) * 1000:.2f}ms")
+
+    (reservation,) = engine.reserve_many([1], [user], candidates[:1], [pickup], [drop], [4], [start_time])
+    print(f"{reservation.car.name} for 4h from 18:00: {reservation.get_price()}")
+    system.book_car(reservation)
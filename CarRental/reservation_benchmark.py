@@ -0,0 +1,111 @@
+'''
+Reservation Benchmark:-
+
+Many booking threads reserve cars out of one small "hot" set at the same time.
+
+	•	Single: each thread reads a car and its version, then book_car() with that version
+	•	Batch: each thread books --batch-sizes cars in one all-or-nothing book_cars() call
+	•	Stress check: no car is booked twice and every successful booking (and nothing else)
+	              is recorded in CarReservationSystem.reservations
+	•	Report: successful bookings per second and the conflict rate (lost bookings / attempts)
+
+Usage:-
+python reservation_benchmark.py --threads 1 2 4 8 16 --cars 2000
+
+'''
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List
+
+from car_rental import Car, CarReservationSystem, CarType, Location, Reserve, StatusType, User, UserType
+
+
+def build_system(no_of_cars: int, seed: int = 42) -> CarReservationSystem:
+    rng = random.Random(seed)
+    system = CarReservationSystem()
+    for i in range(no_of_cars):
+        location = Location(i, "560001", 12.9716 + rng.uniform(-0.1, 0.1), 77.5946 + rng.uniform(-0.1, 0.1),
+                            "Bangalore", f"Street {i}")
+        system.add_car(Car(i, f"Car {i}", rng.choice(list(CarType)), StatusType.VACANT, f"KA{i:06d}", location,
+                           f"CH{i:09d}"))
+    return system
+
+
+def run_bookings(no_of_threads: int, no_of_cars: int, attempts_per_thread: int, batch_size: int = 1,
+                 seed: int = 42) -> Dict[str, float]:
+    system = build_system(no_of_cars, seed)
+    cars = system.cars
+    location = cars[0].location
+    user = User(0, "Load", UserType.CUSTOMER, location, "DL00000")
+    successes: List[List[Reserve]] = [[] for _ in range(no_of_threads)]
+    attempts = [0] * no_of_threads
+    barrier = threading.Barrier(no_of_threads + 1)
+
+    def booker(thread_no: int):
+        rng = random.Random(seed * 1000 + thread_no)
+        barrier.wait()
+        for i in range(attempts_per_thread):
+            # Read the cars (and their versions) before booking, as a search result would
+            picked = rng.sample(cars, batch_size)
+            batch = [Reserve(thread_no * attempts_per_thread * batch_size + i * batch_size + j, user, car, location,
+                             location, 1000.0, 2, car_version=car.version) for j, car in enumerate(picked)]
+            attempts[thread_no] += len(batch)
+            if batch_size == 1:
+                booked = [system.book_car(batch[0])]
+            else:
+                booked = system.book_cars(batch)
+            successes[thread_no].extend(reservation for reservation, ok in zip(batch, booked) if ok)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        threads = [threading.Thread(target=booker, args=(i,)) for i in range(no_of_threads)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    # Stress check: no car booked twice, only the successful bookings are recorded
+    booked = [reservation for thread_successes in successes for reservation in thread_successes]
+    bookings_per_car = Counter(reservation.car.name for reservation in booked)
+    double_booked = [name for name, count in bookings_per_car.items() if count > 1]
+    assert not double_booked, f"Cars booked twice: {double_booked[:10]}"
+    assert len(system.reservations) == len(booked), \
+        f"{len(system.reservations)} reservations recorded, {len(booked)} bookings succeeded"
+    assert all(reservation.car.status == StatusType.BOOKED for reservation in booked)
+    vacant = len(system.get_cars(status=StatusType.VACANT))
+    assert vacant == no_of_cars - len(booked), f"{vacant} vacant cars indexed, expected {no_of_cars - len(booked)}"
+
+    total_attempts = sum(attempts)
+    return {"threads": no_of_threads, "booked": len(booked), "bookings_per_sec": len(booked) / elapsed,
+            "conflict_rate": 1 - len(booked) / total_attempts}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent car reservation stress check and throughput benchmark.")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--cars", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 3])
+    parser.add_argument("--rounds", type=int, default=3, help="stress rounds per thread count")
+    args = parser.parse_args()
+
+    # Switch threads far more often than the default 5ms so that check-then-set races show up
+    sys.setswitchinterval(1e-6)
+    print(f"{'batch':>6}{'threads':>8}{'booked':>8}{'bookings/s':>12}{'conflicts':>10}")
+    for batch_size in args.batch_sizes:
+        for no_of_threads in args.threads:
+            # 2x more attempts than cars, at least half of them have to lose
+            attempts_per_thread = max(1, 2 * args.cars // (no_of_threads * batch_size))
+            for round_no in range(args.rounds):
+                result = run_bookings(no_of_threads, args.cars, attempts_per_thread, batch_size, seed=round_no)
+            print(f"{batch_size:>6}{result['threads']:>8}{result['booked']:>8}{result['bookings_per_sec']:>12.0f}"
+                  f"{result['conflict_rate']:>10.1%}")
+    print("No double booking detected.")
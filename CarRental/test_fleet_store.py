@@ -0,0 +1,58 @@
+import os
+from datetime import datetime
+
+from car_rental import CarType, Reserve, StatusType
+from fleet_store import FleetStore, generate_fleet
+
+
+def fleet_state(system):
+    return ([(car._id, car.name, car.car_type, car.status, car.location._id, car.location.city) for car in system.cars],
+            sorted((reservation._id, reservation.car._id, reservation.user._id, reservation.start_time,
+                    reservation.duration_in_hr) for reservation in system.reservations))
+
+
+def test_reload_after_compaction(tmp_path):
+    directory = str(tmp_path)
+    store = FleetStore(directory, fsync=True)
+    generate_fleet(store.system, no_of_cars=300, no_of_reservations=500)
+    store.compact()
+    # Changes after the compaction go to the new WAL generation
+    system = store.system
+    system.cars[0].status = StatusType.INACTIVE
+    user = system.reservations[0].user
+    car = system.cars[1]
+    assert system.book_car(Reserve(10_000, user, car, user.location, car.location, 1000.0, 2,
+                                   start_time=datetime(2026, 3, 1, 9)))
+    expected = fleet_state(system)
+    store.close()
+
+    assert sorted(os.listdir(directory)) == ["snapshot.bin", f"wal.{store.generation}.log"]
+    reloaded = FleetStore(directory)
+    try:
+        assert fleet_state(reloaded.system) == expected
+        assert reloaded.system.get_cars(car.location.city, car.car_type, StatusType.VACANT)
+        assert not reloaded.system.cars[1].can_reserve(start=datetime(2026, 3, 1, 10), end=datetime(2026, 3, 1, 11))
+    finally:
+        reloaded.close()
+
+
+def test_compaction_syncs_snapshot_before_removing_wal(tmp_path, monkeypatch):
+    directory = str(tmp_path)
+    store = FleetStore(directory)
+    generate_fleet(store.system, no_of_cars=50, no_of_reservations=50)
+    calls = []
+    fsync, replace, remove = os.fsync, os.replace, os.remove
+    monkeypatch.setattr(os, "fsync", lambda fd: (calls.append("fsync"), fsync(fd))[1])
+    monkeypatch.setattr(os, "replace", lambda src, dst: (calls.append("replace"), replace(src, dst))[1])
+    monkeypatch.setattr(os, "remove", lambda path: (calls.append("remove"), remove(path))[1])
+    store.compact()
+    store.close()
+    # snapshot file, rename, directory, then the old WAL
+    assert calls == ["fsync", "replace", "fsync", "remove"]
+    reloaded = FleetStore(directory)
+    try:
+        assert len(reloaded.system.cars) == 50
+        assert len(reloaded.system.reservations) == len(store.system.reservations)
+        assert reloaded.system.get_car_by_type(CarType.SEDAN)
+    finally:
+        reloaded.close()
@@ -3,6 +3,13 @@ from typing import List, Optional, Dict, Set
 from datetime import datetime
 import uuid
 
+try:
+    from Spans import tracer  # Logger/Spans.py, when ../Logger is on sys.path (e.g. PYTHONPATH=../Logger)
+    timed = tracer.timed
+except ImportError:  # spans are optional, without the Logger subsystem the entry points are not wrapped
+    def timed(name=None):
+        return lambda func: func
+
 
 class UserType(Enum):
     ADMIN = 3
@@ -202,6 +209,7 @@ class FlightBookingSystem:
     def add_user(self, user: User):
         self.users.append(user)
 
+    @timed()
     def get_schedules(self, date: datetime, start_airport: Airport, end_airport: Airport,
                       arrival_time: datetime, departure_time: datetime, airline: Optional[Airline] = None) -> List[
         FlightSchedule]:
@@ -1,7 +1,11 @@
-from typing import List, Optional
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 from abc import ABC, abstractmethod
+import heapq
 import math
-from DeliveryBoy import DeliveryBoy
+import threading
+from DeliveryBoy import DeliveryBoy, Stop, haversine_km, order_stops
+from DispatchMetrics import metrics
+from DistanceCache import DistanceCache
 
 
 
@@ -11,9 +15,26 @@ class DeliveryAssignmentStrategy(ABC):
     def assign_delivery_boy(self, order: "FoodOrder", delivery_boys: List[DeliveryBoy]):
         pass
 
+    @staticmethod
+    def claim_first(order: "FoodOrder", candidates: Iterable[DeliveryBoy]) -> Optional[DeliveryBoy]:
+        """Assign the first candidate whose claim succeeds, a claim lost to another dispatcher
+        thread retries with the next candidate."""
+        for boy in candidates:
+            if boy.assign_order(order):
+                return boy
+            metrics.incr("claims.lost")
+            if not order.can_move_to("dispatched"):
+                return None  # another dispatcher assigned this very order
+        print("No available delivery boys!")
+        return None
+
 
 # Concrete Strategy: Nearest Delivery Boy
 class NearestDeliveryBoyStrategy(DeliveryAssignmentStrategy):
+    def __init__(self, distance_cache: Optional[DistanceCache] = None):
+        self.distance_cache = distance_cache  # None --> exact Haversine distance for every delivery boy
+
+    @metrics.timed()
     def assign_delivery_boy(self, order: "FoodOrder", delivery_boys: List[DeliveryBoy]):
         """Assign the nearest available delivery boy to the order."""
         restaurant_location = (order.restaurant.location.latitude, order.restaurant.location.longitude)
@@ -23,17 +44,27 @@ class NearestDeliveryBoyStrategy(DeliveryAssignmentStrategy):
             print("No available delivery boys!")
             return None
 
-        # Find the nearest delivery boy
-        nearest_boy = min(available_boys, key=lambda boy: boy.distance_from(restaurant_location))
-        nearest_boy.assign_order(order)
-        return nearest_boy
+        # Nearest first, the next nearest is only looked up when a claim is lost
+        return self.claim_first(order, self._nearest_first(available_boys, restaurant_location))
+
+    def _nearest_first(self, boys: List[DeliveryBoy], location: Tuple[float, float]) -> Iterator[DeliveryBoy]:
+        if self.distance_cache:
+            distances = self.distance_cache.distances_from(location, [boy.location for boy in boys])
+        else:
+            distances = [boy.distance_from(location) for boy in boys]
+        heap = list(zip(distances, range(len(boys))))
+        heapq.heapify(heap)
+        while heap:
+            yield boys[heapq.heappop(heap)[1]]
 
 
 # Concrete Strategy: Round-Robin Assignment
 class RoundRobinDeliveryBoyStrategy(DeliveryAssignmentStrategy):
     def __init__(self):
         self.last_assigned_index = -1
+        self._lock = threading.Lock()  # last_assigned_index is shared by the dispatcher threads
 
+    @metrics.timed()
     def assign_delivery_boy(self, order: "FoodOrder", delivery_boys: List[DeliveryBoy]):
         """Assign delivery boys in a round-robin fashion."""
         available_boys = [boy for boy in delivery_boys if boy.status == "available"]
@@ -43,14 +74,19 @@ class RoundRobinDeliveryBoyStrategy(DeliveryAssignmentStrategy):
             return None
 
         # Round-robin assignment
-        self.last_assigned_index = (self.last_assigned_index + 1) % len(available_boys)
-        selected_boy = available_boys[self.last_assigned_index]
-        selected_boy.assign_order(order)
-        return selected_boy
+        return self.claim_first(order, self._next_boys(available_boys))
+
+    def _next_boys(self, available_boys: List[DeliveryBoy]) -> Iterator[DeliveryBoy]:
+        for _ in range(len(available_boys)):
+            with self._lock:
+                self.last_assigned_index = (self.last_assigned_index + 1) % len(available_boys)
+                index = self.last_assigned_index
+            yield available_boys[index]
 
 
 class LastOrderDateTimeDeliveryBoyStrategy(DeliveryAssignmentStrategy):
 
+    @metrics.timed()
     def assign_delivery_boy(self, order: "FoodOrder", delivery_boys: List[DeliveryBoy]):
         """Assign delivery boys based on last order time"""
         available_boys = [boy for boy in delivery_boys if boy.status == "available"]
@@ -63,6 +99,77 @@ class LastOrderDateTimeDeliveryBoyStrategy(DeliveryAssignmentStrategy):
             print("No available delivery boys!")
             return None
 
-        selected_boy = available_boys[0]
-        selected_boy.assign_order(order)
-        return selected_boy
+        return self.claim_first(order, available_boys)
+
+
+# Concrete Strategy: Bundle the order with an en-route delivery boy, else fall back
+class BundlingDeliveryBoyStrategy(DeliveryAssignmentStrategy):
+    def __init__(self, fallback: Optional[DeliveryAssignmentStrategy] = None, max_pickup_km: float = 0.5,
+                 max_detour_km: float = 2.0, distance_cache: Optional[DistanceCache] = None):
+        self.fallback = fallback or NearestDeliveryBoyStrategy(distance_cache)
+        self.max_pickup_km = max_pickup_km  # pickup must be at the same or a restaurant this close
+        self.max_detour_km = max_detour_km  # extra riding allowed for the whole route
+        self.distance = distance_cache.distance if distance_cache else haversine_km
+
+    @metrics.timed()
+    def assign_delivery_boy(self, order: "FoodOrder", delivery_boys: List[DeliveryBoy]):
+        """Attach the order to the en-route delivery boy with the smallest detour, else use the fallback."""
+        pickup, drop = order_stops(order)
+        restaurant_id = order.restaurant.id
+        pickup_lat, pickup_lon = pickup[1]
+        # Cheap bounding box around the pickup before any distance is computed
+        lat_window = self.max_pickup_km / 110.5
+        lon_window = lat_window / max(math.cos(math.radians(pickup_lat)), 0.01)
+        candidates = []
+        for boy in delivery_boys:
+            if boy.status != "busy" or len(boy.current_orders) >= boy.capacity:
+                continue
+            for carried in boy.current_orders:
+                carried_location = carried.restaurant.location
+                if carried.restaurant.id == restaurant_id or (
+                        abs(carried_location.latitude - pickup_lat) <= lat_window
+                        and abs(carried_location.longitude - pickup_lon) <= lon_window
+                        and self.distance((carried_location.latitude, carried_location.longitude), pickup[1])
+                        <= self.max_pickup_km):
+                    break
+            else:
+                continue
+            route_version = boy.route_version
+            detour, route = self.cheapest_insertion(boy.location, list(boy.route), pickup, drop, self.distance)
+            if detour <= self.max_detour_km:
+                candidates.append((detour, boy.id, boy, route, route_version))
+
+        # Smallest detour first, a route changed by another dispatcher loses the claim
+        for _, _, boy, route, route_version in sorted(candidates, key=lambda candidate: candidate[:2]):
+            if boy.bundle_order(order, route, route_version):
+                return boy
+            metrics.incr("claims.lost")
+        return self.fallback.assign_delivery_boy(order, delivery_boys)
+
+    @staticmethod
+    def cheapest_insertion(start: Tuple[float, float], route: List[Stop], pickup: Stop, drop: Stop,
+                           distance: Callable) -> Tuple[float, List[Stop]]:
+        """Insert pickup then drop into the route at the positions adding the least riding distance.
+        O(n^2) for n stops, n is at most 2 * capacity."""
+        points = [start] + [stop[1] for stop in route]
+        n = len(points)
+        # extra[i]: added distance of visiting `point` between points[i] and points[i + 1]
+        def extra(i: int, point: Tuple[float, float]) -> float:
+            if i == n - 1:
+                return distance(points[i], point)
+            return distance(points[i], point) + distance(point, points[i + 1]) - distance(points[i], points[i + 1])
+
+        pickup_extra = [extra(i, pickup[1]) for i in range(n)]
+        drop_extra = [extra(j, drop[1]) for j in range(n)]
+        best = (math.inf, 0, 0)
+        for i in range(n):
+            # Pickup and drop back to back between points[i] and points[i + 1]
+            together = distance(points[i], pickup[1]) + distance(pickup[1], drop[1])
+            if i < n - 1:
+                together += distance(drop[1], points[i + 1]) - distance(points[i], points[i + 1])
+            best = min(best, (together, i, i))
+            for j in range(i + 1, n):
+                best = min(best, (pickup_extra[i] + drop_extra[j], i, j))
+        detour, i, j = best
+        new_route = route[:i] + [pickup] + route[i:j] + [drop] + route[j:]
+        return detour, new_route
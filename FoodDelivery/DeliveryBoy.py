@@ -1,50 +1,132 @@
 from typing import List, Optional, Tuple
 import math
+import threading
 import pandas as pd
 
+# Striped locks guarding the status of delivery boys, picked by delivery boy id.
+# A lock per object would make DeliveryBoy unpicklable (see ShardedFoodOrderingSystem)
+_CLAIM_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def haversine_km(location1: Tuple[float, float], location2: Tuple[float, float]) -> float:
+    """Great-circle distance in kilometers between two (latitude, longitude) points."""
+    lat1, lon1 = location1
+    lat2, lon2 = location2
+    R = 6371  # Earth's radius in kilometers
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return R * c
+
+
+# A planned stop of a delivery boy: (booking_id, (latitude, longitude))
+Stop = Tuple[int, Tuple[float, float]]
+
+
+def order_stops(order: "FoodOrder") -> List[Stop]:
+    """Pickup at the restaurant, then drop at the user (at the restaurant when the user has no location)."""
+    restaurant = order.restaurant.location
+    drop = order.user.location or restaurant
+    return [(order.booking_id, (restaurant.latitude, restaurant.longitude)),
+            (order.booking_id, (drop.latitude, drop.longitude))]
+
 
 class DeliveryBoy:
-    def __init__(self, id: int, name: str, location: Tuple[float, float], status: str = "available"):
+    def __init__(self, id: int, name: str, location: Tuple[float, float], status: str = "available",
+                 capacity: int = 1):
         self.id = id
         self.name = name
         self.location = location  # (latitude, longitude)
-        self.status = status  # "available" or "busy"
-        self.current_order = None
+        self.status = status  # "available" (no orders) or "busy" (carrying 1..capacity orders)
+        self.capacity = capacity  # max orders carried at once
+        self.current_orders: List["FoodOrder"] = []
+        self.route: List[Stop] = []  # pending pickups & drops, in riding order
+        self.route_version = 0  # bumped on every change of the orders / route
         self.last_order_datetime = pd.to_datetime('2024-12-10')
 
     def __str__(self):
         return f"DeliveryBoy: {self.name}, Status: {self.status}, Last Order Datetime: {self.last_order_datetime}"
 
+    @property
+    def current_order(self) -> Optional["FoodOrder"]:
+        return self.current_orders[0] if self.current_orders else None
+
     def update_last_order_datetime(self):
         self.last_order_datetime = pd.to_datetime('now')
 
     def distance_from(self, restaurant_location: Tuple[float, float]) -> float:
         """Calculate distance between delivery boy and restaurant using the Haversine formula."""
-        lat1, lon1 = self.location
-        lat2, lon2 = restaurant_location
-        R = 6371  # Earth's radius in kilometers
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
-        a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        return R * c
-
-    def assign_order(self, order: "FoodOrder"):
-        """Assign an order to the delivery boy if available."""
-        if self.status == "available":
+        return haversine_km(self.location, restaurant_location)
+
+    def try_claim(self, order: "FoodOrder") -> bool:
+        """Compare-and-set of status 'available' -> 'busy', only one of many concurrent claims wins."""
+        with _CLAIM_LOCKS[hash(self.id) % len(_CLAIM_LOCKS)]:
+            if self.status != "available":
+                return False
             self.status = "busy"
-            self.current_order = order
-            print(f"Assigned Order {order.booking_id} to DeliveryBoy {self.name}")
-            order.update_order_status("dispatched")
-        else:
+            self.current_orders = [order]
+            self.route = order_stops(order)
+            self.route_version += 1
+        return True
+
+    def try_add_to_route(self, order: "FoodOrder", route: List[Stop], expected_route_version: int) -> bool:
+        """Compare-and-set of the route of an en-route delivery boy, fails if the route changed since
+        `route` was planned or if the delivery boy is full."""
+        with _CLAIM_LOCKS[hash(self.id) % len(_CLAIM_LOCKS)]:
+            if (self.status != "busy" or self.route_version != expected_route_version
+                    or len(self.current_orders) >= self.capacity):
+                return False
+            self.current_orders.append(order)
+            self.route = route
+            self.route_version += 1
+        return True
+
+    def release_order(self, order: "FoodOrder"):
+        """Drop an order from the orders / route, the delivery boy is available again once it has none."""
+        with _CLAIM_LOCKS[hash(self.id) % len(_CLAIM_LOCKS)]:
+            self.current_orders = [o for o in self.current_orders if o is not order]
+            self.route = [stop for stop in self.route if stop[0] != order.booking_id]
+            self.route_version += 1
+            if not self.current_orders:
+                self.status = "available"
+
+    def assign_order(self, order: "FoodOrder") -> bool:
+        """Assign an order to the delivery boy if available."""
+        if not order.can_move_to("dispatched"):
+            print(f"Order {order.booking_id} can not be dispatched, it is {order.order_status}.")
+            return False
+        if not self.try_claim(order):
             print(f"DeliveryBoy {self.name} is currently busy.")
+            return False
+        if not order.update_order_status("dispatched", courier_id=self.id):
+            # Another dispatcher moved the order meanwhile, give the delivery boy back
+            self.release_order(order)
+            return False
+        print(f"Assigned Order {order.booking_id} to DeliveryBoy {self.name}")
+        return True
 
-    def complete_order(self):
-        """Complete the current order and make the delivery boy available again."""
-        if self.current_order:
-            print(f"DeliveryBoy {self.name} completed Order {self.current_order.booking_id}")
-            self.current_order.update_order_status("completed")
-            self.status = "available"
-            self.current_order = None
-            self.update_last_order_datetime()
+    def bundle_order(self, order: "FoodOrder", route: List[Stop], expected_route_version: int) -> bool:
+        """Attach an order to an en-route delivery boy with the route planned for it."""
+        if not order.can_move_to("dispatched"):
+            return False
+        if not self.try_add_to_route(order, route, expected_route_version):
+            return False
+        if not order.update_order_status("dispatched", courier_id=self.id):
+            self.release_order(order)
+            return False
+        print(f"Bundled Order {order.booking_id} with DeliveryBoy {self.name}")
+        return True
 
+    def complete_order(self, order: Optional["FoodOrder"] = None) -> bool:
+        """Complete an order (the first one by default), the delivery boy is available again once
+        every order is delivered. The delivery boy keeps the order if it can not be completed."""
+        order = order or self.current_order
+        if order not in self.current_orders:
+            return False
+        if not order.update_order_status("completed"):
+            return False
+        print(f"DeliveryBoy {self.name} completed Order {order.booking_id}")
+        self.update_last_order_datetime()
+        self.release_order(order)
+        return True
@@ -0,0 +1,162 @@
+'''
+Dispatch Concurrency Benchmark:-
+
+Many dispatcher threads call FoodOrderingSystem.assign_delivery_boy_to_order at the same time
+on one shared pool of delivery boys.
+
+	•	Stress check: more orders than delivery boys, so claims are contended. Every delivery boy
+	                  must end up with at most one order and every assigned order must be the
+	                  current order of its delivery boy (no double-dispatch)
+	•	Same order: every thread dispatches the same orders at once, each order must get exactly
+	              one delivery boy and the delivery boys of the lost races must be free again
+	•	Throughput: assigned orders per second for each thread count
+
+Usage:-
+python DispatchConcurrencyBenchmark.py --threads 1 2 4 8 16 --delivery-boys 2000
+
+'''
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from DeliveryBoy import DeliveryBoy
+from DispatchSimulator import STRATEGIES
+from food_delivery import Food, FoodOrder, FoodOrderingSystem, FoodType, Location, Menu, Restaurant, User, UserType
+
+
+def build_system(strategy_name: str, no_of_delivery_boys: int,
+                 seed: int = 42) -> Tuple[FoodOrderingSystem, Restaurant, User]:
+    rng = random.Random(seed)
+    location = Location(1, "Mumbai", "India", "400001", "Maharashtra", 19.0760, 72.8777)
+    menu = Menu(1, "Main Menu")
+    menu.add_food(Food(1, "Pizza", 500, FoodType.VEG, "active"))
+    restaurant = Restaurant(1, "Food Paradise", location, menu)
+    user = User(1, "John Doe", UserType.CUSTOMER, location)
+
+    system = FoodOrderingSystem(STRATEGIES[strategy_name]())
+    for i in range(no_of_delivery_boys):
+        system.add_delivery_boy(DeliveryBoy(i, f"Delivery Boy {i}",
+                                            (19.0760 + rng.uniform(-0.05, 0.05), 72.8777 + rng.uniform(-0.05, 0.05))))
+    return system, restaurant, user
+
+
+def run_dispatchers(strategy_name: str, no_of_threads: int, no_of_delivery_boys: int,
+                    orders_per_thread: int, seed: int = 42) -> Dict[str, float]:
+    system, restaurant, user = build_system(strategy_name, no_of_delivery_boys, seed)
+    menu = restaurant.menu
+
+    assignments: List[List[tuple]] = [[] for _ in range(no_of_threads)]  # per thread (order, delivery boy)
+    barrier = threading.Barrier(no_of_threads + 1)
+
+    def dispatcher(thread_no: int):
+        orders = []
+        for i in range(orders_per_thread):
+            order = FoodOrder(thread_no * orders_per_thread + i, restaurant, user, menu.food_items)
+            order.confirm_booking()
+            orders.append(order)
+        barrier.wait()
+        for order in orders:
+            delivery_boy = system.assign_delivery_boy_to_order(order)
+            if delivery_boy is not None:
+                assignments[thread_no].append((order, delivery_boy))
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        threads = [threading.Thread(target=dispatcher, args=(i,)) for i in range(no_of_threads)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    # Stress check: no delivery boy got two orders
+    assigned = [pair for thread_assignments in assignments for pair in thread_assignments]
+    orders_per_boy = Counter(delivery_boy.id for _, delivery_boy in assigned)
+    double_dispatched = [boy_id for boy_id, count in orders_per_boy.items() if count > 1]
+    wrong_current_order = [order.booking_id for order, delivery_boy in assigned if delivery_boy.current_order is not order]
+    expected = min(no_of_delivery_boys, no_of_threads * orders_per_thread)
+    assert not double_dispatched, f"Delivery boys with two orders: {double_dispatched[:10]}"
+    assert not wrong_current_order, f"Orders lost by their delivery boy: {wrong_current_order[:10]}"
+    assert len(assigned) == expected, f"Assigned {len(assigned)} orders, expected {expected}"
+
+    return {"threads": no_of_threads, "assigned": len(assigned), "orders_per_sec": len(assigned) / elapsed}
+
+
+def run_same_order_dispatchers(strategy_name: str, no_of_threads: int, no_of_delivery_boys: int, no_of_orders: int,
+                               seed: int = 42) -> Dict[str, float]:
+    """Every thread dispatches the same orders, in the same sequence, at the same time."""
+    system, restaurant, user = build_system(strategy_name, no_of_delivery_boys, seed)
+    orders = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for booking_id in range(no_of_orders):
+            order = FoodOrder(booking_id, restaurant, user, restaurant.menu.food_items)
+            order.confirm_booking()
+            orders.append(order)
+    winners: List[List[tuple]] = [[] for _ in range(no_of_threads)]  # per thread (order, delivery boy)
+    barrier = threading.Barrier(no_of_threads + 1)
+
+    def dispatcher(thread_no: int):
+        barrier.wait()
+        for order in orders:
+            delivery_boy = system.assign_delivery_boy_to_order(order)
+            if delivery_boy is not None:
+                winners[thread_no].append((order, delivery_boy))
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        threads = [threading.Thread(target=dispatcher, args=(i,)) for i in range(no_of_threads)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    # Stress check: each order went to exactly one delivery boy, no delivery boy is left claimed by a lost race
+    assigned = [pair for thread_winners in winners for pair in thread_winners]
+    couriers_per_order = Counter(order.booking_id for order, _ in assigned)
+    not_once = [booking_id for booking_id in range(no_of_orders) if couriers_per_order[booking_id] != 1]
+    busy = [boy for boy in system.delivery_boys if boy.status != "available"]
+    wrong_current_order = [order.booking_id for order, delivery_boy in assigned if delivery_boy.current_order is not order]
+    assert not not_once, f"Orders not assigned exactly once: {not_once[:10]}"
+    assert all(order.order_status == "dispatched" for order in orders), "Orders left undispatched"
+    assert not wrong_current_order, f"Orders lost by their delivery boy: {wrong_current_order[:10]}"
+    assert len(busy) == no_of_orders, f"{len(busy)} busy delivery boys for {no_of_orders} orders"
+
+    return {"threads": no_of_threads, "assigned": len(assigned), "orders_per_sec": len(assigned) / elapsed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent dispatch stress check and throughput benchmark.")
+    parser.add_argument("--strategy", choices=list(STRATEGIES), default="nearest")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--delivery-boys", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=3, help="stress rounds per thread count")
+    args = parser.parse_args()
+
+    # Switch threads far more often than the default 5ms so that check-then-set races show up
+    sys.setswitchinterval(1e-6)
+    print(f"{'threads':>8}{'assigned':>10}{'orders/s':>10}")
+    for no_of_threads in args.threads:
+        # 2x more orders than delivery boys, half of the claims have to be lost
+        orders_per_thread = 2 * args.delivery_boys // no_of_threads
+        for round_no in range(args.rounds):
+            result = run_dispatchers(args.strategy, no_of_threads, args.delivery_boys, orders_per_thread, seed=round_no)
+        print(f"{result['threads']:>8}{result['assigned']:>10}{result['orders_per_sec']:>10.0f}")
+    print("No double-dispatch detected.")
+
+    print(f"\nSame orders on every thread\n{'threads':>8}{'assigned':>10}{'orders/s':>10}")
+    for no_of_threads in args.threads:
+        for round_no in range(args.rounds):
+            result = run_same_order_dispatchers(args.strategy, no_of_threads, args.delivery_boys,
+                                                args.delivery_boys // 2, seed=round_no)
+        print(f"{result['threads']:>8}{result['assigned']:>10}{result['orders_per_sec']:>10.0f}")
+    print("Every order got exactly one delivery boy.")
@@ -0,0 +1,115 @@
+'''
+Dispatch Metrics:-
+
+Built-in timers, counters and histograms for the food dispatch hot path.
+
+	•	Timer: @metrics.timed() decorator, records the call latency (microseconds) into a histogram
+	         named after the function, e.g. "NearestDeliveryBoyStrategy.assign_delivery_boy"
+	•	Counter: metrics.incr("name")
+	•	Histogram: class passed to MetricsRegistry / enable(), by default Logger/Histogram.py when
+	             the Logger subsystem is on sys.path (e.g. PYTHONPATH=../Logger): log scale buckets
+	             (4 per power of two, <= ~19% relative error, also below 1 us) with count, mean,
+	             min, max and p50/p90/p99
+	•	Disabled (default): a timed call costs one flag check, nothing is recorded
+	•	Pull: metrics.snapshot() returns a dict, metrics.export(path) appends it as a JSON line
+
+Enable with metrics.enable() or the DISPATCH_METRICS=1 environment variable.
+
+'''
+
+import functools
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+try:
+    from Histogram import Histogram  # Logger/Histogram.py, when ../Logger is on sys.path (e.g. PYTHONPATH=../Logger)
+except ImportError:  # without the Logger subsystem the histogram class is passed to MetricsRegistry / enable()
+    Histogram = None
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = False, histogram_factory: Optional[Callable] = Histogram):
+        self.enabled = False
+        self.histogram_factory = histogram_factory  # () -> object with record(value) and summary()
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, object] = {}
+        self._lock = threading.Lock()  # dispatcher threads record concurrently
+        if enabled:
+            self.enable()
+
+    def enable(self, histogram_factory: Optional[Callable] = None):
+        if histogram_factory is not None:
+            self.histogram_factory = histogram_factory
+        if self.histogram_factory is None:
+            raise ValueError("DispatchMetrics needs a histogram class, pass one or put the Logger subsystem "
+                             "on sys.path (e.g. PYTHONPATH=../Logger)")
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def incr(self, name: str, value: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = self.histogram_factory()
+            histogram.record(value)
+
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """Decorator recording the latency of every call in microseconds."""
+        def decorator(func: Callable) -> Callable:
+            metric_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(metric_name, (time.perf_counter_ns() - start) / 1000)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "counters": dict(self.counters),
+                "histograms_us": {name: histogram.summary() for name, histogram in self.histograms.items()},
+            }
+
+    def export(self, path: str):
+        """Append the current snapshot to a JSON lines file."""
+        with open(path, "a") as f:
+            f.write(json.dumps(self.snapshot()) + "\n")
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def report(self) -> List[str]:
+        lines = [f"{'metric':<55}{'count':>8}{'p50 us':>10}{'p99 us':>10}{'max us':>10}"]
+        for name, summary in sorted(self.snapshot()["histograms_us"].items()):
+            lines.append(f"{name:<55}{summary['count']:>8}{summary['p50']:>10.1f}{summary['p99']:>10.1f}"
+                         f"{summary['max']:>10.1f}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:<55}{value:>8}")
+        return lines
+
+
+# Shared registry of the food dispatch modules
+metrics = MetricsRegistry(enabled=os.environ.get("DISPATCH_METRICS") == "1")
@@ -0,0 +1,257 @@
+'''
+Dispatch Simulator:-
+
+Seeded, city scale workload for FoodOrderingSystem so that DeliveryAssignmentStrategy
+changes can be compared on numbers instead of the three delivery boy example.
+
+	•	World: restaurants, users and delivery boys scattered around each city center
+	•	Orders: Poisson stream (exponential inter-arrival times) of orders per minute
+	•	Deliveries: an order is delivered after its delivery boy rides to the restaurant and
+	                then to the user at a constant speed (simulated clock), delivery boys can
+	                carry up to --capacity orders for the bundling strategy
+	•	Report: assignment latency p50/p99, assigned orders per second (wall clock) and
+	            peak memory allocated during the run (tracemalloc, separate pass)
+	•	Distance cache: optional DistanceCache for the nearest strategy and the delivery ETAs
+	•	Metrics: --metrics FILE records the hot path timers (DispatchMetrics) of every strategy
+	             and appends one snapshot per strategy to FILE, needs the Logger subsystem for its
+	             histograms (PYTHONPATH=../Logger)
+
+Usage:-
+python DispatchSimulator.py --cities 2 --orders 5000 --delivery-boys 1000 --strategy nearest
+
+'''
+
+import argparse
+import contextlib
+import heapq
+import os
+import random
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+from DeliveryAssignmentStrategy import DeliveryAssignmentStrategy, NearestDeliveryBoyStrategy, \
+    RoundRobinDeliveryBoyStrategy, LastOrderDateTimeDeliveryBoyStrategy, BundlingDeliveryBoyStrategy
+from DeliveryBoy import DeliveryBoy, haversine_km
+from DispatchMetrics import metrics
+from DistanceCache import DistanceCache
+from food_delivery import Food, FoodOrder, FoodOrderingSystem, FoodType, Location, Menu, Restaurant, User, UserType
+
+# (city, state, pincode prefix, latitude, longitude)
+CITIES: List[Tuple[str, str, str, float, float]] = [
+    ("Mumbai", "Maharashtra", "400", 19.0760, 72.8777),
+    ("Pune", "Maharashtra", "411", 18.5204, 73.8567),
+    ("Bangalore", "Karnataka", "560", 12.9716, 77.5946),
+    ("Delhi", "Delhi", "110", 28.7041, 77.1025),
+    ("Chennai", "Tamil Nadu", "600", 13.0827, 80.2707),
+    ("Hyderabad", "Telangana", "500", 17.3850, 78.4867),
+    ("Kolkata", "West Bengal", "700", 22.5726, 88.3639),
+    ("Ahmedabad", "Gujarat", "380", 23.0225, 72.5714),
+]
+
+STRATEGIES = {
+    "nearest": NearestDeliveryBoyStrategy,
+    "round_robin": RoundRobinDeliveryBoyStrategy,
+    "last_order_datetime": LastOrderDateTimeDeliveryBoyStrategy,
+    "bundling": BundlingDeliveryBoyStrategy,
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class DispatchSimulator:
+    def __init__(self, seed: int = 42, no_of_cities: int = 1, no_of_restaurants: int = 500,
+                 no_of_users: int = 2000, no_of_delivery_boys: int = 1000, no_of_orders: int = 5000,
+                 orders_per_minute: float = 20, city_radius_km: float = 5, speed_kmph: float = 20,
+                 distance_cache: Optional[DistanceCache] = None, delivery_boy_capacity: int = 1):
+        self.seed = seed
+        self.cities = CITIES[:no_of_cities]
+        self.no_of_restaurants = no_of_restaurants
+        self.no_of_users = no_of_users
+        self.no_of_delivery_boys = no_of_delivery_boys
+        self.no_of_orders = no_of_orders
+        self.orders_per_minute = orders_per_minute
+        self.city_radius_deg = city_radius_km / 111  # ~111 km per degree of latitude
+        self.speed_kmph = speed_kmph
+        self.distance_cache = distance_cache
+        self.delivery_boy_capacity = delivery_boy_capacity
+
+    # ---------- World generation ----------
+
+    def _random_location(self, rng: random.Random, id: int) -> Location:
+        city, state, pincode_prefix, lat, lon = rng.choice(self.cities)
+        return Location(id, city, "India", f"{pincode_prefix}{rng.randrange(1000):03d}", state,
+                        lat + rng.uniform(-self.city_radius_deg, self.city_radius_deg),
+                        lon + rng.uniform(-self.city_radius_deg, self.city_radius_deg))
+
+    def generate_world(self) -> Tuple[List[Restaurant], List[User], List[DeliveryBoy]]:
+        """Same seed --> same restaurants, users and delivery boys for every strategy."""
+        rng = random.Random(self.seed)
+        restaurants = []
+        for i in range(self.no_of_restaurants):
+            menu = Menu(i, "Main Menu")
+            menu.add_food(Food(2 * i, "Veg Thali", rng.randint(100, 400), FoodType.VEG, "active"))
+            menu.add_food(Food(2 * i + 1, "Biryani", rng.randint(150, 500), FoodType.NON_VEG, "active"))
+            restaurants.append(Restaurant(i, f"Restaurant {i}", self._random_location(rng, i), menu))
+
+        users = [User(i, f"User {i}", UserType.CUSTOMER, self._random_location(rng, i))
+                 for i in range(self.no_of_users)]
+
+        delivery_boys = []
+        for i in range(self.no_of_delivery_boys):
+            location = self._random_location(rng, i)
+            delivery_boys.append(DeliveryBoy(i, f"Delivery Boy {i}", (location.latitude, location.longitude),
+                                             capacity=self.delivery_boy_capacity))
+        return restaurants, users, delivery_boys
+
+    def build_system(self, strategy: DeliveryAssignmentStrategy) -> Tuple[FoodOrderingSystem, List[Restaurant], List[User]]:
+        restaurants, users, delivery_boys = self.generate_world()
+        system = FoodOrderingSystem(strategy)
+        for restaurant in restaurants:
+            system.add_restaurant(restaurant)
+        for user in users:
+            system.add_user(user)
+        for delivery_boy in delivery_boys:
+            system.add_delivery_boy(delivery_boy)
+        return system, restaurants, users
+
+    def generate_orders(self) -> List[Tuple[float, int, int]]:
+        """Poisson order stream: (arrival minute, restaurant index, user index)."""
+        rng = random.Random(self.seed + 1)
+        arrival, orders = 0.0, []
+        for _ in range(self.no_of_orders):
+            arrival += rng.expovariate(self.orders_per_minute)
+            orders.append((arrival, rng.randrange(self.no_of_restaurants), rng.randrange(self.no_of_users)))
+        return orders
+
+    # ---------- Simulation ----------
+
+    def _delivery_minutes(self, delivery_boy: DeliveryBoy, order: FoodOrder) -> float:
+        restaurant = (order.restaurant.location.latitude, order.restaurant.location.longitude)
+        user = (order.user.location.latitude, order.user.location.longitude)
+        if self.distance_cache:
+            distance = self.distance_cache.distance(delivery_boy.location, restaurant)
+            distance += self.distance_cache.distance(restaurant, user)
+        else:
+            distance = delivery_boy.distance_from(restaurant) + haversine_km(restaurant, user)
+        return distance / self.speed_kmph * 60
+
+    def run(self, strategy: DeliveryAssignmentStrategy) -> Dict[str, float]:
+        """Replay the order stream against a fresh system, return latency & throughput numbers."""
+        system, restaurants, users = self.build_system(strategy)
+        orders = self.generate_orders()
+        in_flight: List[Tuple[float, int, DeliveryBoy, FoodOrder]] = []  # (delivered at minute, booking_id, ...)
+        latencies: List[float] = []
+        unassigned = 0
+
+        # Strategies and notifications print on every order, keep the report readable
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            for booking_id, (minute, restaurant_index, user_index) in enumerate(orders):
+                while in_flight and in_flight[0][0] <= minute:
+                    _, _, delivery_boy, delivered_order = heapq.heappop(in_flight)
+                    delivery_boy.complete_order(delivered_order)
+
+                order = FoodOrder(booking_id, restaurants[restaurant_index], users[user_index],
+                                  restaurants[restaurant_index].menu.food_items[:1])
+                order.confirm_booking()
+                assign_start = time.perf_counter_ns()
+                delivery_boy = system.assign_delivery_boy_to_order(order)
+                latencies.append((time.perf_counter_ns() - assign_start) / 1000)
+                if delivery_boy is None:
+                    unassigned += 1
+                    continue
+                heapq.heappush(in_flight, (minute + self._delivery_minutes(delivery_boy, order), booking_id,
+                                           delivery_boy, order))
+            elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        return {
+            "orders": len(orders),
+            "unassigned": unassigned,
+            "p50_us": percentile(latencies, 50),
+            "p99_us": percentile(latencies, 99),
+            "max_us": latencies[-1] if latencies else 0.0,
+            "orders_per_sec": len(orders) / elapsed if elapsed else 0.0,
+        }
+
+    def measure_memory(self, strategy: DeliveryAssignmentStrategy) -> float:
+        """Peak traced memory (MB) of building the world and running the stream (separate pass,
+        tracemalloc would distort the latency numbers)."""
+        tracemalloc.start()
+        try:
+            self.run(strategy)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak / (1024 * 1024)
+
+
+def make_strategy(name: str, distance_cache: Optional[DistanceCache] = None) -> DeliveryAssignmentStrategy:
+    if name == "nearest":
+        return NearestDeliveryBoyStrategy(distance_cache)
+    if name == "bundling":
+        return BundlingDeliveryBoyStrategy(distance_cache=distance_cache)
+    return STRATEGIES[name]()
+
+
+def run_all(simulator: DispatchSimulator, strategy_names: Optional[List[str]] = None,
+            with_memory: bool = True, metrics_path: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name in strategy_names or list(STRATEGIES):
+        metrics.reset()
+        results[name] = simulator.run(make_strategy(name, simulator.distance_cache))
+        if metrics_path:
+            metrics.export(metrics_path)
+            print("\n".join(metrics.report()) + "\n")
+        if simulator.distance_cache:
+            results[name]["cache_hit_rate"] = simulator.distance_cache.stats()["hit_rate"]
+            simulator.distance_cache.clear()
+        if with_memory:
+            results[name]["peak_memory_mb"] = simulator.measure_memory(make_strategy(name, simulator.distance_cache))
+    return results
+
+
+def print_report(results: Dict[str, Dict[str, float]]):
+    print(f"{'strategy':<22}{'orders':>8}{'unassigned':>12}{'p50 us':>10}{'p99 us':>10}{'orders/s':>10}{'peak MB':>9}"
+          f"{'cache hit':>10}")
+    for name, result in results.items():
+        print(f"{name:<22}{result['orders']:>8}{result['unassigned']:>12}{result['p50_us']:>10.1f}"
+              f"{result['p99_us']:>10.1f}{result['orders_per_sec']:>10.0f}{result.get('peak_memory_mb', 0):>9.1f}"
+              f"{result.get('cache_hit_rate', 0):>10.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark delivery boy assignment strategies.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--cities", type=int, default=1)
+    parser.add_argument("--restaurants", type=int, default=500)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--delivery-boys", type=int, default=1000)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--orders-per-minute", type=float, default=20)
+    parser.add_argument("--capacity", type=int, default=1, help="orders a delivery boy can carry at once")
+    parser.add_argument("--strategy", choices=list(STRATEGIES), action="append")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--metrics", metavar="FILE", help="record DispatchMetrics and export them to FILE")
+    parser.add_argument("--distance-cache-precision", type=int,
+                        help="geohash precision of a DistanceCache for distances & ETAs (default: exact distances)")
+    args = parser.parse_args()
+
+    simulator = DispatchSimulator(seed=args.seed, no_of_cities=args.cities, no_of_restaurants=args.restaurants,
+                                  no_of_users=args.users, no_of_delivery_boys=args.delivery_boys,
+                                  no_of_orders=args.orders, orders_per_minute=args.orders_per_minute,
+                                  distance_cache=DistanceCache(args.distance_cache_precision)
+                                  if args.distance_cache_precision else None,
+                                  delivery_boy_capacity=args.capacity)
+    if args.metrics:
+        try:
+            metrics.enable()
+        except ValueError as e:
+            parser.error(str(e))
+    print_report(run_all(simulator, args.strategy, with_memory=not args.no_memory, metrics_path=args.metrics))
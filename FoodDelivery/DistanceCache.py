@@ -0,0 +1,89 @@
+'''
+Distance / ETA Cache:-
+
+The same restaurant to delivery boy distances are computed again and again across orders.
+DistanceCache quantizes both points to their geohash cell and memoizes the Haversine
+distance between the two cell centers in a bounded LRU.
+
+	•	Cell: geohash cell of `precision` characters, kept as its (latitude index, longitude index)
+	          integer pair, the geohash string itself is never built
+	•	Accuracy: each point moves at most half a cell diagonal, see max_error_km()
+	               precision 6 --> ~1.2km x 0.6km cells, 7 --> ~153m x 153m, 8 --> ~38m x 19m
+	•	LRU: functools.lru_cache (thread safe, C implementation), at most `max_size` cell pairs
+	         keyed by (origin cell, destination cell)
+	•	Instrumentation: hits, misses, hit_rate via stats()
+
+'''
+
+import functools
+import math
+from typing import Dict, List, Tuple
+
+from DeliveryBoy import haversine_km
+
+
+def geohash_bits(precision: int) -> Tuple[int, int]:
+    """(latitude bits, longitude bits) of a geohash, longitude gets the extra bit of odd lengths."""
+    total_bits = 5 * precision
+    return total_bits // 2, (total_bits + 1) // 2
+
+
+class DistanceCache:
+    def __init__(self, precision: int = 7, max_size: int = 200_000, speed_kmph: float = 20):
+        self.precision = precision
+        self.max_size = max_size
+        self.speed_kmph = speed_kmph  # for ETA estimates
+        lat_bits, lon_bits = geohash_bits(precision)
+        self._lat_cells = 1 << lat_bits
+        self._lon_cells = 1 << lon_bits
+        self._lat_scale = self._lat_cells / 180
+        self._lon_scale = self._lon_cells / 360
+        self._cell_distance = functools.lru_cache(maxsize=max_size)(self._compute_cell_distance)
+
+    def cell(self, location: Tuple[float, float]) -> Tuple[int, int]:
+        """(latitude index, longitude index) of the geohash cell of a (latitude, longitude) point."""
+        return int((location[0] + 90) * self._lat_scale), int((location[1] + 180) * self._lon_scale)
+
+    def _cell_center(self, lat_index: int, lon_index: int) -> Tuple[float, float]:
+        return (lat_index + 0.5) / self._lat_scale - 90, (lon_index + 0.5) / self._lon_scale - 180
+
+    def _compute_cell_distance(self, lat_index1: int, lon_index1: int, lat_index2: int, lon_index2: int) -> float:
+        return haversine_km(self._cell_center(lat_index1, lon_index1), self._cell_center(lat_index2, lon_index2))
+
+    def distance(self, location1: Tuple[float, float], location2: Tuple[float, float]) -> float:
+        """Approximate distance in kilometers between two (latitude, longitude) points."""
+        return self._cell_distance(int((location1[0] + 90) * self._lat_scale), int((location1[1] + 180) * self._lon_scale),
+                                   int((location2[0] + 90) * self._lat_scale), int((location2[1] + 180) * self._lon_scale))
+
+    def distances_from(self, origin: Tuple[float, float], locations: List[Tuple[float, float]]) -> List[float]:
+        """distance(origin, location) for many locations, the origin cell is quantized only once."""
+        lat_scale, lon_scale, cell_distance = self._lat_scale, self._lon_scale, self._cell_distance
+        origin_lat_index = int((origin[0] + 90) * lat_scale)
+        origin_lon_index = int((origin[1] + 180) * lon_scale)
+        return [cell_distance(origin_lat_index, origin_lon_index, int((lat + 90) * lat_scale), int((lon + 180) * lon_scale))
+                for lat, lon in locations]
+
+    def eta_minutes(self, location1: Tuple[float, float], location2: Tuple[float, float]) -> float:
+        """Riding time in minutes between two points at speed_kmph."""
+        return self.distance(location1, location2) / self.speed_kmph * 60
+
+    def max_error_km(self, latitude: float = 0.0) -> float:
+        """Worst case error of distance() near a latitude: both points snap to their cell center."""
+        cell_height = 180 / self._lat_cells * 111.32
+        cell_width = 360 / self._lon_cells * 111.32 * math.cos(math.radians(latitude))
+        return math.hypot(cell_height, cell_width)
+
+    def stats(self) -> Dict[str, float]:
+        info = self._cell_distance.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            "precision": self.precision,
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": info.hits / lookups if lookups else 0.0,
+            "size": info.currsize,
+            "max_size": self.max_size,
+        }
+
+    def clear(self):
+        self._cell_distance.cache_clear()
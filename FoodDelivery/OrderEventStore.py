@@ -0,0 +1,271 @@
+'''
+Event-sourced Order Store:-
+
+Every FoodOrder status change is appended to an order event log instead of only
+overwriting FoodOrder.order_status, so the full lifecycle of an order is kept.
+
+	•	Event Log: Append-only, fixed size binary records (one per status change)
+	•	Projections: In-memory views of the log (orders by status, by restaurant, by courier)
+	•	Compaction: Every `snapshot_every` events the projections are written to a snapshot
+	                and a new (empty) log generation is started
+	•	Replay: On restart the snapshot is loaded and only the log written after it is replayed
+	•	Durability: the snapshot is fsynced (file, then directory) before the log it replaces is removed
+	•	Threads: append() and compact() run under one lock, concurrent dispatchers may share a store
+
+Files in the store directory:-
+snapshot.pkl        --> projections + generation of the log that follows the snapshot
+events.<gen>.log    --> events appended after the snapshot of generation <gen>
+
+'''
+
+import os
+import pickle
+import struct
+import threading
+import time
+from collections import defaultdict
+from enum import Enum
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+
+class OrderStatus(Enum):
+    IN_CART = "in_cart"
+    CONFIRMED = "confirmed"
+    DISPATCHED = "dispatched"
+    COMPLETED = "completed"
+
+
+# Allowed status transitions, None is the state of an order that has no events yet
+ORDER_STATUS_TRANSITIONS: Dict[Optional[OrderStatus], Set[OrderStatus]] = {
+    None: {OrderStatus.IN_CART},
+    OrderStatus.IN_CART: {OrderStatus.CONFIRMED},
+    OrderStatus.CONFIRMED: {OrderStatus.DISPATCHED},
+    OrderStatus.DISPATCHED: {OrderStatus.COMPLETED},
+    OrderStatus.COMPLETED: set(),
+}
+
+# Statuses are stored as small integer codes in the log and in the projections
+_STATUSES: List[OrderStatus] = list(OrderStatus)
+_STATUS_CODES: Dict[OrderStatus, int] = {status: code for code, status in enumerate(_STATUSES)}
+_NO_COURIER = -1
+
+# booking_id, restaurant_id, courier_id, status code, timestamp
+_EVENT = struct.Struct("<qqqBd")
+
+
+class OrderEvent(NamedTuple):
+    booking_id: int
+    status: OrderStatus
+    restaurant_id: int
+    courier_id: Optional[int]
+    timestamp: float
+
+
+class OrderEventStore:
+    def __init__(self, directory: Optional[str] = None, snapshot_every: int = 1_000_000):
+        self.directory = directory  # None keeps the log in memory only
+        self.snapshot_every = snapshot_every
+        self.generation = 0
+        self.events_since_snapshot = 0
+        # Projections
+        self.orders: Dict[int, Tuple[int, int, int]] = {}  # booking_id -> (status code, restaurant_id, courier_id)
+        self.orders_by_status: List[Set[int]] = [set() for _ in _STATUSES]
+        self.orders_by_restaurant: defaultdict[int, Set[int]] = defaultdict(set)
+        self.orders_by_courier: defaultdict[int, Set[int]] = defaultdict(set)
+
+        self._memory_log = bytearray()
+        self._log_file = None
+        self._lock = threading.RLock()  # transition check + write + projections are one step, compact() too
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._replay()
+            self._log_file = open(self._log_path(self.generation), "ab")
+
+    # ---------- Writes ----------
+
+    def append(self, booking_id: int, status: OrderStatus, restaurant_id: int, courier_id: Optional[int] = None):
+        """Append a status change to the log and apply it to the projections."""
+        with self._lock:
+            current = self.orders.get(booking_id)
+            current_status = _STATUSES[current[0]] if current else None
+            if status not in ORDER_STATUS_TRANSITIONS[current_status]:
+                raise ValueError(f"Invalid status transition for Order {booking_id}: "
+                                 f"{current_status.value if current_status else None} -> {status.value}")
+            if courier_id is None:
+                courier_id = current[2] if current else _NO_COURIER
+
+            record = _EVENT.pack(booking_id, restaurant_id, courier_id, _STATUS_CODES[status], time.time())
+            if self._log_file is not None:
+                self._log_file.write(record)
+            else:
+                self._memory_log += record
+            self._apply(booking_id, _STATUS_CODES[status], restaurant_id, courier_id)
+
+            self.events_since_snapshot += 1
+            if self.events_since_snapshot >= self.snapshot_every:
+                self.compact()
+
+    def _apply(self, booking_id: int, code: int, restaurant_id: int, courier_id: int):
+        current = self.orders.get(booking_id)
+        if current is not None:
+            self.orders_by_status[current[0]].discard(booking_id)
+        else:
+            self.orders_by_restaurant[restaurant_id].add(booking_id)
+        if courier_id != _NO_COURIER:
+            self.orders_by_courier[courier_id].add(booking_id)
+        self.orders_by_status[code].add(booking_id)
+        self.orders[booking_id] = (code, restaurant_id, courier_id)
+
+    # ---------- Queries ----------
+
+    def get_status(self, booking_id: int) -> Optional[OrderStatus]:
+        current = self.orders.get(booking_id)
+        return _STATUSES[current[0]] if current else None
+
+    def get_orders_by_status(self, status: OrderStatus) -> Set[int]:
+        return self.orders_by_status[_STATUS_CODES[status]]
+
+    def get_orders_by_restaurant(self, restaurant_id: int) -> Set[int]:
+        return self.orders_by_restaurant.get(restaurant_id, set())
+
+    def get_orders_by_courier(self, courier_id: int) -> Set[int]:
+        return self.orders_by_courier.get(courier_id, set())
+
+    def iter_events(self) -> Iterator[OrderEvent]:
+        """Events of the current log generation (older events are folded into the snapshot)."""
+        with self._lock:
+            if self._log_file is not None:
+                self._log_file.flush()
+                with open(self._log_path(self.generation), "rb") as f:
+                    data = f.read()
+            else:
+                data = bytes(self._memory_log)
+        usable = len(data) - len(data) % _EVENT.size
+        for booking_id, restaurant_id, courier_id, code, timestamp in _EVENT.iter_unpack(memoryview(data)[:usable]):
+            yield OrderEvent(booking_id, _STATUSES[code], restaurant_id,
+                             None if courier_id == _NO_COURIER else courier_id, timestamp)
+
+    # ---------- Compaction & Replay ----------
+
+    def compact(self):
+        """Fold the current log into a snapshot and start a new log generation. The old log is
+        removed only once the snapshot is on disk, a crash in between replays the old log instead."""
+        with self._lock:
+            self.events_since_snapshot = 0
+            if self.directory is None:
+                self._memory_log = bytearray()
+                return
+            self._log_file.close()
+            old_generation = self.generation
+            self.generation += 1
+            state = {
+                "generation": self.generation,
+                "orders": self.orders,
+                "orders_by_status": self.orders_by_status,
+                "orders_by_restaurant": dict(self.orders_by_restaurant),
+                "orders_by_courier": dict(self.orders_by_courier),
+            }
+            tmp_path = os.path.join(self.directory, "snapshot.pkl.tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, os.path.join(self.directory, "snapshot.pkl"))
+            _fsync_directory(self.directory)  # the rename itself is durable only once the directory is
+            self._log_file = open(self._log_path(self.generation), "ab")
+            os.remove(self._log_path(old_generation))
+
+    def _replay(self):
+        snapshot_path = os.path.join(self.directory, "snapshot.pkl")
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "rb") as f:
+                state = pickle.load(f)
+            self.generation = state["generation"]
+            self.orders = state["orders"]
+            self.orders_by_status = state["orders_by_status"]
+            self.orders_by_restaurant = defaultdict(set, state["orders_by_restaurant"])
+            self.orders_by_courier = defaultdict(set, state["orders_by_courier"])
+
+        log_path = self._log_path(self.generation)
+        if not os.path.exists(log_path):
+            return
+        with open(log_path, "rb") as f:
+            data = f.read()
+        usable = len(data) - len(data) % _EVENT.size
+        if usable != len(data):
+            # Drop a record that was only partially written before a crash
+            with open(log_path, "r+b") as f:
+                f.truncate(usable)
+
+        # Inlined _apply, this loop is the hot path of a restart
+        orders = self.orders
+        by_status = self.orders_by_status
+        by_restaurant = self.orders_by_restaurant
+        by_courier = self.orders_by_courier
+        count = 0
+        for booking_id, restaurant_id, courier_id, code, _ in _EVENT.iter_unpack(memoryview(data)[:usable]):
+            current = orders.get(booking_id)
+            if current is not None:
+                by_status[current[0]].discard(booking_id)
+            else:
+                by_restaurant[restaurant_id].add(booking_id)
+            if courier_id != _NO_COURIER:
+                by_courier[courier_id].add(booking_id)
+            by_status[code].add(booking_id)
+            orders[booking_id] = (code, restaurant_id, courier_id)
+            count += 1
+        self.events_since_snapshot = count
+
+    def _log_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"events.{generation}.log")
+
+    def flush(self):
+        with self._lock:
+            if self._log_file is not None:
+                self._log_file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+
+
+def _fsync_directory(directory: str):
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# Example Usage: replay time for a day of orders
+if __name__ == "__main__":
+    import random
+    import tempfile
+
+    no_of_orders = 250_000  # 4 events per order --> 1M events
+    random.seed(7)
+    with tempfile.TemporaryDirectory() as directory:
+        store = OrderEventStore(directory, snapshot_every=10_000_000)
+        start = time.perf_counter()
+        for booking_id in range(no_of_orders):
+            restaurant_id = random.randrange(5_000)
+            store.append(booking_id, OrderStatus.IN_CART, restaurant_id)
+            store.append(booking_id, OrderStatus.CONFIRMED, restaurant_id)
+            store.append(booking_id, OrderStatus.DISPATCHED, restaurant_id, random.randrange(20_000))
+            store.append(booking_id, OrderStatus.COMPLETED, restaurant_id)
+        store.close()
+        print(f"Appended {4 * no_of_orders} events in {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        restored = OrderEventStore(directory, snapshot_every=10_000_000)
+        print(f"Replayed {restored.events_since_snapshot} events in {time.perf_counter() - start:.2f}s")
+
+        restored.compact()
+        restored.close()
+        start = time.perf_counter()
+        restored = OrderEventStore(directory)
+        print(f"Loaded snapshot of {len(restored.orders)} orders in {time.perf_counter() - start:.2f}s")
+        print(f"Completed orders: {len(restored.get_orders_by_status(OrderStatus.COMPLETED))}")
+        restored.close()
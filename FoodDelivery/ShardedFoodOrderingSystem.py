@@ -0,0 +1,333 @@
+'''
+City-sharded Food Ordering System:-
+
+A single FoodOrderingSystem keeps every restaurant, user and delivery boy in one
+interpreter, so dispatch for every city competes for one core. In sharded mode:
+
+	•	Shard: a worker process that owns a set of cities and pincodes, with its own FoodOrderingSystem
+	           (restaurants, delivery boys and assignment strategy state)
+	•	Router: ShardedFoodOrderingSystem, forwards searches, orders and delivery boy updates
+	            to the shard that owns the location key (pincode, else city)
+	•	Ownership: explicit with assign_pincode() (e.g. to split a large city) or assign_city(),
+	               otherwise a stable hash of the city name
+	•	Order events: a shard records the status changes of the orders it dispatches and sends them
+	                  back with the reply, the router appends them to the order's own event store
+	•	Handoff: a delivery boy moving to another shard's area is handed over once no order is
+	             carried any more, until then the delivery boy stays (with the orders) on the old shard
+
+Router --(Pipe)--> Shard 0 (Mumbai, Delhi ...)
+       --(Pipe)--> Shard 1 (Pune, Chennai ...)
+
+Objects sent to a shard are copies, the shard is the source of truth for its orders and
+delivery boys. A search of a city whose pincodes live on several shards asks all of them.
+place_orders() sends every shard its batch before waiting for any reply, so
+the shards dispatch in parallel and throughput scales with the number of cores.
+
+'''
+
+import contextlib
+import multiprocessing
+import os
+import zlib
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from DeliveryAssignmentStrategy import DeliveryAssignmentStrategy, NearestDeliveryBoyStrategy
+from DeliveryBoy import DeliveryBoy
+from food_delivery import FoodOrder, FoodOrderingSystem, FoodType, Location, Restaurant, User
+from OrderEventStore import OrderStatus
+
+
+class _OrderEventRecorder:
+    """Event store of an order inside a shard, the status changes go back to the router with the reply."""
+
+    def __init__(self):
+        self.events: List[Tuple[OrderStatus, Optional[int]]] = []  # (status, courier_id)
+
+    def append(self, booking_id: int, status: OrderStatus, restaurant_id: int, courier_id: Optional[int] = None):
+        self.events.append((status, courier_id))
+
+    def take(self) -> List[Tuple[OrderStatus, Optional[int]]]:
+        events, self.events = self.events, []
+        return events
+
+
+class FoodOrderingShard:
+    """Runs inside a worker process, owns the FoodOrderingSystem of its cities."""
+
+    def __init__(self, strategy: DeliveryAssignmentStrategy):
+        self.system = FoodOrderingSystem(strategy)
+        self.delivery_boys: Dict[int, DeliveryBoy] = {}
+        self.order_delivery_boys: Dict[int, Tuple[DeliveryBoy, FoodOrder]] = {}  # booking_id -> (delivery boy, order)
+
+    def add_restaurant(self, restaurant: Restaurant):
+        self.system.add_restaurant(restaurant)
+
+    def add_user(self, user: User):
+        self.system.add_user(user)
+
+    def add_delivery_boy(self, delivery_boy: DeliveryBoy):
+        self.delivery_boys[delivery_boy.id] = delivery_boy
+        self.system.add_delivery_boy(delivery_boy)
+
+    def remove_delivery_boy(self, delivery_boy_id: int) -> Optional[DeliveryBoy]:
+        """None if unknown or still carrying orders, the orders of this shard must be completed here."""
+        delivery_boy = self.delivery_boys.get(delivery_boy_id)
+        if delivery_boy is None or delivery_boy.current_orders:
+            return None
+        del self.delivery_boys[delivery_boy_id]
+        self.system.delivery_boys.remove(delivery_boy)
+        return delivery_boy
+
+    def update_delivery_boy_location(self, delivery_boy_id: int, location: Tuple[float, float]):
+        self.delivery_boys[delivery_boy_id].location = location
+
+    def search(self, location: Location, food_type: Optional[FoodType] = None) -> List[Restaurant]:
+        return self.system.get_all_restaurants(location, food_type)
+
+    def place_order(self, order: FoodOrder) -> Tuple[Optional[int], list]:
+        """Confirm the order and assign a delivery boy, returns the delivery boy id and the status changes."""
+        recorder = order.event_store = _OrderEventRecorder()
+        if order.status is OrderStatus.IN_CART:
+            order.confirm_booking()
+        delivery_boy = self.system.assign_delivery_boy_to_order(order)
+        if delivery_boy is None:
+            return None, recorder.take()
+        self.order_delivery_boys[order.booking_id] = (delivery_boy, order)
+        return delivery_boy.id, recorder.take()
+
+    def complete_order(self, booking_id: int) -> Tuple[bool, list]:
+        assignment = self.order_delivery_boys.pop(booking_id, None)
+        if assignment is None:
+            return False, []
+        delivery_boy, order = assignment
+        if not delivery_boy.complete_order(order):
+            self.order_delivery_boys[booking_id] = assignment
+            return False, order.event_store.take()
+        return True, order.event_store.take()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "restaurants": len(self.system.restaurants),
+            "users": len(self.system.users),
+            "delivery_boys": len(self.delivery_boys),
+            "orders_in_flight": len(self.order_delivery_boys),
+        }
+
+
+def _run_shard(conn, strategy_factory: Callable[[], DeliveryAssignmentStrategy], quiet: bool):
+    """Worker loop: (method, args) --> result, a "batch" message carries a list of calls."""
+    shard = FoodOrderingShard(strategy_factory())
+    with open(os.devnull, "w") as devnull, contextlib.ExitStack() as stack:
+        if quiet:
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+        while True:
+            method, args = conn.recv()
+            if method == "stop":
+                conn.send(None)
+                break
+            if method == "batch":
+                conn.send([getattr(shard, name)(*call_args) for name, call_args in args])
+            else:
+                conn.send(getattr(shard, method)(*args))
+    conn.close()
+
+
+class ShardedFoodOrderingSystem:
+    def __init__(self, no_of_shards: int = os.cpu_count() or 1,
+                 strategy_factory: Callable[[], DeliveryAssignmentStrategy] = NearestDeliveryBoyStrategy,
+                 quiet: bool = False):
+        self.no_of_shards = no_of_shards
+        self.city_shards: Dict[str, int] = {}  # explicit ownership, see assign_city()
+        self.pincode_shards: Dict[str, int] = {}  # explicit ownership, see assign_pincode()
+        self.city_restaurant_shards: defaultdict[str, Set[int]] = defaultdict(set)  # city -> shards of its restaurants
+        self.delivery_boy_shards: Dict[int, int] = {}  # delivery_boy_id -> shard
+        self.order_shards: Dict[int, int] = {}  # booking_id -> shard
+        self.orders: Dict[int, FoodOrder] = {}  # booking_id -> order in flight, mirrors the status kept by its shard
+        self.order_delivery_boys: Dict[int, int] = {}  # booking_id -> delivery_boy_id, of the dispatched orders
+        # delivery_boy_id -> (city, location, pincode) moved to, handed over once the orders carried are completed
+        self.pending_handoffs: Dict[int, Tuple[str, Tuple[float, float], Optional[str]]] = {}
+        self._connections = []
+        self._workers = []
+        for _ in range(no_of_shards):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_run_shard, args=(child_conn, strategy_factory, quiet),
+                                             daemon=True)
+            worker.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._workers.append(worker)
+
+    # ---------- Routing ----------
+
+    def assign_city(self, city: str, shard: int):
+        """Pin a city to a shard, must be done before data of that city is added."""
+        self.city_shards[city] = shard
+
+    def assign_pincode(self, pincode: str, shard: int):
+        """Pin a pincode to a shard (over its city's shard), must be done before data of that pincode is added."""
+        self.pincode_shards[pincode] = shard
+
+    def shard_for(self, city: str, pincode: Optional[str] = None) -> int:
+        shard = self.pincode_shards.get(pincode) if pincode is not None else None
+        if shard is not None:
+            return shard
+        shard = self.city_shards.get(city)
+        if shard is None:
+            shard = zlib.crc32(city.encode()) % self.no_of_shards  # stable across processes & restarts
+            self.city_shards[city] = shard
+        return shard
+
+    def shard_for_location(self, location: Location) -> int:
+        return self.shard_for(location.city, location.pincode)
+
+    def _call(self, shard: int, method: str, *args):
+        self._connections[shard].send((method, args))
+        return self._connections[shard].recv()
+
+    def _scatter(self, calls_by_shard: Dict[int, List[Tuple[str, tuple]]]) -> Dict[int, list]:
+        # Send every batch first so the shards work in parallel, then gather the replies
+        for shard, calls in calls_by_shard.items():
+            self._connections[shard].send(("batch", calls))
+        return {shard: self._connections[shard].recv() for shard in calls_by_shard}
+
+    # ---------- FoodOrderingSystem API ----------
+
+    def add_restaurant(self, restaurant: Restaurant):
+        shard = self.shard_for_location(restaurant.location)
+        self._call(shard, "add_restaurant", restaurant)
+        self.city_restaurant_shards[restaurant.location.city].add(shard)
+
+    def add_user(self, user: User):
+        if user.location is None:
+            raise ValueError(f"User {user.id} has no location, set_location() before adding the user")
+        self._call(self.shard_for_location(user.location), "add_user", user)
+
+    def add_delivery_boy(self, delivery_boy: DeliveryBoy, city: str, pincode: Optional[str] = None):
+        shard = self.shard_for(city, pincode)
+        self._call(shard, "add_delivery_boy", delivery_boy)
+        self.delivery_boy_shards[delivery_boy.id] = shard
+
+    def update_delivery_boy_location(self, delivery_boy_id: int, city: str, location: Tuple[float, float],
+                                     pincode: Optional[str] = None):
+        """Move a delivery boy, handing the delivery boy over to another shard on a change of city (or pincode).
+        A delivery boy carrying orders stays on the old shard until they are completed, see complete_order()."""
+        self.pending_handoffs.pop(delivery_boy_id, None)
+        old_shard = self.delivery_boy_shards[delivery_boy_id]
+        new_shard = self.shard_for(city, pincode)
+        if old_shard == new_shard:
+            self._call(new_shard, "update_delivery_boy_location", delivery_boy_id, location)
+            return
+        delivery_boy = self._call(old_shard, "remove_delivery_boy", delivery_boy_id)
+        if delivery_boy is None:
+            self._call(old_shard, "update_delivery_boy_location", delivery_boy_id, location)
+            self.pending_handoffs[delivery_boy_id] = (city, location, pincode)
+            return
+        delivery_boy.location = location
+        self._call(new_shard, "add_delivery_boy", delivery_boy)
+        self.delivery_boy_shards[delivery_boy_id] = new_shard
+
+    def get_all_restaurants(self, location: Location, food_type: Optional[FoodType] = None) -> List[Restaurant]:
+        # Restaurants of the pincode are on its shard, those of the city on every shard holding one of its pincodes
+        shards = self.city_restaurant_shards.get(location.city, set()) | {self.shard_for_location(location)}
+        if len(shards) == 1:
+            return self._call(shards.pop(), "search", location, food_type)
+        replies = self._scatter({shard: [("search", (location, food_type))] for shard in shards})
+        return list({restaurant.id: restaurant for reply in replies.values() for restaurant in reply[0]}.values())
+
+    def _record_events(self, order: FoodOrder, events: List[Tuple[OrderStatus, Optional[int]]]):
+        """Apply the status changes made by a shard to the router's copy of the order and its event store."""
+        for status, courier_id in events:
+            if order.event_store:
+                order.event_store.append(order.booking_id, status, order.restaurant.id, courier_id)
+            order.order_status = status.value
+
+    def assign_delivery_boy_to_order(self, order: FoodOrder) -> Optional[int]:
+        """Route the order to the shard of its restaurant, returns the assigned delivery boy id."""
+        shard = self.shard_for_location(order.restaurant.location)
+        self.order_shards[order.booking_id] = shard
+        self.orders[order.booking_id] = order
+        delivery_boy_id, events = self._call(shard, "place_order", order)
+        self._record_events(order, events)
+        if delivery_boy_id is not None:
+            self.order_delivery_boys[order.booking_id] = delivery_boy_id
+        return delivery_boy_id
+
+    def place_orders(self, orders: List[FoodOrder]) -> Dict[int, Optional[int]]:
+        """Dispatch a batch of orders on all shards in parallel, returns booking_id -> delivery boy id."""
+        calls_by_shard: Dict[int, List[Tuple[str, tuple]]] = defaultdict(list)
+        booking_ids_by_shard: Dict[int, List[int]] = defaultdict(list)
+        for order in orders:
+            shard = self.shard_for_location(order.restaurant.location)
+            self.order_shards[order.booking_id] = shard
+            self.orders[order.booking_id] = order
+            calls_by_shard[shard].append(("place_order", (order,)))
+            booking_ids_by_shard[shard].append(order.booking_id)
+        results = {}
+        for shard, replies in self._scatter(calls_by_shard).items():
+            for booking_id, (delivery_boy_id, events) in zip(booking_ids_by_shard[shard], replies):
+                self._record_events(self.orders[booking_id], events)
+                if delivery_boy_id is not None:
+                    self.order_delivery_boys[booking_id] = delivery_boy_id
+                results[booking_id] = delivery_boy_id
+        return results
+
+    def complete_order(self, booking_id: int) -> bool:
+        shard = self.order_shards.get(booking_id)
+        if shard is None:
+            return False
+        completed, events = self._call(shard, "complete_order", booking_id)
+        self._record_events(self.orders[booking_id], events)
+        if completed:
+            del self.order_shards[booking_id]
+            del self.orders[booking_id]
+            delivery_boy_id = self.order_delivery_boys.pop(booking_id, None)
+            handoff = self.pending_handoffs.get(delivery_boy_id)
+            if handoff is not None:
+                city, location, pincode = handoff
+                self.update_delivery_boy_location(delivery_boy_id, city, location, pincode)
+        return completed
+
+    def stats(self) -> List[Dict[str, int]]:
+        return [self._call(shard, "stats") for shard in range(self.no_of_shards)]
+
+    def close(self):
+        for shard, worker in enumerate(self._workers):
+            if worker.is_alive():
+                self._call(shard, "stop")
+            worker.join()
+            self._connections[shard].close()
+
+
+# Example Usage: orders per second with 1 shard vs one shard per core
+if __name__ == "__main__":
+    import time
+    from DeliveryBoy import haversine_km
+    from DispatchSimulator import CITIES, DispatchSimulator
+
+    simulator = DispatchSimulator(no_of_cities=len(CITIES), no_of_restaurants=2000, no_of_users=4000,
+                                  no_of_delivery_boys=4000, no_of_orders=4000)
+    restaurants, users, delivery_boys = simulator.generate_world()
+
+    def nearest_city(location: Tuple[float, float]) -> str:
+        return min(CITIES, key=lambda city: haversine_km(location, (city[3], city[4])))[0]
+
+    for no_of_shards in sorted({1, os.cpu_count() or 1}):
+        system = ShardedFoodOrderingSystem(no_of_shards, quiet=True)
+        for restaurant in restaurants:
+            system.add_restaurant(restaurant)
+        for user in users:
+            system.add_user(user)
+        for delivery_boy in delivery_boys:
+            system.add_delivery_boy(delivery_boy, nearest_city(delivery_boy.location))
+
+        orders = [FoodOrder(booking_id, restaurants[restaurant_index], users[user_index],
+                            restaurants[restaurant_index].menu.food_items[:1])
+                  for booking_id, (_, restaurant_index, user_index) in enumerate(simulator.generate_orders())]
+        start = time.perf_counter()
+        assigned = 0
+        for i in range(0, len(orders), 500):
+            assigned += sum(1 for boy_id in system.place_orders(orders[i:i + 500]).values() if boy_id is not None)
+        elapsed = time.perf_counter() - start
+        print(f"{no_of_shards} shard(s): {assigned}/{len(orders)} orders assigned, {len(orders) / elapsed:.0f} orders/s")
+        system.close()
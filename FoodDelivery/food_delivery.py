@@ -36,7 +36,22 @@ from abc import ABC, abstractmethod
 from DeliveryAssignmentStrategy import DeliveryAssignmentStrategy, NearestDeliveryBoyStrategy, \
     RoundRobinDeliveryBoyStrategy, LastOrderDateTimeDeliveryBoyStrategy
 from DeliveryBoy import DeliveryBoy
+from DispatchMetrics import metrics
+from OrderEventStore import OrderEventStore, OrderStatus, ORDER_STATUS_TRANSITIONS
 import math
+import threading
+
+try:
+    from Spans import tracer  # Logger/Spans.py, when ../Logger is on sys.path (e.g. PYTHONPATH=../Logger)
+    timed = tracer.timed
+except ImportError:  # spans are optional, without the Logger subsystem the entry points are not wrapped
+    def timed(name=None):
+        return lambda func: func
+
+
+# Striped locks guarding the status of orders, picked by booking id (same scheme as the delivery boy
+# claim locks in DeliveryBoy.py, a lock per order would make FoodOrder unpicklable)
+_ORDER_LOCKS = [threading.Lock() for _ in range(64)]
 
 
 # Enums
@@ -152,16 +167,44 @@ class User:
 
 
 class FoodOrder:
-    def __init__(self, booking_id: int, restaurant: Restaurant, user: User, food_items: List[Food]):
+    def __init__(self, booking_id: int, restaurant: Restaurant, user: User, food_items: List[Food],
+                 event_store: Optional[OrderEventStore] = None):
         self.booking_id = booking_id
         self.restaurant = restaurant
         self.user = user
         self.food_items = food_items
         self.observers: List[Observer] = []
-        self.order_status = 'in_cart'  # Order status can be 'in_cart', 'confirmed', 'dispatched', 'completed'
-
-    def update_order_status(self, order_status):
-        self.order_status = order_status
+        self.event_store = event_store  # Optional append-only log of status changes
+        self.order_status: Optional[str] = None  # Order status can be 'in_cart', 'confirmed', 'dispatched', 'completed'
+        self.update_order_status(OrderStatus.IN_CART)
+
+    @property
+    def status(self) -> Optional[OrderStatus]:
+        return OrderStatus(self.order_status) if self.order_status is not None else None
+
+    def can_move_to(self, order_status) -> bool:
+        return OrderStatus(order_status) in ORDER_STATUS_TRANSITIONS[self.status]
+
+    def update_order_status(self, order_status, courier_id: Optional[int] = None) -> bool:
+        """Move the order to a new status, 'in_cart' -> 'confirmed' -> 'dispatched' -> 'completed'.
+        Check, event and status change are one step, of two racing dispatchers only one succeeds."""
+        order_status = OrderStatus(order_status)
+        with _ORDER_LOCKS[hash(self.booking_id) % len(_ORDER_LOCKS)]:
+            current_status = self.order_status
+            moved = self.can_move_to(order_status)
+            if moved:
+                if self.event_store:
+                    self.event_store.append(self.booking_id, order_status, self.restaurant.id, courier_id)
+                self.order_status = order_status.value
+        if not moved:
+            print(f"Order {self.booking_id} cannot move from {current_status} to {order_status.value}")
+        return moved
+
+    def __getstate__(self):
+        # The event store is local to a process (open log file), orders sent to a shard worker leave it behind
+        state = self.__dict__.copy()
+        state["event_store"] = None
+        return state
 
     def add_observer(self, observer: Observer):
         self.observers.append(observer)
@@ -169,17 +212,20 @@ class FoodOrder:
     def remove_observer(self, observer: Observer):
         self.observers.remove(observer)
 
+    @metrics.timed()
     def notify_observers(self, message: str):
         for observer in self.observers:
             observer.update(self.booking_id, message)
 
     def confirm_booking(self):
-        self.order_status = 'confirmed'
+        if not self.update_order_status(OrderStatus.CONFIRMED):
+            return
         print(f"Booking Confirmed: {self.booking_id} for user {self.user.name} at {self.restaurant.name}")
         self.notify_observers("Your order has been confirmed!")
 
     def complete_food_delivery(self):
-        self.order_status = 'completed'
+        if not self.update_order_status(OrderStatus.COMPLETED):
+            return
         print(f"Food Delivery Completed: {self.booking_id} for user {self.user.name} at {self.restaurant.name}")
         self.notify_observers("Your food has been delivered!")
 
@@ -215,6 +261,7 @@ class FoodOrderingSystem:
                     food.food_type == food_type and food.status == "active"]
         return [food for food in restaurant.menu.food_items if food.status == "active"]
 
+    @metrics.timed()
     def get_all_restaurants(self, location: Location, food_type: Optional[FoodType] = None):
         if food_type:
             city_key = (location.city, food_type)
@@ -229,9 +276,12 @@ class FoodOrderingSystem:
             return list(results)
     def confirm_booking(self, booking: FoodOrder):
         booking.confirm_booking()
+    @timed()  # span of the entry point, the strategies' own calls are timed by DispatchMetrics
     def assign_delivery_boy_to_order(self, order: "FoodOrder"):
         """Use the selected strategy to assign a delivery boy."""
-        return self.assignment_strategy.assign_delivery_boy(order, self.delivery_boys)
+        delivery_boy = self.assignment_strategy.assign_delivery_boy(order, self.delivery_boys)
+        metrics.incr("orders.assigned" if delivery_boy else "orders.unassigned")
+        return delivery_boy
 
 
 # Example Usage
@@ -280,8 +330,11 @@ if __name__ == "__main__":
     email = EmailNotification()
     sms = SMSNotification()
 
+    # Order events are kept in memory here, pass a directory to persist them
+    order_store = OrderEventStore()
+
     # Create a FoodOrder instance
-    food_order1 = FoodOrder(101, restaurant, user, [pizza, burger])
+    food_order1 = FoodOrder(101, restaurant, user, [pizza, burger], order_store)
 
     # Add Observers
     food_order1.add_observer(whatsapp)
@@ -297,16 +350,23 @@ if __name__ == "__main__":
 
     # Change strategy to RoundRobinDeliveryBoyStrategy
     system.assignment_strategy = RoundRobinDeliveryBoyStrategy()
-    order2 = FoodOrder(102, restaurant, user, [burger])
+    order2 = FoodOrder(102, restaurant, user, [burger], order_store)
+    order2.confirm_booking()
     order2_delivery_boy = system.assign_delivery_boy_to_order(order2)
     order2_delivery_boy.complete_order()
     print()
 
     # change strategy to LastOrderDateTimeDeliveryBoyStrategy
     system.assignment_strategy = LastOrderDateTimeDeliveryBoyStrategy()
-    order3 = FoodOrder(103, restaurant, user, [pizza])
+    order3 = FoodOrder(103, restaurant, user, [pizza], order_store)
     order3.confirm_booking()
     system.assign_delivery_boy_to_order(order3)
+    print()
+
+    # Projections of the order event log
+    print(f"Completed orders: {sorted(order_store.get_orders_by_status(OrderStatus.COMPLETED))}")
+    print(f"Dispatched orders: {sorted(order_store.get_orders_by_status(OrderStatus.DISPATCHED))}")
+    print(f"Orders of Delivery Boy 1: {sorted(order_store.get_orders_by_courier(boy1.id))}")
 
 '''
 # Output:
@@ -319,6 +379,7 @@ SMS Notification - Booking ID: 101, Message: Your order has been confirmed!
 Assigned Order 101 to DeliveryBoy Delivery Boy 1
 DeliveryBoy Delivery Boy 1 completed Order 101
 
+Booking Confirmed: 102 for user John Doe at Food Paradise
 Assigned Order 102 to DeliveryBoy Delivery Boy 1
 DeliveryBoy Delivery Boy 1 completed Order 102
 
@@ -327,4 +388,8 @@ DeliveryBoy: Delivery Boy 1, Status: available, Last Order Datetime: 2024-12-31
 DeliveryBoy: Delivery Boy 2, Status: available, Last Order Datetime: 2024-12-10 00:00:00
 DeliveryBoy: Delivery Boy 3, Status: available, Last Order Datetime: 2024-12-10 00:00:00
 Assigned Order 103 to DeliveryBoy Delivery Boy 2
+
+Completed orders: [101, 102]
+Dispatched orders: [103]
+Orders of Delivery Boy 1: [101, 102]
 '''
@@ -0,0 +1,174 @@
+'''
+
+Asynchronous Logger
+log() only appends (level, message, args) to a bounded ring buffer, a background writer thread
+drains it in batches through the real chain, so the caller never waits for print / disk I/O.
+
+	•	Buffer: at most `capacity` records, oldest first
+	•	Overflow: BLOCK --> log() waits for free space
+	              DROP_OLDEST --> the oldest buffered record is dropped for the new one
+	              DROP_NEWEST --> the new record is dropped
+	•	Writer: takes up to `batch_size` records at once and writes them outside the lock
+	•	Shutdown: close() (or leaving a `with AsyncLogger(...)` block, also run at interpreter exit)
+	              writes everything still buffered, stops the writer thread and drops the atexit hook
+	•	Counters: enqueued / written / dropped_oldest / dropped_newest / errors, see stats()
+
+Caller --> AsyncLogger.log() --> [ring buffer] --> writer thread --> ErrorLogger --> DebugLogger --> InfoLogger
+
+'''
+import atexit
+import threading
+from collections import deque
+from enum import Enum
+
+from Logger import BaseLogger, DebugLogger, ErrorLogger, InfoLogger, LogLevel
+
+
+class OverflowPolicy(Enum):
+    BLOCK = 1
+    DROP_OLDEST = 2
+    DROP_NEWEST = 3
+
+
+class AsyncLogger(BaseLogger):
+    def __init__(self, next_logger, capacity=8192, overflow_policy=OverflowPolicy.BLOCK, batch_size=512):
+        super().__init__(None, next_logger)
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.overflow_policy = overflow_policy
+        self.batch_size = batch_size
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._drained = threading.Condition(self._lock)
+        self._writing = 0  # records taken by the writer, not written yet
+        self._closed = False
+        self.enqueued = 0
+        self.written = 0
+        self.dropped_oldest = 0
+        self.dropped_newest = 0
+        self.errors = 0
+        self._writer = threading.Thread(target=self._run, name="AsyncLoggerWriter", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def log(self, level, message, *args):
+        """
+        Enqueues the message, the writer thread formats it and hands it to the chain.
+        """
+        next_logger = self.next_logger
+        if not next_logger.report_unhandled and not next_logger.is_enabled(level):
+            return  # the chain would drop it anyway
+        with self._lock:
+            buffer = self._buffer
+            if len(buffer) >= self.capacity and not self._closed:
+                if self.overflow_policy is OverflowPolicy.DROP_NEWEST:
+                    self.dropped_newest += 1
+                    return
+                if self.overflow_policy is OverflowPolicy.DROP_OLDEST:
+                    buffer.popleft()
+                    self.dropped_oldest += 1
+                else:
+                    while len(buffer) >= self.capacity and not self._closed:
+                        self._not_full.wait()
+            closed = self._closed
+            if not closed:
+                buffer.append((level, message, args))
+                self.enqueued += 1
+                if len(buffer) == 1:
+                    self._not_empty.notify()
+        if closed:
+            # After shutdown nothing drains the buffer any more, write on the caller's thread
+            next_logger.log(level, message, *args)
+
+    def write_message(self, msg):
+        self.next_logger.write_message(msg)
+
+    def is_enabled(self, level):
+        return self.next_logger.is_enabled(level)
+
+    def _run(self):
+        buffer = self._buffer
+        while True:
+            with self._lock:
+                while not buffer and not self._closed:
+                    self._not_empty.wait()
+                if not buffer:  # closed and drained
+                    self._drained.notify_all()
+                    return
+                batch = [buffer.popleft() for _ in range(min(self.batch_size, len(buffer)))]
+                self._writing = len(batch)
+                self._not_full.notify_all()
+
+            next_logger = self.next_logger
+            errors = 0
+            for level, message, args in batch:
+                try:
+                    next_logger.log(level, message, *args)
+                except Exception:
+                    errors += 1  # a failing sink must not stop the writer
+
+            with self._lock:
+                self.written += len(batch) - errors
+                self.errors += errors
+                self._writing = 0
+                if not buffer:
+                    self._drained.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Waits until every record enqueued so far is written, False on timeout.
+        """
+        with self._lock:
+            return self._drained.wait_for(lambda: not self._buffer and not self._writing, timeout)
+
+    def close(self):
+        """
+        Stops accepting records into the buffer, writes everything still in it and stops the
+        writer thread. Short-lived loggers must be closed, until then the atexit hook keeps them alive.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        self._writer.join()
+        atexit.unregister(self.close)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "buffered": len(self._buffer),
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped_oldest": self.dropped_oldest,
+                "dropped_newest": self.dropped_newest,
+                "errors": self.errors,
+            }
+
+
+if __name__ == "__main__":
+    # Configure the Chain behind the buffer
+    info_logger = InfoLogger(LogLevel.INFO)
+    debug_logger = DebugLogger(LogLevel.DEBUG, next_logger=info_logger)
+    error_logger = ErrorLogger(LogLevel.ERROR, next_logger=debug_logger)
+    # Usage, leaving the with block flushes and stops the writer thread (close())
+    with AsyncLogger(error_logger, capacity=4, overflow_policy=OverflowPolicy.DROP_OLDEST) as async_logger:
+        async_logger.log(LogLevel.INFO, "This is an info message.")
+        async_logger.log(LogLevel.DEBUG, "Debugging application.")
+        async_logger.log(LogLevel.ERROR, "An error occurred!")
+        async_logger.log(LogLevel.WARNING, "This is a warning.")
+    print(async_logger.stats())
+
+'''
+Output:-
+[INFO]: This is an info message.
+[DEBUG]: Debugging application.
+[ERROR]: An error occurred!
+Log level WARNING not handled: This is a warning.
+{'buffered': 0, 'enqueued': 4, 'written': 4, 'dropped_oldest': 0, 'dropped_newest': 0, 'errors': 0}
+
+'''
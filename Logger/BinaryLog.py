@@ -0,0 +1,270 @@
+'''
+
+Binary Log
+Structured log records instead of text lines: nothing is formatted when a message is written,
+and a reader filters by level / time without parsing text.
+
+	•	Record: size, kind, LogLevel, timestamp, template id + encoded args (fixed 18 byte header)
+	•	Template: the %-format string of log(level, fmt, *args) is interned, written once as a
+	              TEMPLATE record, every later record only carries its id
+	•	Args: int / float / bool / None / str are stored typed, anything else as str(arg)
+	•	Writer: records are collected in a buffer and written with one os.write() per buffer_size.
+	            An existing log is appended to (a record cut off by a crash is dropped first),
+	            templates are written again by the new writer before their first use. close() (or leaving
+	            a with block, also run at interpreter exit) writes the buffer and drops the atexit hook
+	•	Reader: memory-maps the file, a record not matching the level / time filter is skipped by
+	            its size, only its header is decoded. render() gives back "[LEVEL]: msg"
+
+File:- b"LOGBIN01" + records
+
+'''
+import atexit
+import mmap
+import os
+import struct
+import threading
+import time
+
+from Logger import BaseLogger, LogLevel
+
+_MAGIC = b"LOGBIN01"
+_RECORD, _TEMPLATE = 1, 2
+# payload size, kind, level (0: none), timestamp, template id
+_HEADER = struct.Struct("<IBBdI")
+_INT, _FLOAT, _STR, _NONE, _TRUE, _FALSE, _BIG_INT = range(7)
+_INT_VALUE = struct.Struct("<q")
+_FLOAT_VALUE = struct.Struct("<d")
+_STR_SIZE = struct.Struct("<I")
+_LEVELS = {level.value: level for level in LogLevel}
+
+
+def _encode_args(args):
+    parts = []
+    for arg in args:
+        if arg is None:
+            parts.append(b"\x03")
+        elif arg is True:
+            parts.append(b"\x04")
+        elif arg is False:
+            parts.append(b"\x05")
+        elif type(arg) is int:
+            if -(1 << 63) <= arg < (1 << 63):
+                parts.append(b"\x00" + _INT_VALUE.pack(arg))
+            else:
+                encoded = str(arg).encode()
+                parts.append(b"\x06" + _STR_SIZE.pack(len(encoded)) + encoded)
+        elif type(arg) is float:
+            parts.append(b"\x01" + _FLOAT_VALUE.pack(arg))
+        else:
+            encoded = (arg if type(arg) is str else str(arg)).encode()
+            parts.append(b"\x02" + _STR_SIZE.pack(len(encoded)) + encoded)
+    return b"".join(parts)
+
+
+def _decode_args(data, offset, end):
+    args = []
+    while offset < end:
+        tag = data[offset]
+        offset += 1
+        if tag == _INT:
+            args.append(_INT_VALUE.unpack_from(data, offset)[0])
+            offset += 8
+        elif tag == _FLOAT:
+            args.append(_FLOAT_VALUE.unpack_from(data, offset)[0])
+            offset += 8
+        elif tag == _STR or tag == _BIG_INT:
+            (size,) = _STR_SIZE.unpack_from(data, offset)
+            offset += 4
+            text = str(data[offset:offset + size], "utf-8")
+            args.append(text if tag == _STR else int(text))
+            offset += size
+        else:
+            args.append(None if tag == _NONE else tag == _TRUE)
+    return tuple(args)
+
+
+def _complete_end(fd, size, path):
+    """
+    Offset after the last complete record of an existing log, checks it is a binary log.
+    """
+    with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as data:
+        if data[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"{path} is not a binary log")
+        offset = len(_MAGIC)
+        while offset + _HEADER.size <= size:
+            end = offset + _HEADER.size + _HEADER.unpack_from(data, offset)[0]
+            if end > size:
+                break
+            offset = end
+        return offset
+
+
+class BinaryLogWriter:
+    def __init__(self, path, buffer_size=1 << 20, max_templates=65536):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.max_templates = max_templates  # beyond it (e.g. f-string messages) records carry their text
+        self._templates = {"%s": 0}
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            size = os.fstat(self._fd).st_size
+            if size == 0:
+                self._buffer += _MAGIC + _HEADER.pack(2, _TEMPLATE, 0, 0.0, 0) + b"%s"
+            else:
+                end = _complete_end(self._fd, size, path)
+                if end != size:
+                    os.ftruncate(self._fd, end)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self.records = 0
+        atexit.register(self.close)
+
+    def write(self, level, template, args, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        with self._lock:
+            if self._fd is None:
+                raise ValueError(f"write to closed binary log {self.path}")
+            template_id = self._templates.get(template)
+            if template_id is None:
+                if len(self._templates) < self.max_templates:
+                    template_id = self._templates[template] = len(self._templates)
+                    encoded = template.encode()
+                    self._buffer += _HEADER.pack(len(encoded), _TEMPLATE, 0, 0.0, template_id) + encoded
+                else:
+                    template_id, args = 0, (template % args if args else template,)
+            payload = _encode_args(args) if args else b""
+            self._buffer += _HEADER.pack(len(payload), _RECORD, level.value, timestamp, template_id) + payload
+            self.records += 1
+            if len(self._buffer) >= self.buffer_size:
+                self._flush()
+
+    def _flush(self):
+        view = memoryview(self._buffer)
+        while view:
+            view = view[os.write(self._fd, view):]
+        view.release()
+        self._buffer.clear()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            if self._fd is None:
+                return
+            self._flush()
+            os.close(self._fd)
+            self._fd = None
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class BinaryLogger(BaseLogger):
+    def __init__(self, log_level, writer, next_logger=None):
+        super().__init__(log_level, next_logger)
+        self.writer = writer
+
+    def write_record(self, level, message, args):
+        self.writer.write(level, message, args)
+
+    def write_message(self, msg):
+        self.writer.write(self.log_level, msg, ())
+
+
+class BinaryLogReader:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        if self._data[:len(_MAGIC)] != _MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a binary log")
+        self.templates = {}
+
+    def records(self, levels=None, start=None, end=None):
+        """
+        (timestamp, LogLevel, template, args) of every record with a level in `levels` and a
+        timestamp in [start, end), in file order. Records cut off at the end are skipped.
+        """
+        data = self._data
+        size = len(data)
+        templates = self.templates
+        level_values = None if levels is None else {level.value for level in levels}
+        start = float("-inf") if start is None else start
+        end = float("inf") if end is None else end
+        unpack_header = _HEADER.unpack_from
+        header_size = _HEADER.size
+        offset = len(_MAGIC)
+        while offset + header_size <= size:
+            payload_size, kind, level, timestamp, template_id = unpack_header(data, offset)
+            payload_start = offset + header_size
+            offset = payload_start + payload_size
+            if offset > size:
+                break
+            if kind == _TEMPLATE:
+                templates[template_id] = str(data[payload_start:offset], "utf-8")
+            elif (level_values is None or level in level_values) and start <= timestamp < end:
+                yield (timestamp, _LEVELS[level], templates[template_id],
+                       _decode_args(data, payload_start, offset) if payload_size else ())
+
+    @staticmethod
+    def render(record):
+        """
+        The text line the console loggers would have written.
+        """
+        _, level, template, args = record
+        return f"[{level.name}]: {template % args if args else template}"
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Binary log write / filter speed against text lines.")
+    parser.add_argument("--records", type=int, default=500000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "app.logbin")
+        levels = [LogLevel.INFO] * 8 + [LogLevel.DEBUG, LogLevel.ERROR]
+        start = time.perf_counter()
+        with BinaryLogWriter(path) as writer:  # close() flushes and drops the atexit hook
+            info_logger = BinaryLogger(LogLevel.INFO, writer)
+            debug_logger = BinaryLogger(LogLevel.DEBUG, writer, next_logger=info_logger)
+            error_logger = BinaryLogger(LogLevel.ERROR, writer, next_logger=debug_logger)
+            for i in range(args.records):
+                error_logger.log(levels[i % len(levels)], "Order %d assigned to %s in %.1f min", i, "Ravi",
+                                 i % 30 / 2)
+        elapsed = time.perf_counter() - start
+        file_size = os.path.getsize(path)
+        print(f"Wrote {args.records} records ({file_size / 2 ** 20:.1f} MB) in {elapsed:.2f}s, "
+              f"{args.records / elapsed:.0f} records/s")
+
+        with BinaryLogReader(path) as reader:
+            start = time.perf_counter()
+            errors = list(reader.records(levels=[LogLevel.ERROR]))
+            elapsed = time.perf_counter() - start
+        print(f"Filtered {len(errors)} ERROR records in {elapsed:.2f}s ({file_size / 2 ** 20 / elapsed:.0f} MB/s)")
+        print(BinaryLogReader.render(errors[0]))
@@ -0,0 +1,214 @@
+'''
+
+File Logger
+A BaseLogger writing "[LEVEL]: msg" lines to a file instead of stdout. The loggers of a chain
+share one FileSink, which turns many small lines into few large writes.
+
+	•	Buffer: lines are collected in memory and written with one os.write() once buffer_size
+	            bytes are pending (or every flush_interval_s), no syscall per line
+	•	Rotation: by size (max_bytes) and/or age (rotate_interval_s),
+	              app.log --> app.log.1 --> app.log.2 ... up to backup_count files
+	•	Durability (FsyncPolicy):
+	        NONE --> the OS decides when to write to disk
+	        PERIODIC --> one fsync for everything written in the last fsync_interval_s (group fsync)
+	        PER_ERROR --> every ERROR line is written and fsynced right away
+	•	Shutdown: close() (or leaving a `with FileSink(...)` block, also run at interpreter exit) writes
+	              the buffer, fsyncs, stops the flusher thread and drops the atexit hook
+
+ErrorLogger(FileLogger) --> DebugLogger(FileLogger) --> InfoLogger(FileLogger) --> FileSink --> app.log
+
+'''
+import atexit
+import os
+import threading
+import time
+from enum import Enum
+
+from Logger import BaseLogger, LogLevel
+
+
+class FsyncPolicy(Enum):
+    NONE = 1
+    PERIODIC = 2
+    PER_ERROR = 3
+
+
+class FileSink:
+    def __init__(self, path, buffer_size=1 << 20, max_bytes=None, rotate_interval_s=None, backup_count=5,
+                 fsync_policy=FsyncPolicy.NONE, fsync_interval_s=1.0, flush_interval_s=1.0):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.max_bytes = max_bytes
+        self.rotate_interval_s = rotate_interval_s
+        self.backup_count = backup_count
+        self.fsync_policy = fsync_policy
+        self.fsync_interval_s = fsync_interval_s
+        self.flush_interval_s = flush_interval_s
+        self._lines = []  # encoded lines
+        self._pending = 0  # bytes in _lines
+        self._lock = threading.Lock()
+        self._fd = None
+        self._size = 0
+        self._opened_at = 0.0
+        self._dirty = False  # written since the last fsync
+        self.writes = 0
+        self.fsyncs = 0
+        self.rotations = 0
+        self._open()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._run, name="FileSinkFlusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def _open(self):
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._size = os.fstat(self._fd).st_size
+        self._opened_at = time.time()
+
+    def write(self, line, level=None):
+        """
+        Appends one line (with its newline), fsyncs right away for ERROR with PER_ERROR.
+        """
+        data = line.encode()
+        with self._lock:
+            if self._fd is None:
+                raise ValueError(f"write to closed log file {self.path}")
+            self._lines.append(data)
+            self._pending += len(data)
+            if level is LogLevel.ERROR and self.fsync_policy is FsyncPolicy.PER_ERROR:
+                self._flush()
+                self._fsync()
+            elif self._pending >= self.buffer_size or \
+                    (self.max_bytes is not None and self._size + self._pending >= self.max_bytes):
+                self._flush()
+
+    def _flush(self):
+        if not self._lines:
+            return
+        data = b"".join(self._lines)
+        self._lines = []
+        self._pending = 0
+        if self.max_bytes is not None and self._size and self._size + len(data) > self.max_bytes:
+            self._rotate()
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+        self._size += len(data)
+        self._dirty = True
+        self.writes += 1
+
+    def _fsync(self):
+        if self._dirty:
+            os.fsync(self._fd)
+            self._dirty = False
+            self.fsyncs += 1
+
+    def _rotate(self):
+        if self.fsync_policy is not FsyncPolicy.NONE:
+            self._fsync()
+        os.close(self._fd)
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                if os.path.exists(f"{self.path}.{i}"):
+                    os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._dirty = False
+        self.rotations += 1
+        self._open()
+
+    def _run(self):
+        interval = min(self.flush_interval_s, self.fsync_interval_s) \
+            if self.fsync_policy is FsyncPolicy.PERIODIC else self.flush_interval_s
+        last_fsync = time.monotonic()
+        while not self._closed.wait(interval):
+            with self._lock:
+                if self._fd is None:
+                    return
+                if self.rotate_interval_s is not None and time.time() - self._opened_at >= self.rotate_interval_s:
+                    self._flush()
+                    if self._size:
+                        self._rotate()
+                self._flush()
+                if self.fsync_policy is FsyncPolicy.PERIODIC and time.monotonic() - last_fsync >= self.fsync_interval_s:
+                    # One fsync covers every line written since the last one
+                    self._fsync()
+                    last_fsync = time.monotonic()
+
+    def flush(self, fsync=False):
+        with self._lock:
+            self._flush()
+            if fsync:
+                self._fsync()
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            if self._fd is None:
+                return
+            self._flush()
+            if self.fsync_policy is not FsyncPolicy.NONE:
+                self._fsync()
+            os.close(self._fd)
+            self._fd = None
+        self._flusher.join()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def stats(self):
+        with self._lock:
+            return {"size": self._size, "pending": self._pending, "writes": self.writes, "fsyncs": self.fsyncs,
+                    "rotations": self.rotations}
+
+
+class FileLogger(BaseLogger):
+    def __init__(self, log_level, sink, next_logger=None):
+        super().__init__(log_level, next_logger)
+        self.sink = sink
+        self._prefix = f"[{log_level.name}]: "
+
+    def write_message(self, msg):
+        self.sink.write(f"{self._prefix}{msg}\n", self.log_level)
+
+
+def file_chain(sink, levels=(LogLevel.ERROR, LogLevel.DEBUG, LogLevel.INFO)):
+    """
+    FileLoggers of the given levels, first level at the head of the chain, all writing to sink.
+    """
+    head = None
+    for level in reversed(levels):
+        head = FileLogger(level, sink, next_logger=head)
+    return head
+
+
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Lines per second of a FileLogger chain per fsync policy.")
+    parser.add_argument("--lines", type=int, default=500000)
+    parser.add_argument("--max-mb", type=float, default=32, help="rotate after this many MB")
+    args = parser.parse_args()
+
+    levels = [LogLevel.INFO] * 8 + [LogLevel.DEBUG] + [LogLevel.ERROR]
+    print(f"{'policy':<10}{'lines/s':>12}{'writes':>8}{'fsyncs':>8}{'rotations':>10}")
+    for policy in FsyncPolicy:
+        with tempfile.TemporaryDirectory() as directory:
+            with FileSink(os.path.join(directory, "app.log"), max_bytes=int(args.max_mb * 2 ** 20),
+                          fsync_policy=policy, fsync_interval_s=0.05) as sink:
+                logger = file_chain(sink)
+                no_of_lines = args.lines if policy is not FsyncPolicy.PER_ERROR else args.lines // 10
+                start = time.perf_counter()
+                for i in range(no_of_lines):
+                    logger.log(levels[i % len(levels)], "Order %d assigned to delivery boy %d", i, i % 97)
+            elapsed = time.perf_counter() - start  # including close(), the buffer is on disk
+            stats = sink.stats()
+            print(f"{policy.name:<10}{no_of_lines / elapsed:>12.0f}{stats['writes']:>8}{stats['fsyncs']:>8}"
+                  f"{stats['rotations']:>10}")
@@ -0,0 +1,58 @@
+'''
+
+Histogram
+Latency histogram shared by the span aggregation (Spans.py) and the food dispatch metrics
+(FoodDelivery/DispatchMetrics.py).
+
+	•	Buckets: log scale, 4 per power of two over the whole positive range (also below 1, e.g.
+	           sub-microsecond spans), so a percentile is off by at most 2 ** (1/4) --> ~19%
+	•	Zero: values <= 0 get their own bucket, reported as 0
+	•	Summary: count, mean, min, max and p50/p90/p99
+
+'''
+import math
+
+_BUCKETS_PER_POWER_OF_TWO = 4
+_ZERO_BUCKET = -math.inf
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value):
+        bucket = math.floor(math.log2(value) * _BUCKETS_PER_POWER_OF_TWO) if value > 0 else _ZERO_BUCKET
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, pct):
+        """Upper bound of the bucket holding the pct-th percentile (capped by the max seen)."""
+        if not self.count:
+            return 0.0
+        rank = pct / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(2 ** ((bucket + 1) / _BUCKETS_PER_POWER_OF_TWO), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
@@ -0,0 +1,94 @@
+'''
+
+Lazy Formatting Benchmark
+Cost of a log call for a level no logger of the chain writes (WARNING), per call in ns.
+
+	•	today: the original log(), a Python call per hop + f-string built up front
+	•	eager: compiled chain, the f-string is still built by the caller
+	•	lazy: log(level, fmt, *args), nothing is formatted for a dropped level
+	•	guarded: if is_enabled(level): ..., not even the call arguments are built
+	•	Every case runs with report_unhandled=False, the dropped message is not printed
+
+Usage:-
+python LazyFormatBenchmark.py --depth 3 --calls 200000
+
+'''
+import argparse
+import contextlib
+import os
+import timeit
+
+from Logger import BaseLogger, LogLevel
+
+
+class LinearLogger(BaseLogger):
+    """
+    The chain walk log() had before compilation, one call per hop.
+    """
+    def log(self, level, message):
+        if level == self.log_level:
+            self.write_message(message)
+        elif self.next_logger:
+            self.next_logger.log(level, message)
+        elif self.report_unhandled:
+            print(f"Log level {level.name} not handled: {message}")
+
+    def write_message(self, msg):
+        print(msg)
+
+
+class NullLogger(BaseLogger):
+    def write_message(self, msg):
+        pass
+
+
+def build_chain(cls, depth):
+    """
+    depth loggers cycling through INFO, DEBUG, ERROR, none of them writes WARNING.
+    """
+    levels = [LogLevel.INFO, LogLevel.DEBUG, LogLevel.ERROR]
+    head = None
+    for i in range(depth):
+        head = cls(levels[i % len(levels)], next_logger=head)
+    return head
+
+
+def _chain(logger):
+    while logger is not None:
+        yield logger
+        logger = logger.next_logger
+
+
+def run(depth, calls):
+    linear = build_chain(LinearLogger, depth)
+    compiled = build_chain(NullLogger, depth)
+    for logger in _chain(linear):
+        logger.report_unhandled = False  # the last logger of the linear walk is the one reporting
+    compiled.report_unhandled = False
+    user, seats, fare = "Alice", 2, 1234.5
+    warning = LogLevel.WARNING
+    cases = {
+        "today": lambda: linear.log(warning, f"User {user} booked {seats} seats for {fare:.2f}"),
+        "eager": lambda: compiled.log(warning, f"User {user} booked {seats} seats for {fare:.2f}"),
+        "lazy": lambda: compiled.log(warning, "User %s booked %d seats for %.2f", user, seats, fare),
+        "guarded": lambda: compiled.is_enabled(warning) and compiled.log(warning, "User %s booked %d seats for %.2f",
+                                                                         user, seats, fare),
+    }
+    results = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for name, call in cases.items():
+            results[name] = min(timeit.repeat(call, number=calls, repeat=3)) / calls * 1e9
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cost of a suppressed log call, today vs lazy formatting.")
+    parser.add_argument("--depth", type=int, nargs="+", default=[3, 10])
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f"{'depth':>5}{'today ns':>10}{'eager ns':>10}{'lazy ns':>10}{'guarded ns':>12}")
+    for depth in args.depth:
+        result = run(depth, args.calls)
+        print(f"{depth:>5}{result['today']:>10.0f}{result['eager']:>10.0f}{result['lazy']:>10.0f}"
+              f"{result['guarded']:>12.0f}")
@@ -0,0 +1,282 @@
+'''
+
+Log Aggregator
+Worker processes do not write logs themselves: an AggregatorLogger batches their records and
+sends them over a Unix socket to one collector process, which runs the real chain and sinks.
+
+	•	Client: AggregatorLogger.log() appends (level, message, args) to a batch, the batch is sent
+	            (one pickled message) once batch_size records are waiting or flush_interval_s passed,
+	            a flusher thread also sends the batch of a worker that stopped logging
+	•	Collector: one thread reads every worker connection (multiprocessing.connection.wait), so
+	               the records of a worker reach the chain in the order the worker logged them.
+	               It blocks while nothing arrives, new connections wake it up through a pipe
+	•	Errors: a record the chain can not write (e.g. args not matching its format) is skipped
+	            and reported as an ERROR record, the other records and workers are not affected
+	•	Chain: built inside the collector by chain_factory() (a module level function), e.g. a
+	           FileLogger chain, formatting happens there and not in the workers
+	•	Stop: LogCollector.stop() waits until every worker connection is closed (workers close()
+	          their logger, also at exit) and the chain wrote everything
+
+Worker 1 --> AggregatorLogger --\\
+Worker 2 --> AggregatorLogger ----> Unix socket --> collector process --> ErrorLogger --> DebugLogger --> InfoLogger
+Worker N --> AggregatorLogger --/
+
+'''
+import atexit
+import os
+import pickle
+import sys
+import threading
+import time
+from functools import partial
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Client, Listener, wait
+
+from Logger import BaseLogger, DebugLogger, ErrorLogger, InfoLogger, LogLevel
+
+_STOP = "stop"
+
+
+def default_chain():
+    info_logger = InfoLogger(LogLevel.INFO)
+    debug_logger = DebugLogger(LogLevel.DEBUG, next_logger=info_logger)
+    return ErrorLogger(LogLevel.ERROR, next_logger=debug_logger)
+
+
+def _write_batch(chain, batch):
+    for level, message, args in batch:
+        try:
+            chain.log(level, message, *args)
+        except Exception as error:
+            # One malformed record (e.g. args not matching its format) must not stop the collector
+            _report_error(chain, "Log record of a worker dropped (%s: %s): %r %% %r",
+                          type(error).__name__, error, message, args)
+
+
+def _report_error(chain, message, *args):
+    try:
+        chain.log(LogLevel.ERROR, message, *args)
+    except Exception:
+        print(f"LogCollector: {message % args}", file=sys.stderr)
+
+
+def _collect(address, chain_factory, ready):
+    chain = chain_factory()
+    listener = Listener(address, family="AF_UNIX")
+    connections = []
+    accepted = []  # connections accepted but not yet read, guarded by accepted_lock
+    accepted_lock = threading.Lock()
+    # The accept thread wakes the reader up through this pipe, so it blocks in wait() even
+    # while no worker is connected
+    wakeup_reader, wakeup_writer = Pipe(duplex=False)
+    stopping = False
+
+    def accept():
+        while True:
+            try:
+                connection = listener.accept()
+            except OSError:
+                return  # listener closed
+            with accepted_lock:
+                accepted.append(connection)
+            wakeup_writer.send_bytes(b"\0")
+
+    threading.Thread(target=accept, daemon=True).start()
+    ready.set()
+    while not (stopping and not connections):
+        for connection in wait(connections + [wakeup_reader]):
+            if connection is wakeup_reader:
+                wakeup_reader.recv_bytes()
+                with accepted_lock:
+                    connections.extend(accepted)
+                    accepted.clear()
+                continue
+            try:
+                batch = connection.recv()
+            except (EOFError, OSError):
+                connections.remove(connection)
+                connection.close()
+                continue
+            except Exception as error:
+                # A batch that can not be unpickled here, the next batches of the worker are still read
+                _report_error(chain, "Log batch of a worker dropped (%s: %s)", type(error).__name__, error)
+                continue
+            if batch == _STOP:
+                connections.remove(connection)
+                connection.close()
+                stopping = True
+                continue
+            _write_batch(chain, batch)
+    listener.close()
+    for logger in _chain_loggers(chain):
+        # Sinks buffering in the collector (e.g. FileSink) write everything before it exits
+        sink = getattr(logger, "sink", None)
+        if sink is not None:
+            sink.close()
+
+
+def _chain_loggers(chain):
+    logger, seen = chain, set()
+    while logger is not None and id(logger) not in seen:
+        seen.add(id(logger))
+        yield logger
+        logger = logger.next_logger
+
+
+class LogCollector:
+    def __init__(self, address, chain_factory=default_chain):
+        self.address = address
+        self.chain_factory = chain_factory
+        self._process = None
+
+    def start(self):
+        from multiprocessing import Event
+
+        if os.path.exists(self.address):
+            os.remove(self.address)
+        ready = Event()
+        self._process = Process(target=_collect, args=(self.address, self.chain_factory, ready),
+                                name="LogCollector", daemon=True)
+        self._process.start()
+        ready.wait()
+        return self
+
+    def stop(self, timeout=None):
+        """
+        Lets the collector finish once every worker closed its connection, then waits for it.
+        """
+        connection = Client(self.address, family="AF_UNIX")
+        connection.send(_STOP)
+        connection.close()
+        self._process.join(timeout)
+        if os.path.exists(self.address):
+            os.remove(self.address)
+
+
+def _format(message, args):
+    try:
+        return message % args if args else message
+    except Exception:
+        return f"{message} {args!r}"
+
+
+class AggregatorLogger(BaseLogger):
+    def __init__(self, address, batch_size=256, flush_interval_s=0.5, next_logger=None):
+        super().__init__(None, next_logger)
+        self.address = address
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self._batch = []
+        self._lock = threading.Lock()
+        self._connection = None
+        self._last_flush = time.monotonic()
+        self.sent = 0
+        # Sends the batch of an idle worker, log() only checks flush_interval_s when it is called
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._run, name="AggregatorFlusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def log(self, level, message, *args):
+        """
+        Queues the record for the collector, which formats and writes it.
+        """
+        with self._lock:
+            self._batch.append((level, message, args))
+            if len(self._batch) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval_s:
+                self._send()
+
+    def write_message(self, msg):
+        self.log(LogLevel.INFO, msg)
+
+    def is_enabled(self, level):
+        return True  # the chain lives in the collector
+
+    def _send(self):
+        if not self._batch:
+            return
+        if self._connection is None:
+            self._connection = Client(self.address, family="AF_UNIX")
+        try:
+            data = pickle.dumps(self._batch, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Args that can not be pickled are formatted here instead
+            data = pickle.dumps([(level, _format(message, args), ()) for level, message, args in self._batch],
+                                pickle.HIGHEST_PROTOCOL)
+        self._connection.send_bytes(data)
+        self.sent += len(self._batch)
+        self._batch = []
+        self._last_flush = time.monotonic()
+
+    def _run(self):
+        while not self._closed.wait(self.flush_interval_s):
+            with self._lock:
+                if self._batch and time.monotonic() - self._last_flush >= self.flush_interval_s:
+                    self._send()
+
+    def flush(self):
+        with self._lock:
+            self._send()
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            self._send()
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+        if self._flusher is not threading.current_thread():
+            self._flusher.join()
+        atexit.unregister(self.close)
+
+
+# ---------- Benchmark: N producers (ordering is checked by test_LogAggregator.py) ----------
+
+def _file_chain(path):
+    from FileLogger import FileSink, file_chain
+
+    return file_chain(FileSink(path))
+
+
+def _produce(address, worker_id, no_of_records, batch_size):
+    logger = AggregatorLogger(address, batch_size=batch_size)
+    levels = [LogLevel.INFO] * 8 + [LogLevel.DEBUG, LogLevel.ERROR]
+    for seq in range(no_of_records):
+        logger.log(levels[seq % len(levels)], "worker %d seq %d", worker_id, seq)
+    logger.close()
+
+
+def run_producers(no_of_producers, no_of_records, batch_size, directory):
+    """
+    Records/s through one collector writing to the file log_path of the result.
+    """
+    log_path = os.path.join(directory, f"aggregated.{no_of_producers}.log")
+    collector = LogCollector(os.path.join(directory, "collector.sock"), partial(_file_chain, log_path)).start()
+    producers = [Process(target=_produce, args=(collector.address, i, no_of_records, batch_size))
+                 for i in range(no_of_producers)]
+    start = time.perf_counter()
+    for producer in producers:
+        producer.start()
+    for producer in producers:
+        producer.join()
+    collector.stop()
+    elapsed = time.perf_counter() - start
+    total = no_of_producers * no_of_records
+    return {"producers": no_of_producers, "records": total, "records_per_sec": total / elapsed, "log_path": log_path}
+
+
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Throughput of N worker processes logging through one collector.")
+    parser.add_argument("--producers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--records", type=int, default=50000, help="records per producer")
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    print(f"{'producers':>9}{'records':>10}{'records/s':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for no_of_producers in args.producers:
+            result = run_producers(no_of_producers, args.records, args.batch_size, directory)
+            print(f"{result['producers']:>9}{result['records']:>10}{result['records_per_sec']:>12.0f}")
@@ -21,6 +21,8 @@ Code goes to Hanldler_2000(amt = 2500) --> Hanldler_500(amt = 2500) --> Hanldler
 And the reurn is checked with the original amount
 
 '''
+import threading
+import weakref
 from abc import ABC, abstractmethod
 from enum import Enum
 
@@ -29,29 +31,116 @@ class LogLevel(Enum):
     DEBUG = 2
     ERROR = 3
     WARNING = 4
+    METRIC = 5  # timing spans & measurements, see Spans.py
 
 # Abstract BaseLogger
 class BaseLogger(ABC):
-    def __init__(self, log_level, next_logger=None):
-        self.log_level = log_level
-        self.next_logger = next_logger
+    # Held while a chain is compiled or rewired, so a table is never built from a half changed chain
+    _chain_lock = threading.Lock()
 
-    def log(self, level, message):
+    def __init__(self, log_level, next_logger=None):
+        self._log_level = log_level
+        self._next_logger = next_logger
+        self._dispatch = None  # LogLevel --> logger writing it, for the chain starting here, None until compiled
+        self._fallback = None  # logger of the chain overriding log(), gets the levels not in _dispatch
+        self._heads = weakref.WeakSet()  # loggers whose compiled chain runs through this one
+        self.report_unhandled = True  # False: levels no logger writes are dropped, without formatting
+
+    @property
+    def log_level(self):
+        return self._log_level
+
+    @log_level.setter
+    def log_level(self, log_level):
+        with BaseLogger._chain_lock:
+            self._log_level = log_level
+            self._invalidate_heads()
+
+    @property
+    def next_logger(self):
+        return self._next_logger
+
+    @next_logger.setter
+    def next_logger(self, next_logger):
+        with BaseLogger._chain_lock:
+            self._next_logger = next_logger
+            self._invalidate_heads()
+
+    def _invalidate_heads(self):
+        """Only the chains running through this logger are recompiled, on their next log()."""
+        for head in list(self._heads):
+            head._dispatch = None
+
+    def compile(self):
+        """
+        Flattens the chain starting here into a LogLevel --> logger table, the first logger of
+        the chain with a level handles it, exactly as the delegation would.
+        Every logger down the chain (also behind a fallback, is_enabled() asks it) remembers this
+        head, so rewiring one of them recompiles this table and no other.
+        """
+        with BaseLogger._chain_lock:
+            dispatch = {}
+            fallback = None
+            logger, seen = self, set()
+            while logger is not None and id(logger) not in seen:
+                seen.add(id(logger))
+                logger._heads.add(self)
+                if fallback is None:
+                    if logger is not self and type(logger).log is not BaseLogger.log:
+                        # Custom delegation, whatever is left is handed to it as is
+                        fallback = logger
+                    else:
+                        dispatch.setdefault(logger.log_level, logger)
+                logger = logger.next_logger
+            self._fallback = fallback
+            self._dispatch = dispatch
+        return dispatch
+
+    def log(self, level, message, *args):
         """
         Handles the log message if it matches or delegates it to the next handler.
+        The chain is compiled once, so delegation is one dict lookup instead of a call per hop.
+        With args the message is a %-format string, formatted only once a logger takes it.
+        """
+        dispatch = self._dispatch
+        if dispatch is None:
+            dispatch = self.compile()
+        handler = dispatch.get(level)
+        if handler is not None:
+            handler.write_record(level, message, args)
+        elif self._fallback is not None:
+            self._fallback.log(level, message, *args)
+        elif self.report_unhandled:
+            print(f"Log level {level.name} not handled: {message % args if args else message}")
+
+    def is_enabled(self, level):
+        """
+        True if a logger of the chain writes this level, lets callers skip building costly messages.
         """
-        if level == self.log_level:
-            self.write_message(message)
-        elif self.next_logger:
-            self.next_logger.log(level, message)
-        else:
-            print(f"Log level {level.name} not handled: {message}")
+        dispatch = self._dispatch
+        if dispatch is None:
+            dispatch = self.compile()
+        return level in dispatch or (self._fallback is not None and self._fallback.is_enabled(level))
+
+    def write_record(self, level, message, args):
+        """Called with the unformatted message, loggers storing templates + args override it."""
+        self.write_message(message % args if args else message)
 
     @abstractmethod
     def write_message(self, msg):
         """Abstract method to define the logger's output behavior."""
         pass
 
+    def close(self):
+        """Loggers owning a thread or a file release it here (and drop their atexit hook)."""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 # Concrete Loggers
 class InfoLogger(BaseLogger):
     def write_message(self, msg):
@@ -65,18 +154,23 @@ class ErrorLogger(BaseLogger):
     def write_message(self, msg):
         print(f"[ERROR]: {msg}")
 
-# Configure the Chain
-info_logger = InfoLogger(LogLevel.INFO)
-debug_logger = DebugLogger(LogLevel.DEBUG, next_logger=info_logger)
-error_logger = ErrorLogger(LogLevel.ERROR, next_logger=debug_logger)
+if __name__ == "__main__":
+    # Configure the Chain
+    info_logger = InfoLogger(LogLevel.INFO)
+    debug_logger = DebugLogger(LogLevel.DEBUG, next_logger=info_logger)
+    error_logger = ErrorLogger(LogLevel.ERROR, next_logger=debug_logger)
 
 
-# Usage
-error_logger.log(LogLevel.INFO, "This is an info message.")
-error_logger.log(LogLevel.DEBUG, "Debugging application.")
-error_logger.log(LogLevel.ERROR, "An error occurred!")
-error_logger.log(LogLevel.WARNING, "This is a warning.")  # Unhandled level / Exception (Warning no declared)
-# Note:- Code follows SOLID
+    # Usage
+    error_logger.log(LogLevel.INFO, "This is an info message.")
+    error_logger.log(LogLevel.DEBUG, "Debugging application.")
+    error_logger.log(LogLevel.ERROR, "An error occurred!")
+    error_logger.log(LogLevel.WARNING, "This is a warning.")  # Unhandled level / Exception (Warning no declared)
+    error_logger.log(LogLevel.INFO, "User %s booked %d seats.", "Alice", 2)  # formatted by InfoLogger only
+    error_logger.report_unhandled = False
+    if error_logger.is_enabled(LogLevel.WARNING):
+        error_logger.log(LogLevel.WARNING, "Never built.")
+    # Note:- Code follows SOLID
 
 '''
 Output:-
@@ -84,5 +178,6 @@ Output:-
 [DEBUG]: Debugging application.
 [ERROR]: An error occurred!
 Log level WARNING not handled: This is a warning.
+[INFO]: User Alice booked 2 seats.
 
 '''
\ No newline at end of file
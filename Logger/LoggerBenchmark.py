@@ -0,0 +1,154 @@
+'''
+
+Logger Benchmark
+Messages per second and per call latency of BaseLogger.log() over a grid of configurations,
+so a change to Logger.py can be compared with the numbers from before it.
+
+	•	Chain: --depth loggers ending with ERROR --> DEBUG --> INFO (INFO is always the deepest hop),
+	           the loggers in front of them are more ERROR loggers
+	•	Levels: info --> every message goes to the INFO logger
+	            mixed --> 80% INFO, 10% DEBUG, 10% ERROR
+	            unhandled --> WARNING, the "not handled" fallback (printed)
+	            suppressed --> WARNING with report_unhandled=False
+	•	Sinks: null --> write_message does nothing (chain + formatting cost only)
+	           stdout --> the console loggers, stdout redirected to os.devnull
+	           file --> FileLogger chain on one FileSink in a temp directory
+	•	Threads: the calls are split over --threads threads, all logging into the same chain
+	•	Passes: throughput without timers, then latency with a perf_counter_ns() around every call
+	•	Output: a table, and with --json FILE one JSON line per configuration (appended)
+
+Usage:-
+python LoggerBenchmark.py --depth 3 10 --sinks null file --threads 1 4 --json results.jsonl --label after
+
+'''
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+
+from FileLogger import FileLogger, FileSink
+from Logger import BaseLogger, DebugLogger, ErrorLogger, InfoLogger, LogLevel
+
+CHAIN_LEVELS = [LogLevel.ERROR, LogLevel.DEBUG, LogLevel.INFO]
+LEVEL_MIXES = {
+    "info": [LogLevel.INFO],
+    "mixed": [LogLevel.INFO] * 8 + [LogLevel.DEBUG, LogLevel.ERROR],
+    "unhandled": [LogLevel.WARNING],
+    "suppressed": [LogLevel.WARNING],
+}
+CONSOLE_LOGGERS = {LogLevel.INFO: InfoLogger, LogLevel.DEBUG: DebugLogger, LogLevel.ERROR: ErrorLogger}
+
+
+class NullLogger(BaseLogger):
+    def write_message(self, msg):
+        pass
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def build_chain(depth, sink, directory):
+    """
+    Head of a chain of `depth` loggers writing to `sink`, plus the FileSink to close (or None).
+    """
+    file_sink = FileSink(os.path.join(directory, f"bench.{depth}.log")) if sink == "file" else None
+    head = None
+    for i in reversed(range(depth)):
+        level = CHAIN_LEVELS[max(0, i - depth + len(CHAIN_LEVELS))]
+        if sink == "null":
+            head = NullLogger(level, next_logger=head)
+        elif sink == "stdout":
+            head = CONSOLE_LOGGERS[level](level, next_logger=head)
+        else:
+            head = FileLogger(level, file_sink, next_logger=head)
+    return head, file_sink
+
+
+def _run_threads(no_of_threads, target):
+    barrier = threading.Barrier(no_of_threads + 1)
+
+    def worker(thread_no):
+        barrier.wait()
+        target(thread_no)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(no_of_threads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def run(depth, level_mix, sink, no_of_threads, calls):
+    levels = LEVEL_MIXES[level_mix]
+    calls_per_thread = max(1, calls // no_of_threads)
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull), contextlib.ExitStack() as stack:
+        head, file_sink = build_chain(depth, sink, directory)
+        # The FileSink (flusher thread + atexit hook) of every configuration is closed, also on errors
+        stack.enter_context(file_sink or contextlib.nullcontext())
+        head.report_unhandled = level_mix != "suppressed"
+        latencies = [[] for _ in range(no_of_threads)]
+
+        def throughput(thread_no):
+            log = head.log
+            for i in range(calls_per_thread):
+                log(levels[i % len(levels)], "Order %d assigned to delivery boy %d", i, thread_no)
+
+        def latency(thread_no):
+            log = head.log
+            perf_counter_ns = time.perf_counter_ns
+            samples = latencies[thread_no]
+            for i in range(calls_per_thread):
+                start = perf_counter_ns()
+                log(levels[i % len(levels)], "Order %d assigned to delivery boy %d", i, thread_no)
+                samples.append(perf_counter_ns() - start)
+
+        elapsed = _run_threads(no_of_threads, throughput)
+        _run_threads(no_of_threads, latency)
+
+    all_latencies = sorted(latency for samples in latencies for latency in samples)
+    total = calls_per_thread * no_of_threads
+    return {"depth": depth, "levels": level_mix, "sink": sink, "threads": no_of_threads, "calls": total,
+            "messages_per_sec": total / elapsed if elapsed else 0.0,
+            "p50_ns": percentile(all_latencies, 50), "p99_ns": percentile(all_latencies, 99),
+            "max_ns": all_latencies[-1] if all_latencies else 0}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark BaseLogger.log() across chains, level mixes, sinks "
+                                                 "and threads.")
+    parser.add_argument("--depth", type=int, nargs="+", default=[1, 3, 10])
+    parser.add_argument("--levels", choices=list(LEVEL_MIXES), nargs="+", default=list(LEVEL_MIXES))
+    parser.add_argument("--sinks", choices=["null", "stdout", "file"], nargs="+", default=["null", "stdout", "file"])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--calls", type=int, default=100000, help="log calls per configuration and pass")
+    parser.add_argument("--json", metavar="FILE", help="append one JSON line per configuration to FILE")
+    parser.add_argument("--label", default="", help="stored with every JSON line, e.g. a git commit")
+    args = parser.parse_args()
+
+    print(f"{'depth':>5} {'levels':<11}{'sink':<7}{'threads':>7}{'msgs/s':>11}{'p50 ns':>9}{'p99 ns':>9}"
+          f"{'max ns':>10}")
+    for depth in args.depth:
+        for level_mix in args.levels:
+            for sink in args.sinks:
+                for no_of_threads in args.threads:
+                    result = run(depth, level_mix, sink, no_of_threads, args.calls)
+                    print(f"{depth:>5} {level_mix:<11}{sink:<7}{no_of_threads:>7}{result['messages_per_sec']:>11.0f}"
+                          f"{result['p50_ns']:>9.0f}{result['p99_ns']:>9.0f}{result['max_ns']:>10.0f}")
+                    if args.json:
+                        result.update(label=args.label, timestamp=time.time(), python=platform.python_version(),
+                                      platform=sys.platform)
+                        with open(args.json, "a") as f:
+                            f.write(json.dumps(result) + "\n")
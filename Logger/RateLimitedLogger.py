@@ -0,0 +1,156 @@
+'''
+
+Rate Limited Logger
+Protects the chain from bursts, e.g. the same DEBUG / ERROR message logged in a hot loop.
+Sits in front of the chain (or anywhere inside it) and drops what exceeds the policy of a level.
+
+	•	Sampling: sample_every N --> the 1st, (N+1)th, (2N+1)th ... message of a key is kept
+	•	Token bucket: rate_per_s tokens are added per second up to burst (default: rate_per_s, at
+	                least 1 so that rates below 1/s still let a message through), a message takes one
+	•	Key: (level, message template), so "Order %d failed" is one key for every order.
+	         Beyond max_keys templates the level alone is the key
+	•	Summary: every summary_interval_s a background thread logs "N similar messages suppressed:
+	             <template>" at the level of the key for every key that lost messages, also when the
+	             burst stopped or nothing is logged anymore. close() (or leaving a with block, also run at
+	             exit) stops the thread, logs the rest and drops the atexit hook
+	•	Cost: a level without a policy is one dict lookup, with one a dict lookup + a clock read
+
+'''
+import atexit
+import threading
+import time
+
+from Logger import BaseLogger, DebugLogger, ErrorLogger, InfoLogger, LogLevel
+
+
+class RateLimit:
+    def __init__(self, sample_every=1, rate_per_s=None, burst=None):
+        if rate_per_s is not None and rate_per_s <= 0:
+            raise ValueError(f"rate_per_s must be > 0, got {rate_per_s}")
+        if burst is None and rate_per_s is not None:
+            burst = max(1.0, rate_per_s)
+        if burst is not None and burst < 1:
+            raise ValueError(f"burst must be >= 1 (a message takes a whole token), got {burst}")
+        self.sample_every = sample_every
+        self.rate_per_s = rate_per_s
+        self.burst = burst
+
+
+class RateLimitedLogger(BaseLogger):
+    def __init__(self, next_logger, limits, summary_interval_s=10.0, max_keys=10000):
+        super().__init__(None, next_logger)
+        self.limits = dict(limits)  # LogLevel --> RateLimit
+        self.summary_interval_s = summary_interval_s
+        self.max_keys = max_keys
+        # key --> [messages seen, tokens, last refill, suppressed since the last summary]
+        self._states = {}
+        self._lock = threading.Lock()
+        self.suppressed = 0
+        self._closed = threading.Event()
+        self._summarizer = threading.Thread(target=self._run, name="RateLimitSummaries", daemon=True)
+        self._summarizer.start()
+        atexit.register(self.close)
+
+    def log(self, level, message, *args):
+        """
+        Passes the message on unless the sampling / token bucket of its level drops it.
+        """
+        limit = self.limits.get(level)
+        if limit is not None:
+            now = time.monotonic()
+            with self._lock:
+                if not self._allow(level, message, limit, now):
+                    return
+        self.next_logger.log(level, message, *args)
+
+    def _allow(self, level, message, limit, now):
+        key = (level, message)
+        state = self._states.get(key)
+        if state is None:
+            if len(self._states) >= self.max_keys:
+                key = (level, None)
+                state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = [0, limit.burst, now, 0]
+        state[0] += 1
+        if limit.sample_every > 1 and (state[0] - 1) % limit.sample_every:
+            state[3] += 1
+            return False
+        if limit.rate_per_s is not None:
+            state[1] = min(limit.burst, state[1] + (now - state[2]) * limit.rate_per_s)
+            state[2] = now
+            if state[1] < 1:
+                state[3] += 1
+                return False
+            state[1] -= 1
+        return True
+
+    def _take_summaries(self):
+        summaries = []
+        for (level, message), state in self._states.items():
+            if state[3]:
+                summaries.append((level, message, state[3]))
+                self.suppressed += state[3]
+                state[3] = 0
+        return summaries
+
+    def _write_summaries(self, summaries):
+        for level, message, count in summaries:
+            self.next_logger.log(level, "%d similar messages suppressed: %s", count,
+                                 message if message is not None else f"{level.name} (too many keys)")
+
+    def flush_summaries(self):
+        """
+        Logs the pending summaries now, e.g. on shutdown.
+        """
+        with self._lock:
+            summaries = self._take_summaries()
+        self._write_summaries(summaries)
+
+    def _run(self):
+        while not self._closed.wait(self.summary_interval_s):
+            self.flush_summaries()
+
+    def close(self):
+        """
+        Stops the summary thread and logs the summaries still pending.
+        """
+        self._closed.set()
+        if self._summarizer is not threading.current_thread():
+            self._summarizer.join()
+        self.flush_summaries()
+        atexit.unregister(self.close)
+
+    def write_message(self, msg):
+        self.next_logger.write_message(msg)
+
+    def is_enabled(self, level):
+        return self.next_logger.is_enabled(level)
+
+
+if __name__ == "__main__":
+    # Configure the Chain behind the limits
+    info_logger = InfoLogger(LogLevel.INFO)
+    debug_logger = DebugLogger(LogLevel.DEBUG, next_logger=info_logger)
+    error_logger = ErrorLogger(LogLevel.ERROR, next_logger=debug_logger)
+    limits = {LogLevel.DEBUG: RateLimit(sample_every=100), LogLevel.ERROR: RateLimit(rate_per_s=1, burst=2)}
+
+    # Usage: a hot loop, the pending summaries are logged when the with block is left
+    with RateLimitedLogger(error_logger, limits) as logger:
+        for i in range(250):
+            logger.log(LogLevel.DEBUG, "Checked car %d", i)
+            logger.log(LogLevel.ERROR, "Payment gateway timeout for reservation %d", i)
+        logger.log(LogLevel.INFO, "Loop done.")
+
+'''
+Output:-
+[DEBUG]: Checked car 0
+[ERROR]: Payment gateway timeout for reservation 0
+[ERROR]: Payment gateway timeout for reservation 1
+[DEBUG]: Checked car 100
+[DEBUG]: Checked car 200
+[INFO]: Loop done.
+[DEBUG]: 247 similar messages suppressed: Checked car %d
+[ERROR]: 248 similar messages suppressed: Payment gateway timeout for reservation %d
+
+'''
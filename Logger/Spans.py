@@ -0,0 +1,186 @@
+'''
+
+Spans
+Timing of the entry points of the systems (FlightBookingSystem.get_schedules,
+FoodOrderingSystem.assign_delivery_boy_to_order, CarReservationSystem.book_car ...), sent as
+METRIC records through an ordinary Logger chain.
+
+	•	Span: with tracer.span("name"): ... or @tracer.timed() on a function (named after it),
+	          the duration is taken with perf_counter_ns() and logged as
+	          log(LogLevel.METRIC, "span %s %d ns", name, duration_ns), formatted only if a text sink writes it
+	•	SpanLogger: the METRIC logger of the chain, keeps one latency histogram (microseconds) per
+	                span name instead of writing lines, other METRIC messages go to its sink logger
+	•	Histogram: Histogram.py, log scale buckets (4 per power of two, <= ~19% relative error, also
+	             below 1 us) with count, mean, min, max and p50/p90/p99
+	•	Off (default): tracer.configure(chain) turns it on, until then (or if no logger of the chain
+	               takes METRIC) a timed call costs one check, nothing is measured
+	•	Pull: span_logger.snapshot() returns a dict, span_logger.export(path) appends it as a JSON line
+	•	Systems: the Logger subsystem is optional for them, they import Spans only if it is on
+	             sys.path (e.g. PYTHONPATH=../Logger), otherwise their entry points are not wrapped
+
+tracer --> ErrorLogger --> DebugLogger --> InfoLogger --> SpanLogger(METRIC) --> per span Histogram
+
+'''
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from Histogram import Histogram
+from Logger import BaseLogger, LogLevel
+
+SPAN_TEMPLATE = "span %s %d ns"
+_UNCHECKED = object()  # never a compiled table
+
+
+class SpanLogger(BaseLogger):
+    def __init__(self, next_logger=None, sink=None):
+        super().__init__(LogLevel.METRIC, next_logger)
+        self.sink = sink  # optional logger also writing every METRIC record, e.g. a FileLogger
+        self.histograms = {}  # span name --> Histogram of its durations in microseconds
+        self._lock = threading.Lock()  # spans end on many threads
+
+    def write_record(self, level, message, args):
+        if message is SPAN_TEMPLATE or message == SPAN_TEMPLATE:
+            name, duration_ns = args
+            with self._lock:
+                histogram = self.histograms.get(name)
+                if histogram is None:
+                    histogram = self.histograms[name] = Histogram()
+                histogram.record(duration_ns / 1000)
+        elif self.sink is None:
+            self.write_message(message % args if args else message)
+        if self.sink is not None:
+            self.sink.write_record(level, message, args)
+
+    def write_message(self, msg):
+        print(f"[METRIC]: {msg}")
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "spans": {name: histogram.summary() for name, histogram in self.histograms.items()},
+            }
+
+    def export(self, path):
+        """Appends the current snapshot to `path` as one JSON line."""
+        with open(path, "a") as f:
+            f.write(json.dumps(self.snapshot()) + "\n")
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+
+    def report(self):
+        snapshot = self.snapshot()
+        lines = [f"{'span':<48}{'count':>8}{'mean us':>10}{'p50 us':>10}{'p90 us':>10}{'p99 us':>10}{'max us':>10}"]
+        for name, stats in sorted(snapshot["spans"].items()):
+            lines.append(f"{name:<48}{stats['count']:>8}{stats['mean']:>10.1f}{stats['p50']:>10.1f}"
+                         f"{stats['p90']:>10.1f}{stats['p99']:>10.1f}{stats['max']:>10.1f}")
+        return "\n".join(lines)
+
+
+class Tracer:
+    def __init__(self, logger=None):
+        self.logger = logger
+        self._active = None  # logger when its chain takes METRIC, else None
+        self._checked = _UNCHECKED  # compiled table of the logger _active was checked against
+
+    def configure(self, logger):
+        """Sends the spans to the chain starting at `logger`, None turns them off."""
+        self.logger = logger
+        self._active = None
+        self._checked = _UNCHECKED
+
+    def _active_logger(self):
+        # A rewired chain drops its compiled table (None), the next compile() builds a new dict
+        logger = self.logger
+        if logger is not None and logger._dispatch is not self._checked:
+            dispatch = logger._dispatch
+            if dispatch is None:
+                dispatch = logger.compile()
+            self._active = logger if logger.is_enabled(LogLevel.METRIC) else None
+            self._checked = dispatch
+        return self._active
+
+    def emit(self, name, duration_ns):
+        logger = self._active_logger()
+        if logger is not None:
+            logger.log(LogLevel.METRIC, SPAN_TEMPLATE, name, duration_ns)
+
+    @contextmanager
+    def span(self, name):
+        """Times the with block, also when it raises."""
+        logger = self._active_logger()
+        if logger is None:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            logger.log(LogLevel.METRIC, SPAN_TEMPLATE, name, time.perf_counter_ns() - start)
+
+    def timed(self, name=None):
+        """Decorator timing every call as a span named `name` (default: the function's qualified name)."""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                # Same check as _active_logger(), inlined: with tracing off this is all a call pays
+                logger = self.logger
+                if logger is not None and logger._dispatch is not self._checked:
+                    self._active_logger()
+                logger = self._active
+                if logger is None:
+                    return func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    logger.log(LogLevel.METRIC, SPAN_TEMPLATE, span_name, time.perf_counter_ns() - start)
+            return wrapper
+        return decorator
+
+
+# Shared by every system, off until configure() is called
+tracer = Tracer()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from Logger import DebugLogger, ErrorLogger, InfoLogger
+
+    parser = argparse.ArgumentParser(description="Cost of a timed call with the tracer off and on.")
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    @tracer.timed()
+    def lookup(key):
+        return key * 2
+
+    def call_many(func):
+        start = time.perf_counter_ns()
+        for i in range(args.calls):
+            func(i)
+        return (time.perf_counter_ns() - start) / args.calls
+
+    # Configure the Chain, SpanLogger at its end
+    span_logger = SpanLogger()
+    info_logger = InfoLogger(LogLevel.INFO, next_logger=span_logger)
+    debug_logger = DebugLogger(LogLevel.DEBUG, next_logger=info_logger)
+    error_logger = ErrorLogger(LogLevel.ERROR, next_logger=debug_logger)
+
+    plain = call_many(lookup.__wrapped__)
+    off = call_many(lookup)
+    tracer.configure(error_logger)
+    on = call_many(lookup)
+    with tracer.span("demo.block"):
+        sum(range(10000))
+    error_logger.log(LogLevel.METRIC, "cache hit ratio %.2f", 0.93)
+    print(f"per call: plain {plain:.0f} ns, tracer off {off:.0f} ns, tracer on {on:.0f} ns")
+    print(span_logger.report())
@@ -0,0 +1,25 @@
+import re
+
+import pytest
+
+from LogAggregator import run_producers
+
+RECORD = re.compile(r"worker (\d+) seq (\d+)$")
+
+
+def sequences_per_worker(log_path, no_of_workers):
+    sequences = [[] for _ in range(no_of_workers)]
+    with open(log_path) as f:
+        for line in f:
+            worker_id, seq = RECORD.search(line.rstrip("\n")).groups()
+            sequences[int(worker_id)].append(int(seq))
+    return sequences
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 256])
+def test_records_arrive_once_in_order_per_worker(tmp_path, batch_size):
+    no_of_workers, no_of_records = 4, 2000
+    result = run_producers(no_of_workers, no_of_records, batch_size, str(tmp_path))
+    assert result["records"] == no_of_workers * no_of_records
+    for worker_id, sequence in enumerate(sequences_per_worker(result["log_path"], no_of_workers)):
+        assert sequence == list(range(no_of_records)), f"worker {worker_id}"
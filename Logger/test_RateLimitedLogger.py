@@ -0,0 +1,47 @@
+import pytest
+
+import RateLimitedLogger as rate_limited
+from Logger import BaseLogger, LogLevel
+from RateLimitedLogger import RateLimit, RateLimitedLogger
+
+
+class ListLogger(BaseLogger):
+    def __init__(self, log_level):
+        super().__init__(log_level)
+        self.messages = []
+
+    def write_message(self, msg):
+        self.messages.append(msg)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_rate_below_one_per_second(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limited, "time", clock)
+    sink = ListLogger(LogLevel.ERROR)
+    with RateLimitedLogger(sink, {LogLevel.ERROR: RateLimit(rate_per_s=0.5)}, summary_interval_s=3600) as logger:
+        logger.log(LogLevel.ERROR, "timeout %d", 1)
+        logger.log(LogLevel.ERROR, "timeout %d", 2)  # bucket empty
+        clock.now += 1.0
+        logger.log(LogLevel.ERROR, "timeout %d", 3)  # half a token
+        clock.now += 1.0
+        logger.log(LogLevel.ERROR, "timeout %d", 4)  # one token again
+    assert sink.messages == ["timeout 1", "timeout 4", "2 similar messages suppressed: timeout %d"]
+
+
+def test_invalid_limits():
+    assert RateLimit(rate_per_s=0.2).burst == 1.0
+    assert RateLimit(rate_per_s=5).burst == 5
+    with pytest.raises(ValueError):
+        RateLimit(rate_per_s=0)
+    with pytest.raises(ValueError):
+        RateLimit(rate_per_s=-1)
+    with pytest.raises(ValueError):
+        RateLimit(rate_per_s=2, burst=0.5)